@@ -64,14 +64,33 @@ def gc_distance(of_x: float, of_y: float, origin_x: float, origin_y: float, isra
     
     of: list of lon lat of the point
     origin: list of lon lat of the origin point
+
+    The coordinates can be arrays, broadcast together, e.g., all the segments of a track at once.
     '''
     dfac = 60 * 1.852 * 1000
 
     if isradians:
-        dtrans_x = dfac * np.cos(origin_y) * (np.rad2deg(of_x) - np.rad2deg(origin_x))
-        dtrans_y = dfac * (np.rad2deg(of_y) - np.rad2deg(origin_y))
+        # The differences are taken in radians and scaled to degree once
+        dfac = np.rad2deg(dfac)
+        dtrans_x = dfac * np.cos(origin_y) * np.subtract(of_x, origin_x)
+        dtrans_y = dfac * np.subtract(of_y, origin_y)
     else:
-        dtrans_x = dfac * np.cos(np.deg2rad(origin_y)) * (of_x - origin_x)
-        dtrans_y = dfac * (of_y - origin_y)
+        dtrans_x = dfac * np.cos(np.deg2rad(origin_y)) * np.subtract(of_x, origin_x)
+        dtrans_y = dfac * np.subtract(of_y, origin_y)
 
     return ((dtrans_x, dtrans_y))
+
+
+def lonlat2xyz(lon: np.ndarray, lat: np.ndarray, isradians: bool = False) -> np.ndarray:
+    '''
+    Converts lon, lat to cartesian x, y, z on the unit sphere, with shape (..., 3).
+
+    Operates on whole arrays with numpy ufuncs. Transforms of this kind should not be wrapped
+    with np.vectorize, which is a python loop over the elements.
+    '''
+    if not isradians:
+        lon = np.deg2rad(lon)
+        lat = np.deg2rad(lat)
+
+    coslat = np.cos(lat)
+    return (np.stack([coslat * np.cos(lon), coslat * np.sin(lon), np.sin(lat)], axis=-1))
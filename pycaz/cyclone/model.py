@@ -3,6 +3,7 @@
 
 from pycaz.convert import pa2mb, km2m
 import numpy as np
+import warnings
 from scipy import optimize
 
 
@@ -14,22 +15,71 @@ def coriolis(lat):
     return (f)
 
 
+def _scan_first_root(resfunc, limit, step):
+    '''
+    Find the root of resfunc from limit[0], where it turns negative, with a step resolution.
+
+    If the residual changes sign over limit, the root is bracketed and solved with brentq. Otherwise
+    the residual is evaluated on the whole scanning range at once to find the first negative step,
+    which then brackets the root for brentq. If the residual does not turn negative, limit[1] is returned.
+    '''
+    if resfunc(limit[0]) > 0 and resfunc(limit[1]) < 0:
+        return (optimize.brentq(resfunc, limit[0], limit[1], xtol=step))
+
+    rm_range = np.arange(start=limit[0], stop=limit[1] + step, step=step)
+    with np.errstate(invalid='ignore'):
+        negative = np.flatnonzero(resfunc(rm_range) < 0)
+
+    if len(negative) == 0:
+        return (rm_range[-1])
+    elif negative[0] == 0:
+        return (rm_range[0])
+    else:
+        return (optimize.brentq(resfunc, rm_range[negative[0] - 1], rm_range[negative[0]], xtol=step))
+
+
+def _newton(func, x0, fprime, tol):
+    '''
+    Solve func with scipy.optimize.newton from x0, a float or an array solved at once, without raising or warning
+    when it does not converge.
+
+    returns: the roots, and if each of them converged
+    '''
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if np.size(x0) > 1:
+            root, converged, _ = optimize.newton(func=func, x0=x0, fprime=fprime, tol=tol, full_output=True)
+        else:
+            root, result = optimize.newton(func=func, x0=x0, fprime=fprime, tol=tol, full_output=True, disp=False)
+            converged = result.converged
+
+    return (root, converged)
+
+
+def _valid_rmax(rmax, converged, resfunc, limit, vtol=1e-3):
+    '''
+    Keep the rmax solutions that converged, are finite and within limit, and leave a residual below vtol (m/s).
+    The other ones, e.g., for v above vmax where no root exists and newton diverges, are set to nan.
+    '''
+    rmax = np.asarray(rmax, dtype=float)
+    with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+        valid = converged & np.isfinite(rmax) & (rmax > 0) & (rmax >= limit[0]) & (rmax <= limit[1])
+        valid = valid & (np.abs(resfunc(rmax)) < vtol)
+
+    return (np.where(valid, rmax, np.nan)[()])
+
+
 def calc_rmax_s02(mslp):
     '''
     Calculates rmax as a function of central pressure as described in Silva 2002.
 
-    mslp: float, central pressure in Pascal 
+    mslp: float or array, central pressure in Pascal 
 
     Ref: Silva,  R., G. Georges, S. Paulo, B. Gustavo and B. G. D. Gabriel (2002).
     Oceanographic vulnerability to hurricanes on the Mexican coast.
     Pro-ceedings of 28th Conference on Coastal Engineering, 39-51. 
     '''
-    try:
-        mslp = pa2mb(mslp)
-    except:
-        raise Exception(f'mslp is a required input for S02 method of rmax calculation')
-
-    rmax = 0.4785 * mslp - 413  # In Km
+    rmax = 0.4785 * pa2mb(mslp) - 413  # In Km
     rmax = km2m(rmax)
 
     return rmax
@@ -40,19 +90,15 @@ def calc_rmax_w04(vmax, lat):
     Calculates rmax as a function of the maximum velocity as described in 
     Willoughby and Rahn (2004) paper.
 
-    vmax: float, m/s
-    lat: float, m/s
+    vmax: float or array, m/s
+    lat: float or array, degree
 
     Ref: 
     Willoughby and Rahn (2004) Parametric Representation of the Primary Hurricane
     Vortex. Part I: Observations andEvaluation of the Holland (1980) Model, Monthly
     Wearher Review
     '''
-    try:
-        rmax = 51.6 * np.exp(-0.0223 * vmax + 0.0281 * lat)  # Km
-    except:
-        raise Exception(f'vmax and lat are required input for W04 method of rmax calculation')
-
+    rmax = 51.6 * np.exp(-0.0223 * vmax + 0.0281 * lat)  # Km
     rmax = km2m(rmax)
 
     return (rmax)
@@ -62,14 +108,16 @@ def calc_rmax_e11(v, r, vmax, f, solver='fsolve', limit=[5000, 500000], step=100
     '''
     Calculate maximum radius using Emanuel 2011 model. 
 
-    v: float, known velocity information at the boundary layer, m/s
-    r: float, known radial information corresponding to v, m
-    vmax: float, known maximum velocity, m/s
+    v: float or array, known velocity information at the boundary layer, m/s
+    r: float or array, known radial information corresponding to v, m
+    vmax: float or array, known maximum velocity, m/s
     f: coriolis coefficient, taken at the center as it is small
     solver: solver type -
-        fsolve: use scipy.optimize.fsolve
-        scan: use linear scanning
-    limit: limit for scanning in scan solver and limit[0] is x0 for fsolve
+        newton: use scipy.optimize.newton with the analytical derivative, solves arrays at once, the entries
+                which do not converge to a root within limit are nan
+        fsolve: use scipy.optimize.fsolve (default)
+        scan: scan from limit[0] for the first root, at step resolution
+    limit: limit for scanning in scan solver and limit[0] is x0 for newton and fsolve
     step: stepping for scan solver
     vlimit: (vmin, vmax) limit to return a result, otherwise exception thrown
 
@@ -77,16 +125,18 @@ def calc_rmax_e11(v, r, vmax, f, solver='fsolve', limit=[5000, 500000], step=100
     '''
 
     resfunc = lambda rmax: v - (2 * r * (vmax * rmax + 0.5 * f * rmax ** 2) / (rmax ** 2 + r ** 2) - f * r / 2)
+    dresfunc = lambda rmax: -2 * r * (
+            (vmax + f * rmax) * (rmax ** 2 + r ** 2) - (vmax * rmax + 0.5 * f * rmax ** 2) * 2 * rmax) / (
+                                    rmax ** 2 + r ** 2) ** 2
     try:
         if solver == 'scan':
-            rm_range = np.arange(start=limit[0], stop=limit[1] + step, step=step)
-            for rm in rm_range:
-                res = resfunc(rm)
-                if res < 0:
-                    break
-            rmax_solved = rm
+            rmax_solved = _scan_first_root(resfunc, limit=limit, step=step)
+        elif solver == 'newton':
+            x0 = np.full(np.broadcast(v, r, vmax).shape, limit[0], dtype=float)[()]
+            rmax_solved, converged = _newton(func=resfunc, x0=x0, fprime=dresfunc, tol=1e-3)
+            rmax_solved = _valid_rmax(rmax_solved, converged, resfunc, limit=limit)
         elif solver == 'fsolve':
-            rmax_solved = optimize.fsolve(func=resfunc, x0=limit[0])
+            rmax_solved = optimize.fsolve(func=resfunc, x0=limit[0])[0]
     except:
         raise Exception('Solver failed')
 
@@ -96,7 +146,7 @@ def calc_rmax_e11(v, r, vmax, f, solver='fsolve', limit=[5000, 500000], step=100
 def calc_holland_B(vmax, pc, pn, rhoair, bmax=2.5, bmin=0.5):
     '''
     Calculates the simplified version of Holland's B parameters excluding the
-    term with coriolis.
+    term with coriolis. All the inputs can be arrays broadcastable to each other.
 
     vmax: Velocity of maximum wind at boundary layer, m/s
     pc: Central pressure, Pa
@@ -105,25 +155,17 @@ def calc_holland_B(vmax, pc, pn, rhoair, bmax=2.5, bmin=0.5):
     bmax: maximum limit of B
     bmin: minimum limit of B
     '''
-    B = (vmax ** 2) * rhoair * np.exp(1) / (pn - pc)
+    B = (vmax ** 2) * rhoair * np.e / (pn - pc)
 
-    if isinstance(B, float):
-        if B < bmin:
-            B = bmin
-        elif B > bmax:
-            B = bmax
-        else:
-            B = B
-    else:
-        B[B < bmin] = bmin
-        B[B > bmax] = bmax
+    B = np.clip(B, bmin, bmax)
 
     return (B)
 
 
 def calc_holland_B_full(vmax, rmax, pc, f, pn, rhoair, bmax=2.5, bmin=0.5):
     '''
-    Calculates the holland B paramter using the full expression.
+    Calculates the holland B paramter using the full expression. All the inputs
+    can be arrays broadcastable to each other, e.g., vmax and rmax over theta.
 
     vmax: Velocity of maximum wind at boundary layer, m/s
     rmax: radius of maximum wind, m
@@ -134,18 +176,9 @@ def calc_holland_B_full(vmax, rmax, pc, f, pn, rhoair, bmax=2.5, bmin=0.5):
     bmax: maximum limit of B
     bmin: minimum limit of B
     '''
-    B = (vmax ** 2 * rhoair * np.exp(1) + f * vmax * rmax * np.exp(1) * rhoair) / (pn - pc)
+    B = vmax * (vmax + f * rmax) * rhoair * np.e / (pn - pc)
 
-    if isinstance(B, float):
-        if B < bmin:
-            B = bmin
-        elif B > bmax:
-            B = bmax
-        else:
-            B = B
-    else:
-        B[B < bmin] = bmin
-        B[B > bmax] = bmax
+    B = np.clip(B, bmin, bmax)
 
     return (B)
 
@@ -154,29 +187,37 @@ def calc_rmax_h80(v, r, pc, B, f, pn, rhoair, solver='fsolve', limit=[5000, 1000
     '''
     Solve rmax with for a given r and v using Holland 1980 model.
 
-    v: float, velocity in m/s
-    r: float, radial distance corresponding to v, in m
+    v: float or array, velocity in m/s
+    r: float or array, radial distance corresponding to v, in m
     pc: float, central pressure, Pa
-    B: float, Holland B parameter, calculable by calc_holland_B()
+    B: float or array, Holland B parameter, calculable by calc_holland_B()
     f: float, coriolis parameter
-    solver: solver to use - scan or fsolve (default)
-    limit: limit for scan solver or starting point for fsolve
+    solver: solver to use - fsolve (default), newton (solves arrays at once, the entries which do not converge to
+            a root within limit are nan), or scan (first root from limit[0])
+    limit: limit for scan solver or starting point for newton and fsolve
     step: scan solver stepping, in m
     '''
 
-    resfunc = lambda rmax: v - (np.sqrt(
-        B / rhoair * (rmax / r) ** B * (pn - pc) * np.exp(-(rmax / r) ** B) + (r * f / 2) ** 2) - r * f / 2)
+    resfunc = lambda rmax: v - calc_vcirc_h80(r=r, Rm=rmax, pc=pc, B=B, pn=pn, rhoair=rhoair, f=f)
 
     try:
         if solver == 'scan':
-            rm_range = np.arange(start=limit[0], stop=limit[1] + step, step=step)
-            for rm in rm_range:
-                res = resfunc(rm)
-                if res < 0:
-                    break
-            rmax_solved = rm
+            rmax_solved = _scan_first_root(resfunc, limit=limit, step=step)
+        elif solver == 'newton':
+            # Solved for t = (rmax/r)**B, where the residual reduces to t*exp(-t) - K. It is increasing and
+            # concave for t < 1, so newton converges monotonically to the root with rmax < r from limit[0]
+            K = rhoair * ((v + r * f / 2) ** 2 - (r * f / 2) ** 2) / (B * (pn - pc))
+            t0 = np.broadcast_to((limit[0] / r) ** B, np.broadcast(v, r, B).shape).astype(float)[()]
+            t, converged = _newton(
+                func=lambda t: t * np.exp(-t) - K,
+                x0=t0,
+                fprime=lambda t: (1 - t) * np.exp(-t),
+                tol=1e-12
+            )
+            with np.errstate(invalid='ignore'):
+                rmax_solved = _valid_rmax(r * t ** (1 / B), converged, resfunc, limit=limit)
         elif solver == 'fsolve':
-            rmax_solved = optimize.fsolve(func=resfunc, x0=limit[0])
+            rmax_solved = optimize.fsolve(func=resfunc, x0=limit[0])[0]
     except:
         raise Exception('Solver failed')
 
@@ -212,8 +253,11 @@ def calc_vcirc_h80(r, Rm, pc, B, pn, rhoair, f):
     rhoair: density of air kg/m**3
     f: coriolis parameter, can be calculated with coriolis() function
     '''
-    r = r + 1e-8  # Avoid divided by zero issue for r==0
-    vcirc = np.sqrt((Rm / r) ** B * (B / rhoair) * (pn - pc) * np.exp(-(Rm / r) ** B) + (r * f / 2) ** 2) - (r * f / 2)
+    _r = np.where(r == 0, 1.0, r)  # At r==0 the wind vanishes, evaluated separately
+    t = (Rm / _r) ** B
+    rf = _r * f / 2
+    vcirc = np.sqrt(t * (B / rhoair) * (pn - pc) * np.exp(-t) + rf ** 2) - rf
+    vcirc = np.where(r == 0, 0.0, vcirc)[()]
     return (vcirc)
 
 
@@ -229,8 +273,10 @@ def calc_vcirc_h80c(r, Rm, pc, B, pn, rhoair):
     pn: float, nominal pressure outide of the storm
     rhoair: density of air km/m**3
     '''
-    r = r + 1e-8
-    vcirc = np.sqrt((Rm / r) ** B * (B / rhoair) * (pn - pc) * np.exp(-(Rm / r) ** B))
+    _r = np.where(r == 0, 1.0, r)  # At r==0 the wind vanishes, evaluated separately
+    t = (Rm / _r) ** B
+    vcirc = np.sqrt(t * (B / rhoair) * (pn - pc) * np.exp(-t))
+    vcirc = np.where(r == 0, 0.0, vcirc)[()]
     return (vcirc)
 
 
@@ -243,10 +289,7 @@ def calc_vcirc_w06(r, Rm, Vm, n=0.79, X=243000):
     n: power of increasing profile, default n=0.79
     X: distance to which extend the profile, (m) default 243km (243000m)
     '''
-    if r <= Rm:
-        vcirc = Vm * (r / Rm) ** n
-    else:
-        vcirc = Vm * np.exp(-(r - Rm) / X)
+    vcirc = np.where(r <= Rm, Vm * (r / Rm) ** n, Vm * np.exp(-(r - Rm) / X))[()]
 
     return (vcirc)
 
@@ -262,9 +305,10 @@ def calc_vcirc_e04(r, Rm, Vm, b=0.25, m=1.6, n=0.9, R0=420000):
     n: constant, default 0.9
     R0: distance, (m), default 420000m (420km)
     '''
-    multiplier = ((1 - b) * (n + m) / (n + m * (r / Rm) ** (2 * (n + m)))) + (
-                b * (1 + 2 * m) / (1 + 2 * m * (r / Rm) ** (2 * m + 1)))
-    vcirc = Vm * ((R0 - r) / (R0 - Rm)) * (r / Rm) ** m * np.sqrt(multiplier)
+    x = r / Rm
+    multiplier = ((1 - b) * (n + m) / (n + m * x ** (2 * (n + m)))) + (
+                b * (1 + 2 * m) / (1 + 2 * m * x ** (2 * m + 1)))
+    vcirc = Vm * ((R0 - r) / (R0 - Rm)) * x ** m * np.sqrt(multiplier)
 
     return (vcirc)
 
@@ -279,7 +323,8 @@ def calc_vcirc_e11(r, Rm, Vm, f):
     Vm: float, maximum wind speed (m/s)
     f: coriolis, can be calc by coriolis() function
     '''
-    vcirc = 2 * r * (Rm * Vm + 0.5 * f * Rm ** 2) / (Rm ** 2 + r ** 2) - r * f / 2
+    Rm2 = Rm ** 2
+    vcirc = 2 * r * (Rm * Vm + 0.5 * f * Rm2) / (Rm2 + r ** 2) - r * f / 2
 
     return (vcirc)
 
@@ -303,6 +348,7 @@ def calc_mslp_h80(r, Rm, pc, B, pn):
     Calculate mean-sea-level pressure based using Holland 1980 model.
     r: radial distance
     '''
-    r = r + 1e-8
-    mslp = (pn - pc) * np.exp(-(Rm / r) ** B) + pc
+    _r = np.where(r == 0, 1.0, r)  # At r==0 the pressure is the central pressure, evaluated separately
+    mslp = (pn - pc) * np.exp(-(Rm / _r) ** B) + pc
+    mslp = np.where(r == 0, pc, mslp)[()]
     return (mslp)
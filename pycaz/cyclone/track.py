@@ -4,7 +4,8 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from scipy.interpolate import interp1d
+from functools import lru_cache
+from itertools import count
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 from pycaz.cyclone.model import coriolis
@@ -16,15 +17,133 @@ from pycaz.cyclone.model import calc_vcirc_j92, calc_vcirc_w06, calc_vcirc_m16
 from pycaz.cyclone.model import calc_vcirc_e04, calc_vcirc_e11
 from pycaz.convert import gc_distance
 
+# Clockwise angle from north of the quadrant grid of the radial fields, 0:2*np.pi
+# Versions of the records, a record takes a new one when created and when a field changes, so that a Track can tell
+# its columns are stale from the versions of its own records
+_RECORD_VERSIONS = count()
+
+_THETA_GRID = np.linspace(0, 2 * np.pi, 5)
+_THETA_GRID.flags.writeable = False
+
+
+def _check_rmax_frac(methods, rmax_frac):
+    '''
+    Check that rmax_frac gives an increasing fraction for each method, and return it as an array
+    '''
+    # Avoid wrong input of rmax_frac
+    try:
+        assert len(rmax_frac) == len(methods)
+    except:
+        raise Exception('rmax_frac must corresponds to each listed method')
+    else:
+        rmax_frac = np.atleast_1d(rmax_frac)  # accomodates * of np.inf
+
+    try:
+        assert np.all(np.diff(rmax_frac) > 0)
+    except:
+        raise Exception('rmax_frac must be increasing')
+
+    return (rmax_frac)
+
+
+def _rmax_frac_index(r, rmax, rmax_frac):
+    '''
+    Index of the rmax fraction band [rmax_frac[i-1], rmax_frac[i]) containing r/rmax, starting from 0,
+    for the increasing rmax_frac. Points beyond the last fraction get len(rmax_frac).
+    '''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.searchsorted(rmax_frac, r / rmax, side='right'))
+
+
+def _interp_columns(x, xp, fp):
+    '''
+    Linear interpolation at each point x[j] on its own knots xp[:, j] with values fp[:, j], as np.interp
+    would do point by point, constant beyond the first and last knot. xp and fp are (nknots, npoints).
+    '''
+    # Knots are sorted along each column, rows are only reversed or skipped sorting when possible
+    dxp = np.diff(xp, axis=0)
+    if np.all(dxp <= 0):
+        xp, fp = xp[::-1], fp[::-1]
+    elif not np.all(dxp >= 0):
+        isort = np.argsort(xp, axis=0)
+        xp = np.take_along_axis(xp, isort, axis=0)
+        fp = np.take_along_axis(fp, isort, axis=0)
+
+    y = np.where(x <= xp[0], fp[0], fp[-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k in np.arange(len(xp) - 1):
+            inside = (x > xp[k]) & (x <= xp[k + 1])
+            y = np.where(inside, fp[k] + (x - xp[k]) / (xp[k + 1] - xp[k]) * (fp[k + 1] - fp[k]), y)
+
+    return (y)
+
+
+@lru_cache(maxsize=16)
+def _rotation(angle):
+    '''
+    Cosine and sine of an angle in degree. Cached, as the same few angles are used for all the records.
+    '''
+    angle_rad = np.deg2rad(angle)
+    return ((np.cos(angle_rad), np.sin(angle_rad)))
+
+
+class _ThetaInterpolator:
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        '''
+        Linear interpolator of values given on _THETA_GRID, clockwise angle from north in 0:2*np.pi.
+
+        It is called with theta like a function, and the values on the grid are kept to be
+        evaluated together with other interpolators by _theta_table() and _theta_lookup().
+        '''
+        self.values = values
+
+    def __call__(self, theta):
+        return (np.interp(theta, _THETA_GRID, self.values))
+
+
+def _theta_table(funcs):
+    '''
+    Values of the interpolators on _THETA_GRID as a (nfuncs, ntheta) table.
+    Any other callable of theta is evaluated on the grid.
+    '''
+    return (np.array([f.values if isinstance(f, _ThetaInterpolator) else f(_THETA_GRID) for f in funcs]))
+
+
+def _theta_lookup(table, theta):
+    '''
+    Linear interpolation of all the rows of a (n, ntheta) table on _THETA_GRID at theta,
+    constant outside the grid as np.interp. Returns (n, npoints).
+    '''
+    return (np.array([np.interp(theta, _THETA_GRID, row) for row in table]))
+
+
+def _record_timestamp(value):
+    '''
+    Timestamp of a record from a value parsable by pd.to_datetime, a pd.DatetimeIndex holding a single timestamp
+    being taken as that timestamp.
+    '''
+    timestamp = pd.to_datetime(value)
+    if isinstance(timestamp, pd.DatetimeIndex):
+        if len(timestamp) != 1:
+            raise Exception(f'timestamp must be parsable by pd.to_datetime')
+        timestamp = timestamp[0]
+
+    return (timestamp)
+
 
 class Record(dict):
+    # The fields are kept as the dictionary items, only the cached values are attributes
+    __slots__ = ('_f', '_datetime64', '_tables', '_version')
+
     def __init__(self, *args, **kwargs):
         '''
         A recrod object takes keyworded input as arguments by entending the python
         dictionary object. 
 
         The required fields are - 
-            : timestamp:    datetime, pd.Datetimeindex
+            : timestamp:    datetime, str, pd.Datetimeindex of a single timestamp
             : lon:          longitude, 0-359, float
             : lat:          latitude, -180, 180, float
             : mslp:         central pressure, Pa, float
@@ -56,18 +175,90 @@ class Record(dict):
         except:
             raise Exception(f'timestamp must be parsable by pd.to_datetime')
         else:
-            kwargs['timestamp'] = pd.to_datetime(kwargs['timestamp'])
+            kwargs['timestamp'] = _record_timestamp(kwargs['timestamp'])
 
         # Initiate the dictionary
         super(Record, self).__init__(*args, **kwargs)
 
+        # Coriolis parameter at the record center, invariant for the record
+        self._f = coriolis(self['lat'])
+
+        # Parsed timestamp kept as datetime64 for building the track time index
+        self._datetime64 = self['timestamp'].to_datetime64()
+
+        # Theta grid tables of the radial field functions, built when first used
+        self._tables = {}
+
+        self._version = next(_RECORD_VERSIONS)
+
     def __setitem__(self, key, value):
+        if key == 'timestamp':
+            value = _record_timestamp(value)
+            self._datetime64 = value.to_datetime64()
+
         super(Record, self).__setitem__(key, value)
+        self._version = next(_RECORD_VERSIONS)
+
+        if key == 'lat':
+            self._f = coriolis(value)
+
+    # The other dictionary mutators bypass __setitem__, they are routed through it or take a new version as well
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return (self[key])
+
+    def __delitem__(self, key):
+        super(Record, self).__delitem__(key)
+        self._version = next(_RECORD_VERSIONS)
+
+    def pop(self, *args):
+        value = super(Record, self).pop(*args)
+        self._version = next(_RECORD_VERSIONS)
+        return (value)
+
+    def popitem(self):
+        item = super(Record, self).popitem()
+        self._version = next(_RECORD_VERSIONS)
+        return (item)
+
+    def clear(self):
+        super(Record, self).clear()
+        self._version = next(_RECORD_VERSIONS)
+
+    def _field_table(self, key):
+        '''
+        Values of the radial field functions in self[key] (fradinfo, frmax, ...) on _THETA_GRID as a (nfuncs, ntheta)
+        table. The table is built on first use, and reused as long as self[key] is not replaced.
+        '''
+        funcs = self[key]
+        cached = self._tables.get(key)
+        if cached is None or cached[0] is not funcs:
+            cached = (funcs, _theta_table(np.atleast_1d(funcs)))
+            self._tables[key] = cached
+
+        return (cached[1])
 
     @property
     def center(self):
         return ((self['lon'], self['lat']))
 
+    def rotated_translation(self, angle):
+        '''
+        Translation velocity (ustorm, vstorm) rotated anti-clockwise by angle in degree.
+        Same operation as rotating a cartesian coordinate by the angle.
+        '''
+        cosa, sina = _rotation(angle)
+        utrans = self['ustorm'] * cosa - self['vstorm'] * sina
+        vtrans = self['ustorm'] * sina + self['vstorm'] * cosa
+        return ((utrans, vtrans))
+
     def gen_radial_fields(self, fraction=0.56, angle=19.2, swrf=0.9):
         '''
         Generate the interpolator for radial field for exisiting radial informations.
@@ -99,14 +290,10 @@ class Record(dict):
         by SWRF to get it back to 10m level.
         '''
         # Rotating ustorm vstorm by 19.2 degree anti-clockwise
-        # Same operation as rotating a cartesian coordinate by 19.2 degree
-        angle_rad = np.deg2rad(angle)
-        if np.any(np.isnan([self['ustorm'], self['vstorm']])):
+        ustorm, vstorm = self.rotated_translation(angle)
+        if np.isnan(ustorm) or np.isnan(vstorm):
             ustorm = 0
             vstorm = 0
-        else:
-            ustorm = self['ustorm'] * np.cos(angle_rad) - self['vstorm'] * np.sin(angle_rad)
-            vstorm = self['ustorm'] * np.sin(angle_rad) + self['vstorm'] * np.cos(angle_rad)
 
         # Apply correction to vmax for 4 quadrant clockwise from 0N
         # Careful about the sin/cos from north
@@ -117,29 +304,32 @@ class Record(dict):
         #            |
         #            |
         #            S
-        theta = np.linspace(0, 2 * np.pi, 5)
+        theta = _THETA_GRID
         vmax_x = self['vmax'] * np.sin(theta) * (-1) - fraction * ustorm
         vmax_y = self['vmax'] * np.cos(theta) - fraction * vstorm
         vmax_amp = np.sqrt(vmax_x ** 2 + vmax_y ** 2) / swrf
-        self['fvmax'] = interp1d(theta, vmax_amp)
-
-        # Apply correction to vinfo for 4 quadrant
-        fvinfo = np.array([])
-        fradinfo = np.array([])
-        for i, vinfo in enumerate(np.atleast_1d(self['vinfo'])):
-            if np.isnan(vinfo):
-                self['vinfo'] = np.nan
-                self['radinfo'] = np.nan
-            else:
-                vinfo_x = vinfo * np.sin(theta) * (-1) - fraction * ustorm
-                vinfo_y = vinfo * np.cos(theta) - fraction * vstorm
-                vinfo_amp = np.sqrt(vinfo_x ** 2 + vinfo_y ** 2) / swrf
-                vinfo_func = interp1d(theta, vinfo_amp)
-                fvinfo = np.append(fvinfo, vinfo_func)
+        self['fvmax'] = _ThetaInterpolator(vmax_amp)
+
+        # Apply correction to vinfo for 4 quadrant, all vinfo at once as (nvinfo, ntheta)
+        vinfo = np.atleast_1d(self['vinfo']).astype(float)
+        valid = ~np.isnan(vinfo)
+        fvinfo = np.empty(np.count_nonzero(valid), dtype=object)
+        fradinfo = np.empty(np.count_nonzero(valid), dtype=object)
+        if np.any(valid):
+            vinfo_x = vinfo[valid, np.newaxis] * np.sin(theta) * (-1) - fraction * ustorm
+            vinfo_y = vinfo[valid, np.newaxis] * np.cos(theta) - fraction * vstorm
+            vinfo_amp = np.sqrt(vinfo_x ** 2 + vinfo_y ** 2) / swrf
+
+            radinfo = np.atleast_2d(self['radinfo'])[valid]
+            radinfo = np.column_stack([radinfo, radinfo[:, 0]])  # closing the circle at 2*np.pi
 
-                radinfo = np.append(self['radinfo'][i], self['radinfo'][i][0])
-                radinfo_func = interp1d(theta, radinfo)
-                fradinfo = np.append(fradinfo, radinfo_func)
+            for i in np.arange(len(fvinfo)):
+                fvinfo[i] = _ThetaInterpolator(vinfo_amp[i])
+                fradinfo[i] = _ThetaInterpolator(radinfo[i])
+
+        if not np.all(valid):
+            self['vinfo'] = np.nan
+            self['radinfo'] = np.nan
 
         self['fvinfo'] = fvinfo
         self['fradinfo'] = fradinfo
@@ -185,13 +375,6 @@ class Record(dict):
         '''
         methods = np.atleast_1d(methods)
 
-        calc_rmax = {
-            'E11': calc_rmax_e11,
-            'H80': calc_rmax_h80,
-            'S02': calc_rmax_s02,
-            'W04': calc_rmax_w04
-        }
-
         try:
             assert len(np.atleast_1d(vlimit)) == len(methods)
         except:
@@ -200,14 +383,16 @@ class Record(dict):
         vlimit_min = np.append(0, vlimit)[0:-1]  # Starts from 0 m/s
         vlimit_max = vlimit
 
+        pn = kw_atmos['pn']
+        rhoair = kw_atmos['rhoair']
+        theta = _THETA_GRID
+
         if np.all([~np.isnan(self['rmax']), use_rmax_info]):
             # Use the provided vmax
-            theta = np.linspace(0, 2 * np.pi, 5)
             rmax = np.ones_like(theta) * self['rmax']
-            frmax = interp1d(theta, rmax)
+            frmax = _ThetaInterpolator(rmax)
             self['frmax'] = frmax
         elif np.all(np.isnan(self['vinfo'])):
-            theta = np.linspace(0, 2 * np.pi, 5)
             if not np.isnan(self['mslp']):
                 # Use S02 regression method for rmax
                 rmax = np.ones_like(theta) * calc_rmax_s02(mslp=self['mslp'])
@@ -215,92 +400,121 @@ class Record(dict):
                 # Use W04 regression method for rmax
                 rmax = np.ones_like(theta) * calc_rmax_w04(vmax=self['vmax'], lat=self['lat'])
 
-            frmax = interp1d(theta, rmax)
+            frmax = _ThetaInterpolator(rmax)
             self['frmax'] = frmax
         else:
-            frmax = np.array([])  # length of fvinfo or atleast 1
-            rmax_method = np.array([])  # Keeping the rmax_method used
-            theta = np.linspace(0, 2 * np.pi, 5)
+            frmax = []  # length of fvinfo or atleast 1
+            rmax_method = []  # Keeping the rmax_method used
 
             # Radial info is available and rmax is to be calculated from radinfo
-            for fv, fr in zip(self['fvinfo'], self['fradinfo']):
+            vmax_theta = self['fvmax'](theta)
+
+            # Holland B parameter for H80 over all theta at once
+            B_theta = calc_holland_B(
+                vmax=vmax_theta,
+                pc=self['mslp'],
+                pn=pn,
+                rhoair=rhoair,
+                bmax=kw_h80['bmax'],
+                bmin=kw_h80['bmin']
+            )
+            # Methods solving all theta in one call, the others are solved theta by theta
+            batched = {
+                'E11': kw_e11['solver'] == 'newton',
+                'H80': kw_h80['solver'] == 'newton',
+                'S02': True,
+                'W04': True
+            }
+            limits = {'E11': kw_e11['limit'], 'H80': kw_h80['limit']}
+
+            # vinfo and radinfo on the theta grid, (nvinfo, ntheta)
+            vinfo_table = self._field_table('fvinfo')
+            radinfo_table = self._field_table('fradinfo')
+
+            for v_theta, r_theta in zip(vinfo_table, radinfo_table):
                 rmax_fv_theta = np.ones_like(theta)  # Placeholder
-
-                # Iterating over all the values interpolated by theta
-                for i, thetai in enumerate(theta):
-                    for j, method in enumerate(methods):
+                rmax_method_fv = np.full(len(theta), None, dtype=object)
+
+                def solve(method, i):
+                    # rmax at the theta index (or indices) i with the given method
+                    if method == 'E11':
+                        rmax_i = calc_rmax_e11(
+                            v=v_theta[i],
+                            r=r_theta[i],
+                            vmax=vmax_theta[i],
+                            f=self._f,
+                            solver=kw_e11['solver'],
+                            limit=kw_e11['limit'],
+                            step=kw_e11['step']
+                        )
+                    elif method == 'H80':
+                        rmax_i = calc_rmax_h80(
+                            v=v_theta[i],
+                            r=r_theta[i],
+                            pc=self['mslp'],
+                            B=B_theta[i],
+                            f=self._f,
+                            pn=pn,
+                            rhoair=rhoair,
+                            solver=kw_h80['solver'],
+                            limit=kw_h80['limit'],
+                            step=kw_h80['step']
+                        )
+                    elif method == 'S02':
+                        rmax_i = calc_rmax_s02(mslp=self['mslp'])
+                    elif method == 'W04':
+                        rmax_i = calc_rmax_w04(vmax=vmax_theta[i], lat=self['lat'])
+
+                    return (rmax_i)
+
+                # Each theta takes the first method within its vlimit that is solved
+                unsolved = np.ones(len(theta), dtype=bool)
+                for j, method in enumerate(methods):
+                    if method not in batched:
+                        continue
+
+                    # Check the vlimit_min vlimit_max
+                    itheta = np.flatnonzero(unsolved & (vlimit_min[j] <= v_theta) & (v_theta < vlimit_max[j]))
+                    if len(itheta) == 0:
+                        continue
+
+                    rmax_itheta = np.full(len(itheta), np.nan)
+                    solve_each = not batched[method]
+                    if batched[method]:
                         try:
-                            # Check the vlimit_min vlimit_max
-                            assert fv(thetai) >= vlimit_min[j]
-                            assert fv(thetai) < vlimit_max[j]
-
-                            # Trying each methods
-                            if method == 'E11':
-                                kwargs = {
-                                    'v': fv(thetai),
-                                    'r': fr(thetai),
-                                    'vmax': self['fvmax'](thetai),
-                                    'f': coriolis(self['lat']),
-                                    'solver': kw_e11['solver'],
-                                    'limit': kw_e11['limit'],
-                                    'step': kw_e11['step']
-                                }
-                                rmax_fv_theta[i] = calc_rmax[method](**kwargs)
-
-                            if method == 'H80':
-                                # First calculate holland B parameter
-                                kwargs = {
-                                    'vmax': self['fvmax'](thetai),
-                                    'pc': self['mslp'],
-                                    'pn': kw_atmos['pn'],
-                                    'rhoair': kw_atmos['rhoair'],
-                                    'bmax': kw_h80['bmax'],
-                                    'bmin': kw_h80['bmin']
-                                }
-                                B = calc_holland_B(**kwargs)
-
-                                # Then calculate the rmax
-                                kwargs = {
-                                    'v': fv(thetai),
-                                    'r': fr(thetai),
-                                    'pc': self['mslp'],
-                                    'B': B,
-                                    'f': coriolis(self['lat']),
-                                    'pn': kw_atmos['pn'],
-                                    'rhoair': kw_atmos['rhoair'],
-                                    'solver': kw_h80['solver'],
-                                    'limit': kw_h80['limit'],
-                                    'step': kw_h80['step']
-                                }
-                                rmax_fv_theta[i] = calc_rmax[method](**kwargs)
-
-                            if method == 'S02':
-                                kwargs = {
-                                    'mslp': self['mslp']
-                                }
-                                rmax_fv_theta[i] = calc_rmax[method](**kwargs)
-
-                            if method == 'W04':
-                                kwargs = {
-                                    'vmax': self['fvmax'](thetai),
-                                    'lat': self['lat']
-                                }
-                                rmax_fv_theta[i] = calc_rmax[method](**kwargs)
-
-                                # When successful break the loop
-                            break
-                        except:
-                            # Otherwise continue with the methods
-                            continue
+                            rmax_itheta[:] = solve(method, itheta)
+                        except Exception:
+                            # The batch failed, retry the thetas one by one below
+                            solve_each = True
+
+                    if solve_each:
+                        for k, i in enumerate(itheta):
+                            try:
+                                rmax_itheta[k] = solve(method, i)
+                            except Exception:
+                                # The solver failed, continue with the next method
+                                continue
+
+                    # A batched solve does not raise for the thetas it could not solve, they are nan or out of
+                    # limit. Only the valid rmax are kept, the other thetas are left to the next method
+                    with np.errstate(invalid='ignore'):
+                        valid = np.isfinite(rmax_itheta) & (rmax_itheta > 0)
+                        if batched[method] and method in limits:
+                            valid &= (rmax_itheta >= limits[method][0]) & (rmax_itheta <= limits[method][1])
+
+                    solved = itheta[valid]
+                    rmax_fv_theta[solved] = rmax_itheta[valid]
+                    rmax_method_fv[solved] = str(method)
+                    unsolved[solved] = False
 
                 # For a particular vinfo create the interpolation function
                 # append to frmax
-                frmax_fv = interp1d(theta, rmax_fv_theta)
-                frmax = np.append(frmax, frmax_fv)
+                frmax.append(_ThetaInterpolator(rmax_fv_theta))
+                rmax_method.append(rmax_method_fv)
 
             # Save to Record dictionary
-            self['frmax'] = frmax
-            self['rmax_method'] = rmax_method
+            self['frmax'] = np.array(frmax, dtype=object)
+            self['rmax_method'] = np.array(rmax_method, dtype=object)
 
         return (self)
 
@@ -322,9 +536,10 @@ class Record(dict):
         rmax.
 
         at: (r, theta) location where the wind is calculated,
-            r, float, distance in m 
-            theta, float, is -2*np.pi, 2*np.pi radians
+            r, float or array, distance in m 
+            theta, float or array, is -2*np.pi, 2*np.pi radians
             Essentially theta is expected to be output from np.arctan2(y,x)
+            r and theta are broadcast together, and u, v are returned in the same shape.
             Theis counter-clockwise from x-axis angle is converted to a clockwise
             angle from y axis to match the interpolation grid of the storm paramters. 
         methods: array, list of methods to be used. Currently implemented methods
@@ -364,216 +579,192 @@ class Record(dict):
         except:
             raise Exception(f'the at must be in (r, theta) as list/array of size 2')
 
-        # Convert theta from x-axis counter clock to y-axis clock wise
-        theta = -1 * theta_input + np.pi / 2
+        # All the points are computed at once on flat arrays, and reshaped at the end
+        r, theta_input, vmax, rmax, shape = self._eval_points(r, theta_input, rmax_select)
 
-        # Theta -180:180 to 0:360 format, clockwise from 0N
-        if theta_input < 0:
-            theta = 2 * np.pi + theta_input
-        else:
-            theta = theta_input
-
-        calc_vcirc = {
-            'H80': calc_vcirc_h80,
-            'H80c': calc_vcirc_h80c,
-            'J92': calc_vcirc_j92,
-            'W06': calc_vcirc_w06,
-            'E04': calc_vcirc_e04,
-            'E11': calc_vcirc_e11,
-            'M16': calc_vcirc_m16
-        }
+        u, v = self._wind_uv(
+            self._vcirc_bands(r, vmax, rmax, methods, rmax_frac, kw_atmos, kw_h80, kw_e04, kw_w06, kw_m16),
+            theta_input,
+            shape,
+            kw_corr
+        )
 
-        # Calculate vmax for further calculation
-        vmax = self['fvmax'](theta)
+        return (u[()], v[()])
 
-        # Find appropriate rmax function to be used
-        # and calculate rmax
-        rmax_select_methods_available = ['mean', 'nearest', 'linear']
+    def _vcirc_bands(
+            self, r, vmax, rmax, methods, rmax_frac, kw_atmos, kw_h80, kw_e04, kw_w06, kw_m16, holland=None
+    ):
+        '''
+        Circular wind at the flat points, each point computed with the method of its rmax fraction band.
 
-        if isinstance(rmax_select, str):
-            try:
-                assert rmax_select in rmax_select_methods_available
-
-                if rmax_select == 'mean':
-                    rmax = np.mean([f(theta) for f in np.atleast_1d(self['frmax'])])
-
-                if rmax_select == 'nearest':
-                    try:
-                        radinfo = np.array([radi(theta) for radi in self['fradinfo']])
-                        radnn = np.argmin(np.abs(radinfo - r))
-                        rmax = np.array([f(theta) for f in np.atleast_1d(self['frmax'])])[radnn]
-                    except:
-                        rmax = np.atleast_1d(self['frmax'])[0](theta)
-                        raise Warning('nearest not possible, first rmax selected')
-
-                if rmax_select == 'linear':
-                    try:
-                        # x field from -inf to +inf
-                        radinfo = np.array([radi(theta) for radi in self['fradinfo']])
-                        radinfo = np.append(-np.inf, radinfo)
-                        radinfo = np.append(radinfo, np.inf)
-                        # y field 
-                        rmaxinfo = np.array([f(theta) for f in np.atleast_1d(self['frmax'])])
-                        rmaxinfo = np.append(rmaxinfo[0], rmaxinfo)
-                        rmaxinfo = np.append(rmaxinfo, rmaxinfo[-1])
-                        int_f = interp1d(radinfo, rmaxinfo)
-                        rmax = int_f(r)
-                    except:
-                        rmax = np.atleast_1d(self['frmax'])[0](theta)
-                        raise Warning('linear not possible, first rmax selected')
-            except:
-                rmax = np.atleast_1d(self['frmax'])[0](theta)
-                raise Warning(f'Wrong keyword for rmax method. First frmax is used')
-        elif isinstance(rmax_select, int):
-            try:
-                np.array([f(theta) for f in np.atleast_1d(self['frmax'])])[rmax_select]
-            except:
-                rmax = np.atleast_1d(self['frmax'])[0](theta)
-                raise Warning('Wrong rmax index. First frmax is used')
-        else:
-            rmax = np.atleast_1d(self['frmax'])[0](theta)
-            raise Warning('Wrong rmax selection keyword/index. First frmax is used')
+        holland: dict, Holland B of H80 and H80c already computed at all the points, computed per band if not given
+        '''
+        f = self._f
+        imethod = _rmax_frac_index(r, rmax, _check_rmax_frac(methods, rmax_frac))
+        vcirc = np.full_like(r, np.nan)
+        for i, method in enumerate(methods):
+            band = imethod == i
+            if not np.any(band):
+                continue
+            _r = r[band]
+            _rmax = rmax[band]
+            _vmax = vmax[band]
+
+            if method == 'H80':
+                B = self._band_holland_B(method, band, _vmax, _rmax, kw_atmos, kw_h80, holland)
+                vcirc[band] = calc_vcirc_h80(
+                    r=_r,
+                    Rm=_rmax,
+                    pc=self['mslp'],
+                    B=B,
+                    pn=kw_atmos['pn'],
+                    rhoair=kw_atmos['rhoair'],
+                    f=f
+                )
+            elif method == 'H80c':
+                B = self._band_holland_B(method, band, _vmax, _rmax, kw_atmos, kw_h80, holland)
+                vcirc[band] = calc_vcirc_h80c(
+                    r=_r,
+                    Rm=_rmax,
+                    pc=self['mslp'],
+                    B=B,
+                    pn=kw_atmos['pn'],
+                    rhoair=kw_atmos['rhoair']
+                )
+            elif method == 'J92':
+                vcirc[band] = calc_vcirc_j92(r=_r, Rm=_rmax, Vm=_vmax)
+            elif method == 'W06':
+                vcirc[band] = calc_vcirc_w06(r=_r, Rm=_rmax, Vm=_vmax, n=kw_w06['n'], X=kw_w06['X'])
+            elif method == 'E04':
+                _vcirc = calc_vcirc_e04(
+                    r=_r,
+                    Rm=_rmax,
+                    Vm=_vmax,
+                    b=kw_e04['b'],
+                    m=kw_e04['m'],
+                    n=kw_e04['n'],
+                    R0=kw_e04['R0']
+                )
+                vcirc[band] = np.where(_vcirc <= 0, 0, _vcirc)
+            elif method == 'E11':
+                _vcirc = calc_vcirc_e11(r=_r, Rm=_rmax, Vm=_vmax, f=f)
+                vcirc[band] = np.where(_vcirc <= 0, 0, _vcirc)
+            elif method == 'M16':
+                vcirc[band] = calc_vcirc_m16(r=_r, Rm=_rmax, Vm=_vmax, n=kw_m16['n'])
+
+        return (vcirc)
+
+    def _wind_uv(self, vcirc, theta_input, shape, kw_corr):
+        '''
+        u, v wind of the given shape from the flat circular wind, with surface reduction and translation correction.
 
-        # Now check methods and rmax_frac and apply method as required
-        # Avoid wrong input of rmax_frac
-        try:
-            assert len(rmax_frac) == len(methods)
-        except:
-            raise Exception('rmax_frac must corresponds to each listed method')
+        The sine and cosine are taken on theta_input before it is broadcast to the points, once per theta
+        on a polar grid, and the scalar corrections are applied in place.
+        '''
+        # Surface reduction and time averaging factors applied together
+        vfac = kw_corr['swrf'] * kw_corr['tfac']
+        vcirc = vcirc.reshape(shape)
+
+        u = np.multiply(np.sin(theta_input), vcirc)
+        u *= -vfac
+        v = np.multiply(np.cos(theta_input), vcirc)
+        v *= vfac
+
+        # Calculating u,v wind with translation correction, where the translation is known. The
+        # translation may be a scalar for the record or given at the points, broadcast with u, v
+        utrans, vtrans = self.rotated_translation(kw_corr['angle'])
+        known = ~(np.isnan(utrans) | np.isnan(vtrans))
+        tfrac = kw_corr['fraction'] * kw_corr['tfac']
+
+        u += np.where(known, tfrac * utrans, 0.0)
+        v += np.where(known, tfrac * vtrans, 0.0)
+
+        return ((u, v))
+
+    def _eval_points(self, r, theta_input, rmax_select='mean'):
+        '''
+        Broadcast and flatten the (r, theta) points, and evaluate vmax and rmax at them.
+
+        vmax, and rmax when the selection depends only on theta, are evaluated on theta before it is
+        broadcast with r. Thus on a polar grid, e.g., r of shape (n, 1) and theta of shape (1, m),
+        they are evaluated once per theta instead of once per point.
+
+        Returns flat r, theta_input as given (not broadcast), flat vmax, rmax and the shape of the points
+        '''
+        r = np.asarray(r, dtype=float)
+        theta_input = np.asarray(theta_input, dtype=float)
+        shape = np.broadcast_shapes(r.shape, theta_input.shape)
+
+        # Theta -180:180 to 0:360 format, clockwise from 0N
+        theta = np.mod(theta_input, 2 * np.pi)
+
+        # Calculate vmax on theta
+        vmax = np.broadcast_to(self['fvmax'](theta), shape).ravel()
+
+        # Find appropriate rmax function to be used and calculate rmax
+        if isinstance(rmax_select, str) and rmax_select in ['nearest', 'linear']:
+            rmax = self._select_rmax(
+                np.broadcast_to(r, shape).ravel(),
+                np.broadcast_to(theta, shape).ravel(),
+                rmax_select
+            )
         else:
-            rmax_frac = np.atleast_1d(rmax_frac)
+            rmax = self._select_rmax(None, theta.ravel(), rmax_select).reshape(theta.shape)
+            rmax = np.broadcast_to(rmax, shape).ravel()
 
-        rlim_min = np.append(0, rmax_frac)[0:-1] * rmax  # Starts from 0
-        rlim_max = rmax_frac * rmax
+        r = np.broadcast_to(r, shape).ravel()
 
-        for i, method in enumerate(methods):
-            try:
-                assert r >= rlim_min[i]
-                assert r < rlim_max[i]
-
-                if method == 'H80':
-                    kwargs = {
-                        'vmax': vmax,
-                        'rmax': rmax,
-                        'pc': self['mslp'],
-                        'f': coriolis(self['lat']),
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair'],
-                        'bmax': kw_h80['bmax'],
-                        'bmin': kw_h80['bmin']
-                    }
-                    B = calc_holland_B_full(**kwargs)
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'pc': self['mslp'],
-                        'B': B,
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair'],
-                        'f': coriolis(self['lat'])
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-
-                if method == 'H80c':
-                    kwargs = {
-                        'vmax': vmax,
-                        'pc': self['mslp'],
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair'],
-                        'bmax': kw_h80['bmax'],
-                        'bmin': kw_h80['bmin']
-                    }
-                    B = calc_holland_B(**kwargs)
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'pc': self['mslp'],
-                        'B': B,
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair']
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-
-                if method == 'J92':
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'Vm': vmax
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-
-                if method == 'W06':
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'Vm': vmax,
-                        'n': kw_w06['n'],
-                        'X': kw_w06['X']
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-
-                if method == 'E04':
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'Vm': vmax,
-                        'b': kw_e04['b'],
-                        'm': kw_e04['m'],
-                        'n': kw_e04['n'],
-                        'R0': kw_e04['R0']
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-                    if vcirc <= 0:
-                        vcirc = 0
-
-                if method == 'E11':
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'Vm': vmax,
-                        'f': coriolis(self['lat'])
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-                    if vcirc <= 0:
-                        vcirc = 0
-
-                if method == 'M16':
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'Vm': vmax,
-                        'n': kw_m16['n']
-                    }
-                    vcirc = calc_vcirc[method](**kwargs)
-                break
-            except:
-                continue
+        return (r, theta_input, vmax, rmax, shape)
 
-        # Calculating u,v wind with translation correction
-        vcirc = vcirc * kw_corr['swrf']
+    def _select_rmax(self, r, theta, rmax_select='mean'):
+        '''
+        Select the rmax at the (r, theta) points from the rmax functions in frmax
 
-        u = -vcirc * r * np.sin(theta_input) / np.max([r, 1e-8])  # 1e-8 avoids x/0
-        v = vcirc * r * np.cos(theta_input) / np.max([r, 1e-8])
+        r: array, distance in m
+        theta: array, clockwise angle from north in 0:2*np.pi
+        rmax_select: which rmax to select, int, str
+                    'mean': mean value of the rmax
+                    'nearest': rmax calculated from nearest frmax
+                    'linear': rmax calculated from a linear interpolation
+                    int: index of the selected rmax
+        '''
+        # frmax and fradinfo are taken from the theta grid tables cached on the record
+        rmaxtable = self._field_table('frmax')  # (nrmax, ntheta)
+        rmax_select_methods_available = ['mean', 'nearest', 'linear']
 
-        utrans = self['ustorm'] * np.cos(np.deg2rad(kw_corr['angle'])) - self['vstorm'] * np.sin(
-            np.deg2rad(kw_corr['angle']))
-        vtrans = self['ustorm'] * np.sin(np.deg2rad(kw_corr['angle'])) + self['vstorm'] * np.cos(
-            np.deg2rad(kw_corr['angle']))
+        if isinstance(rmax_select, str):
+            if rmax_select not in rmax_select_methods_available:
+                raise Warning(f'Wrong keyword for rmax method. First frmax is used')
 
-        try:
-            assert np.logical_not(np.any(np.isnan(utrans)))
-            assert np.logical_not(np.any(np.isnan(vtrans)))
+            if rmax_select == 'mean':
+                # Linear interpolation commutes with the mean, so the mean is interpolated once
+                rmax = np.interp(theta, _THETA_GRID, np.mean(rmaxtable, axis=0))
+            else:
+                # Each rmax function is evaluated once at all the points
+                rmaxinfo = _theta_lookup(rmaxtable, theta)  # (nrmax, npoints)
 
-            u = u + kw_corr['fraction'] * utrans
-            v = v + kw_corr['fraction'] * vtrans
-        except:
-            u = u
-            v = v
+            if rmax_select in ['nearest', 'linear']:
+                radinfo = _theta_lookup(self._field_table('fradinfo'), theta)  # (nradinfo, npoints)
+                if len(radinfo) == 0 or len(radinfo) != len(rmaxinfo):
+                    raise Warning(f'{rmax_select} not possible, first rmax selected')
+
+            if rmax_select == 'nearest':
+                radnn = np.argmin(np.abs(radinfo - r), axis=0)
+                rmax = np.take_along_axis(rmaxinfo, radnn[np.newaxis, :], axis=0)[0]
 
-        u = u * kw_corr['tfac']
-        v = v * kw_corr['tfac']
+            if rmax_select == 'linear':
+                # linear interpolation between the radinfo, constant beyond the first and last one
+                rmax = _interp_columns(r, radinfo, rmaxinfo)
+        elif isinstance(rmax_select, int):
+            # Only the selected rmax function is evaluated
+            try:
+                rmax = np.interp(theta, _THETA_GRID, rmaxtable[rmax_select])
+            except IndexError:
+                raise Warning('Wrong rmax index. First frmax is used')
+        else:
+            raise Warning('Wrong rmax selection keyword/index. First frmax is used')
 
-        return (u, v)
+        return (rmax)
 
     def calculate_pressure(
             self,
@@ -589,9 +780,10 @@ class Record(dict):
         rmax.
 
         at: (r, theta) location where the wind is calculated,
-            r, float, distance in m 
-            theta, float, is -2*np.pi, 2*np.pi radians
+            r, float or array, distance in m 
+            theta, float or array, is -2*np.pi, 2*np.pi radians
             Essentially theta is expected to be output from np.arctan2(y,x)
+            r and theta are broadcast together, and mslp is returned in the same shape.
             This is counter-clockwise from x-axis angle is converted to a clockwise
             angle from y axis to match the interpolation grid of the storm paramters. 
         methods: array, list of methods to be used. Currently implemented methods
@@ -615,140 +807,131 @@ class Record(dict):
         except:
             raise Exception(f'the at must be in (r, theta) as list/array of size 2')
 
-        # Convert theta from x-axis counter clock to y-axis clock wise
-        theta = -1 * theta_input + np.pi / 2
+        # All the points are computed at once on flat arrays, and reshaped at the end
+        r, theta_input, vmax, rmax, shape = self._eval_points(r, theta_input, rmax_select)
 
-        # Theta -180:180 to 0:360 format, clockwise from 0N
-        if theta_input < 0:
-            theta = 2 * np.pi + theta_input
-        else:
-            theta = theta_input
+        mslp = self._mslp_bands(r, vmax, rmax, methods, rmax_frac, kw_atmos, kw_h80)
 
-        calc_mslp = {
-            'H80': calc_mslp_h80,
-            'H80c': calc_mslp_h80  # Only B calculation differs
-        }
+        return (mslp.reshape(shape)[()])
 
-        # Calculate vmax for further calculation
-        vmax = self['fvmax'](theta)
+    def evaluate(
+            self,
+            at,
+            wind_methods=['E11', 'H80'],
+            wind_rmax_frac=[2, np.inf],
+            pressure_methods=['H80'],
+            pressure_rmax_frac=[np.inf],
+            rmax_select='mean',
+            kw_corr={'fraction': 0.56, 'angle': 19.2, 'swrf': 0.9, 'tfac': 0.88},
+            kw_atmos={'pn': 101325, 'rhoair': 1.15},
+            kw_h80={'bmax': 2.5, 'bmin': 0.5},
+            kw_e04={'b': 0.25, 'm': 1.6, 'n': 0.9, 'R0': 420000},
+            kw_w06={'n': 0.79, 'X': 243000},
+            kw_m16={'n': 0.6}
+    ):
+        '''
+        Calculate wind and pressure field together, same as calculate_wind() and
+        calculate_pressure() with the same at, rmax_select and keyword arguments.
 
-        # Find appropriate rmax function to be used
-        # and calculate rmax
-        rmax_select_methods_available = ['mean', 'nearest', 'linear']
+        The points, vmax, rmax and the Holland B of the methods used for both wind and
+        pressure are computed only once for both the fields.
 
-        if isinstance(rmax_select, str):
-            try:
-                assert rmax_select in rmax_select_methods_available
-
-                if rmax_select == 'mean':
-                    rmax = np.mean([f(theta) for f in np.atleast_1d(self['frmax'])])
-
-                if rmax_select == 'nearest':
-                    try:
-                        radinfo = np.array([radi(theta) for radi in self['fradinfo']])
-                        radnn = np.argmin(np.abs(radinfo - r))
-                        rmax = np.array([f(theta) for f in np.atleast_1d(self['frmax'])])[radnn]
-                    except:
-                        rmax = np.atleast_1d(self['frmax'])[0](theta)
-                        raise Warning('nearest not possible, first rmax selected')
-
-                if rmax_select == 'linear':
-                    try:
-                        # x field from -inf to +inf
-                        radinfo = np.array([radi(theta) for radi in self['fradinfo']])
-                        radinfo = np.append(-np.inf, radinfo)
-                        radinfo = np.append(radinfo, np.inf)
-                        # y field 
-                        rmaxinfo = np.array([f(theta) for f in np.atleast_1d(self['frmax'])])
-                        rmaxinfo = np.append(rmaxinfo[0], rmaxinfo)
-                        rmaxinfo = np.append(rmaxinfo, rmaxinfo[-1])
-                        int_f = interp1d(radinfo, rmaxinfo)
-                        rmax = int_f(r)
-                    except:
-                        rmax = np.atleast_1d(self['frmax'])[0](theta)
-                        raise Warning('linear not possible, first rmax selected')
-            except:
-                rmax = np.atleast_1d(self['frmax'])[0](theta)
-                raise Warning(f'Wrong keyword for rmax method. First frmax is used')
-        elif isinstance(rmax_select, int):
-            try:
-                np.array([f(theta) for f in np.atleast_1d(self['frmax'])])[rmax_select]
-            except:
-                rmax = np.atleast_1d(self['frmax'])[0](theta)
-                raise Warning('Wrong rmax index. First frmax is used')
-        else:
-            rmax = np.atleast_1d(self['frmax'])[0](theta)
-            raise Warning('Wrong rmax selection keyword/index. First frmax is used')
+        at: (r, theta) location where the fields are calculated, see calculate_wind()
+        wind_methods, wind_rmax_frac: methods and rmax_frac for calculate_wind()
+        pressure_methods, pressure_rmax_frac: methods and rmax_frac for calculate_pressure()
+        rmax_select, kw_*: see calculate_wind()
 
-        # Now check methods and rmax_frac and apply method as required
-        # Avoid wrong input of rmax_frac
+        Returns u, v, mslp in the broadcast shape of r and theta
+        '''
         try:
-            assert len(rmax_frac) == len(methods)
+            r, theta_input = at
         except:
-            raise Exception('rmax_frac must corresponds to each listed method')
-        else:
-            rmax_frac = np.atleast_1d(rmax_frac)  # accomodates * of np.inf
+            raise Exception(f'the at must be in (r, theta) as list/array of size 2')
+
+        # All the points are computed at once on flat arrays, and reshaped at the end
+        r, theta_input, vmax, rmax, shape = self._eval_points(r, theta_input, rmax_select)
+
+        holland = {
+            method: self._holland_B(method, vmax, rmax, kw_atmos, kw_h80)
+            for method in ['H80', 'H80c'] if method in wind_methods and method in pressure_methods
+        }
 
-        rlim_min = np.append(0, rmax_frac)[0:-1] * rmax  # Starts from 0
-        rlim_max = rmax_frac * rmax
+        u, v = self._wind_uv(
+            self._vcirc_bands(
+                r, vmax, rmax, wind_methods, wind_rmax_frac, kw_atmos, kw_h80, kw_e04, kw_w06, kw_m16, holland
+            ),
+            theta_input,
+            shape,
+            kw_corr
+        )
+        mslp = self._mslp_bands(r, vmax, rmax, pressure_methods, pressure_rmax_frac, kw_atmos, kw_h80, holland)
+
+        return (u[()], v[()], mslp.reshape(shape)[()])
+
+    def _mslp_bands(self, r, vmax, rmax, methods, rmax_frac, kw_atmos, kw_h80, holland=None):
+        '''
+        Pressure at the flat points, each point computed with the method of its rmax fraction band.
 
+        holland: dict, Holland B of H80 and H80c already computed at all the points, computed per band if not given
+        '''
+        imethod = _rmax_frac_index(r, rmax, _check_rmax_frac(methods, rmax_frac))
+        mslp = np.full_like(r, np.nan)
         for i, method in enumerate(methods):
-            try:
-                assert r >= rlim_min[i]
-                assert r < rlim_max[i]
-
-                if method == 'H80':
-                    kwargs = {
-                        'vmax': vmax,
-                        'rmax': rmax,
-                        'pc': self['mslp'],
-                        'f': coriolis(self['lat']),
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair'],
-                        'bmax': kw_h80['bmax'],
-                        'bmin': kw_h80['bmin']
-                    }
-                    B = calc_holland_B_full(**kwargs)
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'pc': self['mslp'],
-                        'B': B,
-                        'pn': kw_atmos['pn']
-                    }
-                    mslp = calc_mslp[method](**kwargs)
-
-                if method == 'H80c':
-                    kwargs = {
-                        'vmax': vmax,
-                        'pc': self['mslp'],
-                        'pn': kw_atmos['pn'],
-                        'rhoair': kw_atmos['rhoair'],
-                        'bmax': kw_h80['bmax'],
-                        'bmin': kw_h80['bmin']
-                    }
-                    B = calc_holland_B(**kwargs)
-                    kwargs = {
-                        'r': r,
-                        'Rm': rmax,
-                        'pc': self['mslp'],
-                        'B': B,
-                        'pn': kw_atmos['pn']
-                    }
-                    mslp = calc_mslp[method](**kwargs)
-
-                break
-            except:
+            band = imethod == i
+            if method not in ['H80', 'H80c'] or not np.any(band):
                 continue
+            _rmax = rmax[band]
+
+            B = self._band_holland_B(method, band, vmax[band], _rmax, kw_atmos, kw_h80, holland)
+            mslp[band] = calc_mslp_h80(r=r[band], Rm=_rmax, pc=self['mslp'], B=B, pn=kw_atmos['pn'])
 
         return (mslp)
 
+    def _holland_B(self, method, vmax, rmax, kw_atmos, kw_h80):
+        '''
+        Holland B parameter for H80 (with the coriolis term) or H80c
+        '''
+        if method == 'H80':
+            B = calc_holland_B_full(
+                vmax=vmax,
+                rmax=rmax,
+                pc=self['mslp'],
+                f=self._f,
+                pn=kw_atmos['pn'],
+                rhoair=kw_atmos['rhoair'],
+                bmax=kw_h80['bmax'],
+                bmin=kw_h80['bmin']
+            )
+        else:
+            B = calc_holland_B(
+                vmax=vmax,
+                pc=self['mslp'],
+                pn=kw_atmos['pn'],
+                rhoair=kw_atmos['rhoair'],
+                bmax=kw_h80['bmax'],
+                bmin=kw_h80['bmin']
+            )
+
+        return (B)
+
+    def _band_holland_B(self, method, band, vmax, rmax, kw_atmos, kw_h80, holland=None):
+        '''
+        Holland B in a band, taken from holland if it is already computed at all the points
+        '''
+        if holland is not None and method in holland:
+            return (holland[method][band])
+        else:
+            return (self._holland_B(method, vmax, rmax, kw_atmos, kw_h80))
+
     def __str__(self):
         repr_str = f'\t'.join([str(self[key]) for key in self])
         return (repr_str)
 
 
 class Track:
+    # Scalar record fields kept as columns of the track
+    _columns = ('lon', 'lat', 'mslp', 'vmax', 'rmax', 'ustorm', 'vstorm')
+
     def __init__(self, records):
         '''
         Take a record or an array of record and provide track related functionalities.
@@ -758,14 +941,16 @@ class Track:
         except:
             raise Exception(f'Records must be a single or an array of records')
 
+        # The records are kept as an object array for indexing, and iterated through records.tolist(),
+        # as a list is faster to iterate than an object array
         self.records = np.atleast_1d(records)
 
         try:
-            assert np.all([isinstance(i, Record) for i in self.records])
+            assert all(isinstance(i, Record) for i in self.records.tolist())
         except:
             raise Exception(f'The records must be an array of Record object')
 
-        self.timeindex = pd.to_datetime([record['timestamp'] for record in self.records])
+        self.timeindex = self._gather_timeindex()
 
         self.sort()  # To put all records in ascending order
         self.calc_translation()  # Recalculate translation speed
@@ -797,7 +982,7 @@ class Track:
             except:
                 raise Exception(f'Accessor must be parsable by pd.to_datetime')
 
-            track = Track(self.records[self.timeindex == key])
+            track = Track(self.records[self._locate(key)])
 
         return track
 
@@ -810,7 +995,8 @@ class Track:
         except:
             raise Exception(f'Accessor must be parsable by pd.to_datetime')
 
-        self.records[self.timeindex == key] = value
+        self.records[self._locate(key)] = value
+        self._build_columns()
 
     def __contains__(self, key):
         '''
@@ -819,47 +1005,127 @@ class Track:
         try:
             key = pd.to_datetime(key)
         except:
-            key = key
+            return False
 
-        return key in self.timeindex
+        located = self._locate(key)
+        return located.stop > located.start
 
     def __getattr__(self, name):
         '''
         Implements accessing the the dictionary objects as array.
+
+        The scalar fields in Track._columns are returned as a copy of the columns built from the
+        records, rebuilt when one of the records was changed or replaced since. Other fields are
+        collected from the records.
         '''
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        if name in self._columns:
+            return (self._get_columns()[name].copy())
+
         try:
-            attr = np.array([record[name] for record in self.records])
+            attr = np.array([record[name] for record in self.records.tolist()])
         except:
             raise Exception(f'{name} not found in the records')
 
         return attr
 
+    def _build_columns(self):
+        '''
+        Build the columns of the scalar fields from the records
+        '''
+        records = self.records.tolist()
+        self._cols = {
+            name: np.array([record[name] for record in records], dtype=float) for name in self._columns
+        }
+        self._cols_versions = [record._version for record in records]
+
+    def _get_columns(self):
+        '''
+        Columns of the scalar fields, rebuilt if the records or any of their fields changed since they were built.
+        A changed or new record has a version not seen when the columns were built.
+        '''
+        if self._cols_versions != [record._version for record in self.records.tolist()]:
+            self._build_columns()
+
+        return (self._cols)
+
+    def _gather_timeindex(self):
+        '''
+        Gather the time index from the timestamps already parsed by the records
+        '''
+        return (pd.DatetimeIndex(np.array([record._datetime64 for record in self.records.tolist()])))
+
+    def _locate(self, key):
+        '''
+        Slice of the records at the timestamp key, found by binary search in the sorted time index
+        '''
+        key = np.datetime64(key.to_datetime64(), 'ns')
+        return (slice(
+            np.searchsorted(self._timevalues, key, side='left'),
+            np.searchsorted(self._timevalues, key, side='right')
+        ))
+
     def sort(self):
         '''
         Apply time sorting and sort the records
         '''
         isort = np.argsort(self.timeindex)
         self.timeindex = self.timeindex[isort]
+        self._timevalues = self.timeindex.values.astype('datetime64[ns]')
         self.records = self.records[isort]
+        self._build_columns()
 
     def calc_translation(self):
         '''
         Calculate and update the ustorm, vstorm fields.
         '''
-        for i in np.arange(0, len(self.records) - 1):
-            dt = (self.timeindex[i + 1] - self.timeindex[i]).total_seconds()
-            dtrans_x, dtrans_y = gc_distance(
-                of_x=self.records[i + 1]['lon'],
-                of_y=self.records[i + 1]['lat'],
-                origin_x=self.records[i]['lon'],
-                origin_y=self.records[i]['lat']
-            )
-            self.records[i]['ustorm'] = dtrans_x / dt
-            self.records[i]['vstorm'] = dtrans_y / dt
+        if len(self.records) < 2:
+            return
+
+        # All the segments at once
+        lon = self.lon.astype(float)
+        lat = self.lat.astype(float)
+        dt = np.asarray((self.timeindex[1:] - self.timeindex[:-1]).total_seconds())
+        dtrans_x, dtrans_y = gc_distance(of_x=lon[1:], of_y=lat[1:], origin_x=lon[:-1], origin_y=lat[:-1])
+
+        ustorm = dtrans_x / dt
+        vstorm = dtrans_y / dt
+
+        # For the last time step, we are keeping it to the same
+        ustorm = np.append(ustorm, ustorm[-1])
+        vstorm = np.append(vstorm, vstorm[-1])
+
+        cols = self._get_columns()
+        for record, ustorm_i, vstorm_i in zip(self.records.tolist(), ustorm, vstorm):
+            record['ustorm'] = ustorm_i
+            record['vstorm'] = vstorm_i
 
-            # For the last time step, we are keeping it to the same
-            self.records[-1]['ustorm'] = self.records[-2]['ustorm']
-            self.records[-1]['vstorm'] = self.records[-2]['vstorm']
+        # Only the translation changed in the records, the other columns are up to date
+        cols['ustorm'] = ustorm
+        cols['vstorm'] = vstorm
+        self._cols_versions = [record._version for record in self.records.tolist()]
+
+    def coriolis(self):
+        '''
+        Coriolis parameter at the center of each record, calculated over the whole track at once.
+        '''
+        return (coriolis(self.lat.astype(float)))
+
+    def calc_rmax_s02(self):
+        '''
+        Rmax from the central pressure of each record with Silva et al. 2002 regression,
+        calculated over the whole track at once.
+        '''
+        return (calc_rmax_s02(mslp=self.mslp.astype(float)))
+
+    def calc_rmax_w04(self):
+        '''
+        Rmax from the maximum wind and latitude of each record with Willoughby and Rahn (2004)
+        regression, calculated over the whole track at once.
+        '''
+        return (calc_rmax_w04(vmax=self.vmax.astype(float), lat=self.lat.astype(float)))
 
     def append(self, records):
         try:
@@ -875,7 +1141,7 @@ class Track:
             raise Exception(f'The records must be an array of Record object')
 
         self.records = np.append(self.records, records)
-        self.timeindex = pd.to_datetime([record.timestamp for record in self.records])
+        self.timeindex = self._gather_timeindex()
         self.sort()  # To put all record in ascending order
         self.calc_translation()  # Recalculate translation speed
 
@@ -892,7 +1158,7 @@ class Track:
             raise Exception(f'Out of interpolation range')
 
         # Calculate the corresponding indices
-        i_right = np.searchsorted(a=self.timeindex, v=at, side='left')
+        i_right = np.searchsorted(self._timevalues, np.datetime64(at.to_datetime64(), 'ns'), side='left')
 
         if i_right == 0:
             i_left = 0
@@ -912,84 +1178,30 @@ class Track:
             w_right = float(0)
 
         # Create Record for the necessary fields with direct interpolation
+        cols = self._get_columns()
         int_record = Record(
             timestamp=at,
-            lon=self.records[i_left]['lon'] * w_left + self.records[i_right]['lon'] * w_right,
-            lat=self.records[i_left]['lat'] * w_left + self.records[i_right]['lat'] * w_right,
-            mslp=self.records[i_left]['mslp'] * w_left + self.records[i_right]['mslp'] * w_right,
-            vmax=self.records[i_left]['vmax'] * w_left + self.records[i_right]['vmax'] * w_right,
-            rmax=self.records[i_left]['rmax'] * w_left + self.records[i_right]['rmax'] * w_right,
-            ustorm=self.records[i_left]['ustorm'] * w_left + self.records[i_right]['ustorm'] * w_right,
-            vstorm=self.records[i_left]['vstorm'] * w_left + self.records[i_right]['vstorm'] * w_right
+            **{name: cols[name][i_left] * w_left + cols[name][i_right] * w_right for name in self._columns}
         )
 
-        # now interpolate vinfo and radinfo
+        # now interpolate vinfo and radinfo over the vinfo common to both records
         # export np.nan if not available
-        vinfo_left = self.records[i_left]['vinfo']
-        lvinfo_left = len(vinfo_left)
-        vinfo_right = self.records[i_right]['vinfo']
-        lvinfo_right = len(vinfo_right)
+        vinfo_left = np.atleast_1d(self.records[i_left]['vinfo'])
+        vinfo_right = np.atleast_1d(self.records[i_right]['vinfo'])
         radinfo_left = np.atleast_2d(self.records[i_left]['radinfo'])
-        sradinfo_left = radinfo_left.shape
         radinfo_right = np.atleast_2d(self.records[i_right]['radinfo'])
-        sradinfo_right = radinfo_right.shape
 
-        # Checking if the left and right are same size
-        if lvinfo_left == lvinfo_right:
-            vinfo_diff = False
-        else:
-            vinfo_diff = True
-
-        # Interpolating
-        if vinfo_diff:
-            # vinfo size is different more check is needed
-            min_vinfo_length = np.min([lvinfo_left, lvinfo_right])
-            vinfo = vinfo_left[0:min_vinfo_length]
-
-            # First find which one is the longer and set radinfo size
-            if lvinfo_left > lvinfo_right:
-                radinfo = np.zeros(shape=(min_vinfo_length, sradinfo_left[1]))
-            elif lvinfo_left < lvinfo_right:
-                radinfo = np.zeros(shape=(min_vinfo_length, sradinfo_right[1]))
-
-            for i in np.arange(min_vinfo_length):
-                if np.any([np.isnan(vinfo_left[i]), np.isnan(vinfo_right[i])]):
-                    radinfo = radinfo * np.nan
-                else:
-                    vinfo[i] = vinfo_left[i]
-                    for j in np.arange(radinfo.shape[1]):
-                        radinfo[i, j] = radinfo_left[i, j] * w_left + radinfo_right[i, j] * w_right
+        nvinfo = np.min([len(vinfo_left), len(vinfo_right)])
+        vinfo = vinfo_left[0:nvinfo].astype(float)
+        radinfo = radinfo_left[0:nvinfo] * w_left + radinfo_right[0:nvinfo] * w_right
+
+        # vinfo missing or zero in any of the records
+        missing = np.isnan(vinfo) | np.isnan(vinfo_right[0:nvinfo]) | (vinfo == 0) | (vinfo_right[0:nvinfo] == 0)
+        if np.all(missing):
+            vinfo = np.nan
+            radinfo = np.nan
         else:
-            # vinfo size is same
-            len_vinfo = lvinfo_left
-            # If the both of them has length 1
-            if len_vinfo == 1:
-                # Return missing if vinfo itselft is missing
-                if np.any([np.isnan(vinfo_left[0]), np.isnan(vinfo_right[0])]):
-                    vinfo = np.nan
-                    radinfo = np.nan
-                # Or set to zero
-                elif np.any([vinfo_left[0] == 0, vinfo_right[0] == 0]):
-                    vinfo = np.nan
-                    radinfo = np.nan
-                # Otherwise calculate the linear interpolation
-                else:
-                    vinfo = vinfo_left[0]
-                    radinfo = np.zeros_like(radinfo_left)
-                    for j in np.arange(sradinfo_left[0]):
-                        radinfo[j] = radinfo_left[j] * w_left + radinfo_right[j] * w_right
-            elif len_vinfo > 1:
-                # If both of them as length > 1
-                vinfo = vinfo_left
-                shape_radinfo = (lvinfo_left, sradinfo_left[1])
-                radinfo = np.zeros(shape=shape_radinfo)
-                for i, _ in enumerate(vinfo):
-                    if np.any([np.isnan(vinfo_left[i]), np.isnan(vinfo_right[i])]):
-                        radinfo = radinfo * np.nan
-                    else:
-                        vinfo[i] = vinfo_left[i]
-                        for j in np.arange(shape_radinfo[1]):
-                            radinfo[i, j] = radinfo_left[i, j] * w_left + radinfo_right[i, j] * w_right
+            radinfo[missing] = np.nan
 
         # Providing the same as the dataset if interpolated on a given time
         if w_right == 1:
@@ -1020,5 +1232,5 @@ class Track:
         '''
         String representation for print function.
         '''
-        out_str = '\n'.join(str(record) for record in self.records)
+        out_str = '\n'.join(str(record) for record in self.records.tolist())
         return (out_str)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from copy import deepcopy
 import numpy as np
 from pycaz.schism.hgrid import OpenBoundary
 from pycaz.schism.tidefac import Tidefac
@@ -15,6 +14,218 @@ from pycaz.typing import PathLike
 logger = logging.getLogger(__name__)
 
 
+def _parse_block(lines: List[str]) -> np.ndarray:
+    """
+    Parse a block of lines with the same number of numeric values per line, e.g., the amplitude and phase of a
+    constituent at each boundary node, with a single C-level tokenizer pass.
+
+    :param lines: List of comment-stripped lines
+    :return: Array of shape (len(lines), values per line)
+    """
+    return np.fromstring(' '.join(lines), sep=' ').reshape(len(lines), -1)
+
+
+def _parse_floats(line: str, n: int) -> tuple:
+    """
+    Parse the first `n` numeric values of a line, e.g., the constants of a tidal potential term.
+
+    :param line: Comment-stripped line
+    :param n: Number of values to parse
+    :return: Tuple of floats
+    """
+    return (tuple(map(float, line.split()[:n])))
+
+
+def _format_block(values: np.ndarray, fmt: str) -> str:
+    """
+    Format a block of values as lines of text in a single formatting call, the same text as np.savetxt.
+
+    :param values: Array of shape (nlines,) or (nlines, values per line)
+    :param fmt: Format of a line, e.g., '%.15f\\t%.15f', without the newline
+    :return: Text of the block with a newline after each line
+    """
+    values = np.asarray(values)
+    values = values.reshape(len(values), -1)
+    return ((fmt + '\n') * len(values)) % tuple(values.ravel().tolist())
+
+
+# Readers and writers of the boundary condition inputs, dispatched by the type codes (iettype, ifltype, itetype,
+# isatype) of each open boundary. A reader takes the lines, the current line number, neta and the tidal
+# constituents, and returns the value stored in the boundary (None if no input) with the last line number read.
+# A writer takes the file, the stored value and the tidal constituents.
+
+def _read_none(txt: List[str], ln: int, neta: int, consts: List[str]):
+    return None, ln
+
+
+def _read_value(txt: List[str], ln: int, neta: int, consts: List[str]):
+    ln += 1
+    return float(txt[ln]), ln
+
+
+def _read_tidal(txt: List[str], ln: int, neta: int, consts: List[str]):
+    # Each constituent is a name line followed by neta lines of values. The values of all the constituents are
+    # parsed together in a single pass, then split by constituent.
+    nline = neta + 1
+    section = txt[ln + 1:ln + 1 + len(consts) * nline]
+    if not section:
+        return {}, ln
+    names = section[::nline]
+    del section[::nline]
+    blocks = _parse_block(section).reshape(len(names), neta, -1)
+    values = {alpha.strip(): block for alpha, block in zip(names, blocks)}
+    return values, ln + len(consts) * nline
+
+
+def _read_relaxation(txt: List[str], ln: int, neta: int, consts: List[str]):
+    ln += 1
+    rel1, rel2 = _parse_floats(txt[ln], 2)
+    return {'rel1': rel1, 'rel2': rel2}, ln
+
+
+def _read_flather(txt: List[str], ln: int, neta: int, consts: List[str]):
+    ln += 1  # should give a text value 'eta_mean'
+    ln += 1  # starts eta_mean values
+    eta_mean = _parse_block(txt[ln:ln + neta]).ravel()
+    ln += neta - 1
+    ln += 1  # should give a text value 'vn_mean'
+    ln += 1  # starts vn_mean values
+    vn_mean = _parse_block(txt[ln:ln + neta])
+    ln += neta - 1
+    return {'eta_mean': eta_mean, 'vn_mean': vn_mean}, ln
+
+
+def _read_constant_nudging(txt: List[str], ln: int, neta: int, consts: List[str]):
+    ln += 1
+    tthconst = float(txt[ln])
+    ln += 1
+    tobc = float(txt[ln])
+    return {'tthconst': tthconst, 'tobc': tobc}, ln
+
+
+def _write_none(f, value, consts: List[str]) -> None:
+    pass
+
+
+def _write_value(f, value, consts: List[str]) -> None:
+    f.write(f'{value}\n')
+
+
+def _write_tidal(f, values, consts: List[str]) -> None:
+    # The blocks of all the constituents are stacked and written with a single formatting call, the names being
+    # part of the format. A row has the amplitude and phase of each component, i.e., 2 columns for the elevation
+    # and 4 (uamp uphase vamp vphase) for the velocity.
+    blocks = [np.asarray(values[const]) for const in consts]
+    blocks = [block.reshape(len(block), -1) for block in blocks]
+    fmt = ''.join(
+        const.replace('%', '%%') + '\n' + ('\t'.join(['%.15f'] * block.shape[1]) + '\n') * len(block)
+        for const, block in zip(consts, blocks))
+    f.write(fmt % tuple(np.concatenate([np.empty(0)] + [block.ravel() for block in blocks]).tolist()))
+
+
+def _write_relaxation(f, value, consts: List[str]) -> None:
+    f.write('{rel1} {rel2}\n'.format(**value))
+
+
+def _write_flather(f, value, consts: List[str]) -> None:
+    f.write('eta_mean !mean elevation below\n')
+    f.write(_format_block(value['eta_mean'], '%.2f'))
+    f.write('vn_mean !mean normal velocity\n')
+    f.write(_format_block(value['vn_mean'], '%.3f %0.3f'))
+
+
+def _write_constant_nudging(f, value, consts: List[str]) -> None:
+    f.write('{tthconst}\n{tobc}\n'.format(**value))
+
+
+# Elevation boundary conditions, iettype
+#   0: elevations are not specified for this boundary (in this case the velocity must be specified)
+#   1: no input in bctides.in; time history of elevation is read in from elev.th (ASCII)
+#   2: constant elevation value for this segment
+#   3: tidal forcing
+#   4: no input in this file; time history of elevation is read in from elev2D.th.nc (netcdf)
+#   5: combination of 3 and 4
+_ET_TYPES = {
+    0: (_read_none, _write_none),
+    1: (_read_none, _write_none),
+    2: (_read_value, _write_value),
+    3: (_read_tidal, _write_tidal),
+    4: (_read_none, _write_none),
+    5: (_read_tidal, _write_tidal)
+}
+
+# Velocity boundary conditions, ifltype
+#   0: no boundary specified, no input needed. Elev boundary must be specified.
+#   1: no input in this file; time history of discharge is read in from flux.th (ASCII)
+#   2: constant discharge (note that a negative number means inflow)
+#   3: vel. (not discharge!) is forced in frequency domain, tidal forcing
+#   4: time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
+#   5: combination of 3 and 4
+#  -4: time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
+#      rel1, rel2: relaxation constants for inflow and outflow (between 0 and 1 with 1 being strongest nudging)
+#  -1: flather type boundary condition, iettype must be 0
+_FL_TYPES = {
+    0: (_read_none, _write_none),
+    1: (_read_none, _write_none),
+    2: (_read_value, _write_value),
+    3: (_read_tidal, _write_tidal),
+    4: (_read_none, _write_none),
+    5: (_read_tidal, _write_tidal),
+    -4: (_read_relaxation, _write_relaxation),
+    -1: (_read_flather, _write_flather)
+}
+
+# Temperature and salinity boundary conditions, itetype and isatype
+#   0: not specified
+#   1: time history on this boundary, here only nudging factor (between 0 and 1 with 1 being strongest nudging)
+#      for inflow; time history will be read in from TEM_1.th or SAL_1.th (ASCII)
+#   2: forced by a constant value on this segment, followed by the nudging factor (between 0 and 1) for inflow
+#   3: initial profile for inflow, nudging factor (between 0 and 1) for inflow
+#   4: 3D input, time history is read in from TEM_3D.th.nc or SAL_3D.th.nc (netcdf), nudging factor for inflow
+_TS_TYPES = {
+    0: (_read_none, _write_none),
+    1: (_read_value, _write_value),
+    2: (_read_constant_nudging, _write_constant_nudging),
+    3: (_read_value, _write_value),
+    4: (_read_value, _write_value)
+}
+
+# Type code key, field key and the handlers of each boundary condition, in the order they appear in the file
+_BOUNDARY_CONDITIONS = (
+    ('iettype', 'et', _ET_TYPES),
+    ('ifltype', 'fl', _FL_TYPES),
+    ('itetype', 'te', _TS_TYPES),
+    ('isatype', 'sa', _TS_TYPES)
+)
+
+
+def _boundary_handlers(bc_types: Dict, typekey: str, bctype: int, bnd) -> tuple:
+    """
+    Reader and writer for a boundary condition type code, raises an Exception for an unknown code.
+    """
+    try:
+        return bc_types[bctype]
+    except KeyError:
+        raise Exception(f'Boundary {bnd} : {typekey} {bctype} is not implemented!')
+
+
+def _copy_nested(value):
+    """
+    Copy the nested dictionaries (keeping their class), lists and arrays of `value`. The other values, i.e.,
+    numbers and strings, are immutable and shared.
+    """
+    if isinstance(value, dict):
+        new = type(value).__new__(type(value))
+        dict.update(new, ((key, _copy_nested(item)) for key, item in value.items()))
+        return (new)
+    elif isinstance(value, np.ndarray):
+        return (value.copy())
+    elif isinstance(value, list):
+        return ([_copy_nested(item) for item in value])
+    else:
+        return (value)
+
+
 class Bctides(dict):
     def __init__(self, **kwargs):
         """ A bctides object extended from dictonaries
@@ -42,7 +253,12 @@ class Bctides(dict):
         self.update(kwargs)
 
     def copy(self):
-        return deepcopy(self)
+        """
+        Copy of the bctides, with the nested dictionaries, lists and arrays copied without going through deepcopy.
+
+        :return: Bctides
+        """
+        return (_copy_nested(self))
 
     @property
     def header(self) -> str:
@@ -176,15 +392,16 @@ def read_bctides(fname: PathLike) -> Bctides:
     """
     bctides = Bctides()
     with open(fname) as f:
-        txt = f.readlines()
+        txt = f.read().splitlines()
 
-    txt = [t.split('!')[0].strip() for t in txt]
+    # Comments are stripped only from the lines having one, the numeric lines of the tidal blocks mostly do not
+    txt = [(t.split('!', 1)[0] if '!' in t else t).strip() for t in txt]
 
     # Header
     bctides.update(header=txt[0])
 
     # Tidal potential
-    ntip, tip_dp = np.fromstring(txt[1], count=2, sep=' ')
+    ntip, tip_dp = _parse_floats(txt[1], 2)
     bctides.update(potential={
         'ntip': int(ntip),
         'tip_dp': tip_dp,
@@ -193,11 +410,11 @@ def read_bctides(fname: PathLike) -> Bctides:
 
     ln = 1
 
-    for k in np.arange(bctides['potential']['ntip']):
+    for k in range(bctides['potential']['ntip']):
         ln += 1
         talpha = txt[ln].strip()
         ln += 1
-        jspc, tamp, tfreq, tnf, tear = np.fromstring(txt[ln], count=5, sep=' ')
+        jspc, tamp, tfreq, tnf, tear = _parse_floats(txt[ln], 5)
         bctides['potential']['const'][talpha] = {
             'spc': int(jspc),
             'amp': tamp,
@@ -214,11 +431,13 @@ def read_bctides(fname: PathLike) -> Bctides:
         'const': {}
     })
 
-    for k in np.arange(bctides['tidefr']['nbfr']):
+    consts = []  # constituents in the order of the file, repeated in the tidal boundary blocks
+    for k in range(bctides['tidefr']['nbfr']):
         ln += 1
         alpha = txt[ln].strip()
+        consts.append(alpha)
         ln += 1
-        amig, ff, face = np.fromstring(txt[ln], count=3, sep=' ')
+        amig, ff, face = _parse_floats(txt[ln], 3)
         bctides['tidefr']['const'][alpha] = {
             'amig': amig,
             'ff': ff,
@@ -231,159 +450,47 @@ def read_bctides(fname: PathLike) -> Bctides:
 
     # we want keep the sequence of the boundary intact
     # so boundaries will be identified using j+1 dictionary key
-    for j in np.arange(nopen):
+    for j in range(nopen):
         boundary = OpenBoundary(name=f'{j + 1}')
         ln += 1
-        neta, iettype, ifltype, itetype, isatype = np.fromstring(txt[ln], dtype=int, count=5, sep=' ')
+        neta, iettype, ifltype, itetype, isatype = map(int, txt[ln].split()[:5])
 
         if iettype == 0 and ifltype == 0:
             warnings.warn(f'Boundary {j} : Both elevation and flow are set to 0! One of them must be active.')
 
-        boundary.update(neta=neta, iettype=iettype, ifltype=ifltype, itetpye=itetype, isatype=isatype)
-
-        # Elevation boundary conditions, iettype
-        if iettype == 0 or iettype == 1 or iettype == 4:
-            # 0 : elevations are not specified for this boundary (in this case the velocity must be specified)
-            # 1 : no input in bctides.in; time history of elevation is read in from elev.th (ASCII)
-            # 4 : no input in this file; time history of elevation is read in from elev2D.th.nc (netcdf)
-            pass
-        elif iettype == 2:
-            # constant elevation value for this segment
-            ln += 1
-            ethconst = float(txt[ln])
-            boundary['et'][iettype] = ethconst
-        elif iettype == 3 or iettype == 5:
-            # 3: tidal forcing
-            # 5: combination of 3 and 4
-            values = {}
-            for k in np.arange(bctides['tidefr']['nbfr']):
-                ln += 1
-                alpha = txt[ln].strip()
-                ln += 1
-                emo_efa = np.genfromtxt(txt[ln:ln + neta], encoding='UTF8')
-                values[alpha] = emo_efa
-                ln += neta - 1  # removes 1 for 0-based indexing
-            boundary['et'][iettype] = values
-
-        # Velocity boundary conditions, ifltype
-        if ifltype == 0 or ifltype == 1 or ifltype == 4:
-            # 0: no boundary specified, no input needed. Elev boundary must be specified.
-            # 1: no input in this file; time history of discharge is read in from flux.th (ASCII)
-            # 4: time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
-            pass
-        elif ifltype == 2:
-            # constant discharge (note that a negative number means inflow)
-            ln += 1
-            vthconst = float(txt[ln])
-            boundary['fl'][ifltype] = vthconst
-        elif ifltype == 3 or ifltype == 5:
-            # vel. (not discharge!) is forced in frequency domain
-            # 3: tidal forcing
-            # 5: combination of 3 and 4
-            values = {}
-            for k in np.arange(bctides['tidefr']['nbfr']):
-                ln += 1
-                alpha = txt[ln].strip()
-                ln += 1
-                emo_efa = np.genfromtxt(txt[ln:ln + neta], encoding='UTF8')
-                values[alpha] = emo_efa
-                ln += neta - 1  # removes 1 for 0-based indexing
-            boundary['fl'][ifltype] = values
-        elif ifltype == -4:
-            # time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
-            # rel1, rel2: relaxation constants for inflow and outflow (between 0 and 1 with 1 being strongest nudging)
-            ln += 1
-            rel1, rel2 = np.fromstring(txt[ln], count=2, sep=' ')
-            boundary['fl'][ifltype] = {'rel1': rel1, 'rel2': rel2}
-        elif ifltype == -1:
-            # flather type boundary condition, iettype must be 0
-            ln += 1  # should give a text value 'eta_mean'
-            ln += 1  # starts eta_mean values
-            eta_mean = np.genfromtxt(txt[ln:ln + neta])
-            ln += neta - 1
-            ln += 1  # should give a text value 'vn_mean'
-            ln += 1  # starts vn_mean values
-            vn_mean = np.genfromtxt(txt[ln:ln + neta])
-            ln += neta - 1
-            boundary['fl'][ifltype] = {
-                'eta_mean': eta_mean,
-                'vn_mean': vn_mean
-            }
-
-        # Temperature boundary condition
-        if itetype == 0:
-            # 0: Temperature not specified
-            pass
-        elif itetype == 1:
-            # time history of temperature on this boundary
-            # here only nudging factor (between 0 and 1 with 1 being strongest nudging) for inflow; 
-            # time history of temperature will be read in from TEM_1.th (ASCII)
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][itetype] = tobc
-        elif itetype == 2:
-            # this boundary is forced by a constant temperature
-            # constant temperature on this segment
-            ln += 1
-            tthconst = float(txt[ln])
-            # nudging factor (between 0 and 1) for inflow
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][itetype] = {'tthconst': tthconst, 'tobc': tobc}
-        elif itetype == 3:
-            # initial temperature profile for inflow
-            # nudging factor (between 0 and 1) for inflow
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][itetype] = tobc
-        elif itetype == 4:
-            # 3D input
-            # time history of temperature is read in from TEM_3D.th.nc (netcdf)
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][itetype] = tobc
-
-        # Salinity boundary condition
-        if isatype == 0:
-            # 0: Temperature not specified
-            pass
-        elif isatype == 1:
-            # time history of salinity on this boundary
-            # here only nudging factor (between 0 and 1 with 1 being strongest nudging) for inflow; 
-            # time history of temperature will be read in from SAL_1.th (ASCII)
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][isatype] = tobc
-        elif isatype == 2:
-            # this boundary is forced by a constant salinity
-            # constant salinity on this segment
-            ln += 1
-            tthconst = float(txt[ln])
-            # nudging factor (between 0 and 1) for inflow
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][isatype] = {'tthconst': tthconst, 'tobc': tobc}
-        elif isatype == 3:
-            # initial salinity profile for inflow
-            # nudging factor (between 0 and 1) for inflow
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][isatype] = tobc
-        elif isatype == 4:
-            # 3D input
-            # time history of salinity is read in from SAL_3D.th.nc (netcdf)
-            ln += 1
-            tobc = float(txt[ln])
-            boundary['te'][isatype] = tobc
+        boundary.update(neta=neta, iettype=iettype, ifltype=ifltype, itetype=itetype, isatype=isatype)
+
+        # Elevation, velocity, temperature and salinity boundary conditions, read by their type code
+        for typekey, key, bc_types in _BOUNDARY_CONDITIONS:
+            bctype = boundary[typekey]
+            reader, _ = _boundary_handlers(bc_types, typekey, bctype, j + 1)
+            value, ln = reader(txt, ln, neta, consts)
+            if value is not None:
+                boundary[key][bctype] = value
 
         bctides['open_bnds'][j + 1] = boundary
 
     return (bctides)
 
 
+def _update_consts(consts: Dict, tidefac_consts: Dict, fields: List[tuple]) -> tuple:
+    """
+    Copy the `fields`, as (key, tidefac key) pairs, of the constituents available in `tidefac_consts` into `consts`.
+
+    :return: Lists of the updated and not updated constituents
+    """
+    _updated = [const for const in consts if const in tidefac_consts]
+    _not_updated = [const for const in consts if const not in tidefac_consts]
+    for const in _updated:
+        values = tidefac_consts[const]
+        consts[const].update((key, values[tkey]) for key, tkey in fields)
+
+    return (_updated, _not_updated)
+
+
 def update_bctide(bctides: Bctides, tidefac: Tidefac, nodal: bool = True, eq_arg: bool = True, inplace: bool = False):
     """
-    Update `bctides` with `tidefac`. If `inplace=True`, then `bctides` will be copied first.
+    Update `bctides` with `tidefac`. If `inplace=False`, then `bctides` will be copied first.
 
     :param bctides: Bctides object, either read or generated.
     :param tidefac: Tidefac object, either read or generated.
@@ -403,37 +510,23 @@ def update_bctide(bctides: Bctides, tidefac: Tidefac, nodal: bool = True, eq_arg
     if eq_arg:
         logger.debug('Equilibrium argument update requested')
 
-    # update potential
-    _updated = []
-    _not_updated = []
-    if 'const' in bctides['potential']:
-        for const in bctides['potential']['const']:
-            if const in tidefac.consts:
-                if nodal:
-                    bctides['potential']['const'][const].update(nf=tidefac['const'][const]['nf'])
-                if eq_arg:
-                    bctides['potential']['const'][const].update(ear=tidefac['const'][const]['ear'])
-                _updated.append(const)
-            else:
-                _not_updated.append(const)
+    # (bctides key, tidefac key) pairs to be updated
+    potential_fields = []
+    tidefr_fields = []
+    if nodal:
+        potential_fields.append(('nf', 'nf'))
+        tidefr_fields.append(('ff', 'nf'))
+    if eq_arg:
+        potential_fields.append(('ear', 'ear'))
+        tidefr_fields.append(('face', 'ear'))
 
+    # update potential
+    _updated, _not_updated = _update_consts(bctides_new['potential'].get('const', {}), tidefac.consts, potential_fields)
     logger.info('Potential: updated - ' + ', '.join(_updated))
     logger.info('Potential: not updated - ' + ', '.join(_not_updated))
 
     # update forced tidal harmonics
-    _updated = []
-    _not_updated = []
-    if 'const' in bctides['tidefr']:
-        for const in bctides['tidefr']['const']:
-            if const in tidefac.consts:
-                if nodal:
-                    bctides['tidefr']['const'][const].update(ff=tidefac['const'][const]['nf'])
-                if eq_arg:
-                    bctides['tidefr']['const'][const].update(face=tidefac['const'][const]['ear'])
-                _updated.append(const)
-            else:
-                _not_updated.append(const)
-
+    _updated, _not_updated = _update_consts(bctides_new['tidefr'].get('const', {}), tidefac.consts, tidefr_fields)
     logger.info('Tidefr: updated - ' + ', '.join(_updated))
     logger.info('Tidefr: not updated - ' + ', '.join(_not_updated))
 
@@ -456,27 +549,28 @@ def write_bctides(bctides: Bctides, fname: PathLike, replace: bool = False) -> N
     if os.path.exists(fname) and not replace:
         raise Exception(f'{fname} already exists! Set replace=True if you want to replace.')
 
-    with open(fname, 'w') as f:
+    # The whole tidal section of a boundary is written at once, a large buffer keeps it to a few write calls
+    with open(fname, 'w', buffering=1 << 20) as f:
         # Header
         f.write('{header}\n'.format(**bctides))
 
         # Tidal potential
         f.write('{ntip}\t{tip_dp} !ntip, tip_dp\n'.format(**bctides['potential']))
-        for const in bctides['potential']['const']:
+        for const, potential in bctides['potential']['const'].items():
             f.write(f'{const}\n')
-            f.write('{spc:1d}\t{amp:.6f}\t{freq:.15f}\t{nf:.6f}\t{ear:.2f}\n'.format(
-                **bctides['potential']['const'][const]))
+            f.write('{spc:1d}\t{amp:.6f}\t{freq:.15f}\t{nf:.6f}\t{ear:.2f}\n'.format(**potential))
 
         # Tidal frequencies
         f.write('{nbfr} !nbfr\n'.format(**bctides['tidefr']))
-        for const in bctides['tidefr']['const']:
+        for const, tidefr in bctides['tidefr']['const'].items():
             f.write(f'{const}\n')
-            f.write('{amig:.15f}\t{ff:.6f}\t{face:.2f}\n'.format(**bctides['tidefr']['const'][const]))
+            f.write('{amig:.15f}\t{ff:.6f}\t{face:.2f}\n'.format(**tidefr))
 
         # Open boundaries
         nopen = len(bctides['open_bnds'])
         f.write(f'{nopen} !Number of Open Boundaries\n')
-        for bnd in np.arange(nopen) + 1:
+        consts = list(bctides['tidefr']['const'])
+        for bnd in range(1, nopen + 1):
             boundary = bctides['open_bnds'][bnd]
             name = boundary['name']
             neta = boundary['neta']
@@ -486,110 +580,13 @@ def write_bctides(bctides: Bctides, fname: PathLike, replace: bool = False) -> N
             isatype = boundary['isatype']
             f.write(f'{neta} {iettype} {ifltype} {itetype} {isatype} !Boundary {bnd} [{name}]\n')
 
-            # Elevation boundary conditions
-            if iettype == 0 or iettype == 1 or iettype == 4:
-                # 0 : elevations are not specified for this boundary (in this case the velocity must be specified)
-                # 1 : no input in bctides.in; time history of elevation is read in from elev.th (ASCII)
-                # 4 : no input in this file; time history of elevation is read in from elev2D.th.nc (netcdf)
-                pass
-            elif iettype == 2:
-                # constant elevation value for this segment
-                ethconst = boundary['et'][iettype]
-                f.write(f'{ethconst}\n')
-            elif iettype == 3 or iettype == 5:
-                # 3: tidal forcing
-                # 5: combination of 3 and 4
-                for const in bctides['tidefr']['const']:
-                    f.write(f'{const}\n')
-                    np.savetxt(
-                        fname=f,
-                        X=boundary['et'][iettype][const],
-                        fmt=['%.15f', '%.15f'],
-                        delimiter='\t'
-                    )
-
             # Check if both of ifltype and iettype is set to 0, and raise exception
             if iettype == 0 and ifltype == 0:
                 raise Exception(
                     f'Bad bctides! Both iettype and ifltype set to 0 for Boundary {bnd}, atleast one BC needed.')
 
-            # Velocity boundary conditions
-            if ifltype == 0 or ifltype == 1 or ifltype == 4:
-                # 0: no boundary specified, no input needed. Elev boundary must be specified.
-                # 1: no input in this file; time history of discharge is read in from flux.th (ASCII)
-                # 4: time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
-                pass
-            elif ifltype == 2:
-                # constant discharge (note that a negative number means inflow)
-                vthconst = boundary['fl'][ifltype]
-                f.write(f'{vthconst}\n')
-            elif ifltype == 3 or ifltype == 5:
-                # vel. (not discharge!) is forced in frequency domain
-                # 3: tidal forcing
-                # 5: combination of 3 and 4
-                for const in bctides['tidefr']['const']:
-                    f.write(f'{const}\n')
-                    np.savetxt(
-                        fname=f,
-                        X=boundary['fl'][ifltype][const],
-                        fmt=['%.15f', '%.15f'],
-                        delimiter='\t'
-                    )
-            elif ifltype == -4:
-                # time history of velocity (not discharge!) is read in from uv3D.th.nc (netcdf)
-                # rel1, rel2: relaxation constants for inflow and outflow (between 0 and 1 with 1 being strongest nudging)
-                f.write('{rel1} {rel2}\n').format(**boundary['fl'][ifltype])
-            elif ifltype == -1:
-                # flather type boundary condition, iettype must be 0
-                f.write('eta_mean !mean elevation below\n')
-                np.savetxt(
-                    fname=f,
-                    X=boundary['fl'][ifltype]['eta_mean'],
-                    fmt=['%.2f']
-                )
-                f.write('vn_mean !mean normal velocity\n')
-                np.savetxt(
-                    fname=f,
-                    X=boundary['fl'][ifltype]['vn_mean'],
-                    fmt=['%.3f', '%0.3f']
-                )
-
-            # Temperature boundary condition
-            if itetype == 0:
-                # 0: Temperature not specified
-                pass
-            elif itetype == 1:
-                # time history of temperature on this boundary
-                # here only nudging factor (between 0 and 1 with 1 being strongest nudging) for inflow; 
-                # time history of temperature will be read in from TEM_1.th (ASCII)
-                tobc = boundary['te'][itetype]
-                f.write(f'{tobc}\n')
-            elif itetype == 2:
-                # this boundary is forced by a constant temperature
-                # constant temperature on this segment
-                f.write('{tthconst}\n{tobc}\n'.format(**boundary['te'][itetype]))
-            elif itetype == 3:
-                # initial temperature profile for inflow
-                # nudging factor (between 0 and 1) for inflow
-                tobc = boundary['te'][itetype]
-                f.write(f'{tobc}\n')
-
-            # Salinity boundary condition
-            if itetype == 0:
-                # 0: Salinity not specified
-                pass
-            elif itetype == 1:
-                # time history of salinity on this boundary
-                # here only nudging factor (between 0 and 1 with 1 being strongest nudging) for inflow; 
-                # time history of salinity will be read in from SAL_1.th (ASCII)
-                tobc = boundary['te'][itetype]
-                f.write(f'{tobc}\n')
-            elif itetype == 2:
-                # this boundary is forced by a constant salinity
-                # constant salinity on this segment
-                f.write('{tthconst}\n{tobc}\n'.format(**boundary['te'][itetype]))
-            elif itetype == 3:
-                # initial salinity profile for inflow
-                # nudging factor (between 0 and 1) for inflow
-                tobc = boundary['te'][itetype]
-                f.write(f'{tobc}\n')
+            # Elevation, velocity, temperature and salinity boundary conditions, written by their type code
+            for typekey, key, bc_types in _BOUNDARY_CONDITIONS:
+                bctype = boundary[typekey]
+                _, writer = _boundary_handlers(bc_types, typekey, bctype, bnd)
+                writer(f, boundary[key].get(bctype), consts)
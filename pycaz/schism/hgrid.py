@@ -6,23 +6,61 @@ Implements Hgrid and Gr3 related functionalities.
 """
 
 from copy import deepcopy
+from io import BufferedReader, RawIOBase, StringIO
+from typing import NamedTuple
 from typing_extensions import Self
 import warnings
 import numpy as np
+import pandas as pd
 import os
+import mmap
+from scipy.spatial import cKDTree
 import xarray as xr
+import matplotlib.pyplot as plt
+import matplotlib.tri as mtri
+
+from pycaz.convert import lonlat2xyz
 
 
 # Data classes
+class NodeElemAdjacency(NamedTuple):
+    """
+    Node to element adjacency in compressed sparse row format. The (0-based) elements around
+    node i are indices[offsets[i]:offsets[i + 1]].
+    """
+    offsets: np.ndarray
+    indices: np.ndarray
+
+
 class Gr3(dict):
+    __slots__ = ('_cache',)
+
     def __init__(self, **kwargs):
         """
         A gr3 object extended from dictonaries
         
         Additional key-value pairs can be added using keyworded arguments.
+
+        The node and element quantities are computed on whole arrays. Elementwise transforms should
+        not be wrapped in np.vectorize, which is a python loop, see pycaz.convert.lonlat2xyz().
         """
         super().__init__(self)
         self.update(kwargs)
+        self._cache = {}
+
+    def _from_cache(self, key: str, func):
+        """
+        Return the cached value of a derived quantity, recomputed with func() if nodes or elems are replaced.
+        """
+        _source = (self.get('nodes'), self.get('elems'))
+        if key in self._cache:
+            _cached_source, _value = self._cache[key]
+            if all(_a is _b for _a, _b in zip(_cached_source, _source)):
+                return _value
+
+        _value = func()
+        self._cache[key] = (_source, _value)
+        return _value
 
     # headers
     @property
@@ -55,16 +93,47 @@ class Gr3(dict):
     def y(self):
         return self.nodes[:, 2].astype(float)
 
+    # Views of the node columns without copying, for the computations of the class which do not modify them or
+    # expose them. The public x, y, xy, data are copies.
+    @property
+    def _x(self):
+        return self.nodes[:, 1].astype(float, copy=False)
+
+    @property
+    def _y(self):
+        return self.nodes[:, 2].astype(float, copy=False)
+
+    @property
+    def _xy(self):
+        return self.nodes[:, 1:3].astype(float, copy=False)
+
     @property
     def center(self):
-        _x = (np.min(self.x) + np.max(self.x)) / 2
-        _y = (np.min(self.y) + np.max(self.y)) / 2
+        _x = (np.min(self._x) + np.max(self._x)) / 2
+        _y = (np.min(self._y) + np.max(self._y)) / 2
         return _x, _y
 
     @property
     def xy(self):
         return self.nodes[:, 1:3].astype(float)
 
+    @property
+    def xyz(self) -> np.ndarray:
+        """
+        Node locations on the unit sphere, for grids in lon, lat (degrees), computed with pycaz.convert.lonlat2xyz()
+        """
+        return lonlat2xyz(self._x, self._y)
+
+    @property
+    def xy_f32(self) -> np.ndarray:
+        """
+        Single precision, C-contiguous copy of the node (x, y), cached until the nodes are replaced.
+
+        Only for plotting and candidate searches (e.g. KD-tree), which are insensitive to the lost precision.
+        Geometric computations (elem_area, centroids) and anything written to file use the float64 x, y, xy.
+        """
+        return self._from_cache('xy_f32', lambda: np.ascontiguousarray(self._xy, dtype=np.float32))
+
     @property
     def data(self):
         return self.nodes[:, 3:].astype(float)
@@ -77,18 +146,17 @@ class Gr3(dict):
     def data(self, data):
         try:
             _data = np.atleast_1d(data)
-            assert (np.shape(_data)[0] == self.data.shape[0])
+            assert (np.shape(_data)[0] == self.nodes.shape[0])
         except AssertionError:
-            raise Exception(f'Size mismatch! Both length must be {self.data.shape[0]}')
+            raise Exception(f'Size mismatch! Both length must be {self.nodes.shape[0]}')
         else:
-            self['nodes'] = np.hstack([self.nodes[:, :3], _data])
+            self['nodes'] = np.asfortranarray(np.column_stack([self.nodes[:, :3], _data]))
 
     # Element related functionalities
     @property
     def elemtype(self) -> np.ndarray:
         try:
-            _elemtype = [elem[1] for elem in self['elems']]
-            return _elemtype
+            return self['elemtype']
         except KeyError:
             raise Exception('Element table is not present!')
 
@@ -98,11 +166,160 @@ class Gr3(dict):
 
     @property
     def meshtype(self) -> str:
-        if np.all([i in [3, 4] for i in np.unique(self.elemtype)]):
+        """
+        'i34' if all the elements are triangles or quads, as in the SCHISM hgrid format, which includes the fully
+        triangular grids, 'i3' otherwise.
+        """
+        if np.all(np.isin(self.elemtype, [3, 4])):
             return ('i34')
         else:
             return ('i3')
 
+    @property
+    def centroids(self) -> np.ndarray:
+        """
+        Centroid (x, y) of each element, computed from the element table in one pass for both
+        triangles and quads.
+        """
+        _elems = self['elems']
+        _valid = _elems != self['elem_FillValue']
+        _xy = self._xy[np.where(_valid, _elems - 1, 0)] * _valid[:, :, np.newaxis]
+        return _xy.sum(axis=1) / _valid.sum(axis=1)[:, np.newaxis]
+
+    @property
+    def elem_area(self) -> np.ndarray:
+        """
+        Signed area of each element by the shoelace formula, positive for counter-clockwise elements.
+
+        The last node of the triangles is repeated in place of the fill value, which adds a zero-length
+        edge, so that triangles and quads are computed together as whole-array operations.
+        """
+        return self._from_cache('elem_area', self._compute_elem_area)
+
+    def _compute_elem_area(self) -> np.ndarray:
+        _elems = self['elems']
+        _elems = np.where(_elems == self['elem_FillValue'], _elems[:, [2]], _elems) - 1
+        _x = self._x[_elems]
+        _y = self._y[_elems]
+        return 0.5 * np.sum(_x * np.roll(_y, -1, axis=1) - np.roll(_x, -1, axis=1) * _y, axis=1)
+
+    def node_elem_adjacency(self) -> NodeElemAdjacency:
+        """
+        Node to element adjacency of the grid, built with a single sort of the element table.
+
+        The adjacency is cached, and only rebuilt if the nodes or the element table are replaced.
+        """
+        return self._from_cache('node_elem_adjacency', self._build_node_elem_adjacency)
+
+    def _build_node_elem_adjacency(self) -> NodeElemAdjacency:
+        _elems = self['elems']
+        _valid = _elems != self['elem_FillValue']
+        _nodes = _elems[_valid] - 1
+        _elem_of_node = np.nonzero(_valid)[0]
+
+        offsets = np.zeros(self.nnode + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum(np.bincount(_nodes, minlength=self.nnode))
+        indices = _elem_of_node[np.argsort(_nodes, kind='stable')].astype(np.int32)
+
+        return NodeElemAdjacency(offsets=offsets, indices=indices)
+
+    @property
+    def triangles(self) -> np.ndarray:
+        """
+        0-based triangle table of the grid, with the quads split along their 1-3 diagonal.
+
+        The table is cached, and only rebuilt if the nodes or the element table are replaced.
+        """
+        return self._from_cache('triangles', self._build_triangles)
+
+    def _build_triangles(self) -> np.ndarray:
+        _elems = self['elems'] - 1
+        _quads = _elems[self.elemtype == 4]
+        return np.concatenate([_elems[:, :3], _quads[:, [0, 2, 3]]]).astype(np.int32)
+
+    def _build_triangle_tree(self) -> cKDTree:
+        return cKDTree(self.xy_f32[self.triangles].mean(axis=1))
+
+    def locate(self, points: np.ndarray, k: int = 8) -> np.ndarray:
+        """
+        Find the element containing each of the points.
+
+        The candidates are the k triangles (quads split in two) with the nearest centroids, found from a
+        cached KD-tree, and all candidates are tested at once with their barycentric coordinates.
+
+        points: (n, 2) array of x, y
+        k: number of candidate triangles for each point
+
+        returns: 0-based element index for each point, -1 if not found in the candidates
+        """
+        _points = np.atleast_2d(np.asarray(points, dtype=float))
+        _triangles = self.triangles
+        _k = min(k, len(_triangles))
+
+        _tree = self._from_cache('triangle_tree', self._build_triangle_tree)
+        _, _cand = _tree.query(_points, k=_k)
+        _cand = _cand.reshape(len(_points), _k)
+
+        # barycentric coordinates of the points in each of the candidate triangles
+        _a, _b, _c = np.moveaxis(self._xy[_triangles[_cand]], 2, 0)
+        _v0 = _b - _a
+        _v1 = _c - _a
+        _v2 = _points[:, np.newaxis, :] - _a
+        _det = _v0[..., 0] * _v1[..., 1] - _v1[..., 0] * _v0[..., 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _l1 = (_v2[..., 0] * _v1[..., 1] - _v1[..., 0] * _v2[..., 1]) / _det
+            _l2 = (_v0[..., 0] * _v2[..., 1] - _v2[..., 0] * _v0[..., 1]) / _det
+        _eps = 1e-10
+        _inside = (_l1 >= -_eps) & (_l2 >= -_eps) & (_l1 + _l2 <= 1 + _eps)
+
+        # triangles beyond nelem are the second halves of the quads
+        _elem_of_triangle = np.concatenate([np.arange(self.nelem), np.flatnonzero(self.elemtype == 4)])
+        _found = _inside.any(axis=1)
+        _elem = _elem_of_triangle[_cand[np.arange(len(_points)), _inside.argmax(axis=1)]]
+
+        return np.where(_found, _elem, -1)
+
+    def plot(self, ax=None, values=None, backend='matplotlib', **kwargs):
+        """
+        Plot the grid, or the values at the nodes of the grid.
+
+        The 'matplotlib' backend draws the mesh with triplot() if values is None, or the values with
+        tripcolor(), and returns the axes. It is suitable up to ~1e5 elements. For larger meshes, the
+        'datashader' backend rasterizes the triangles in an aggregated canvas and returns a shaded image.
+        The datashader package is only needed for that backend.
+
+        ax: matplotlib axes to plot on, created if None
+        values: values at the nodes to plot, e.g. self.data[:, 0]
+        backend: 'matplotlib' or 'datashader'
+        kwargs: passed to tripcolor()/triplot() or to datashader.Canvas()
+        """
+        if backend == 'matplotlib':
+            if not isinstance(ax, plt.Axes):
+                _, ax = plt.subplots()
+
+            _tri = mtri.Triangulation(self.x, self.y, self.triangles)
+            if values is None:
+                ax.triplot(_tri, **kwargs)
+            else:
+                ax.tripcolor(_tri, values, **kwargs)
+
+            return (ax)
+        elif backend == 'datashader':
+            try:
+                import datashader as ds
+                import datashader.transfer_functions as tf
+            except ImportError:
+                raise ImportError('datashader is required for the datashader backend')
+
+            _values = np.zeros(self.nnode) if values is None else values
+            _verts = pd.DataFrame({'x': self.xy_f32[:, 0], 'y': self.xy_f32[:, 1], 'z': _values})
+            _tris = pd.DataFrame(self.triangles, columns=['v0', 'v1', 'v2'])
+            _canvas = ds.Canvas(**{'plot_width': 2048, **kwargs})
+
+            return tf.shade(_canvas.trimesh(_verts, _tris, agg=ds.mean('z')))
+        else:
+            raise ValueError(f'Unknown backend {backend}, must be matplotlib or datashader')
+
     def subset_nodes(self, nodeid: np.ndarray):
         # check the nodeid is 1-based index
         try:
@@ -110,10 +327,10 @@ class Gr3(dict):
         except:
             raise AssertionError('Node ids must start from 1')
 
-        return self.xy[nodeid - 1, :]
+        return self._xy[nodeid - 1, :]
 
     def extent(self, buffer: float = 0):
-        extent = np.array([np.min(self.x), np.max(self.x), np.min(self.y), np.max(self.y)])
+        extent = np.array([np.min(self._x), np.max(self._x), np.min(self._y), np.max(self._y)])
 
         if buffer != 0:
             extent = extent + np.array([buffer * -1, buffer, buffer * -1, buffer])
@@ -141,24 +358,20 @@ class Gr3(dict):
 
         if os.path.exists(fname) & ~overwrite:
             raise Exception('File exists! Set overwrite=True to overwrite.')
-        else:
-            with open(fname, 'w') as f:
-                f.write(f"{self['header']}\n")
-                f.write(f"{self['nelem']}\t{self['nnode']} ")
-                f.write("! # of elements and nodes in the horizontal grid\n")
-                np.savetxt(fname=f, X=self.nodes, fmt=nodefmt, delimiter='\t')
+
+        # the whole file is formatted in memory and written at once
+        buf = StringIO()
+        buf.write(f"{self['header']}\n")
+        buf.write(f"{self['nelem']}\t{self['nnode']} ")
+        buf.write("! # of elements and nodes in the horizontal grid\n")
+        np.savetxt(fname=buf, X=self.nodes, fmt=nodefmt, delimiter='\t')
 
         # write element table if exist
         if 'elems' in self:
-            with open(fname, 'a') as f:
-                for i in np.arange(self['nelem']):
-                    inodes = self['elems'][i]
-                    f.write(f'{i + 1:10d}\t')
-                    i34 = self['elemtype'][i]  # 3 or 4 node elements
-                    f.write(f'{i34:2d}\t')
-                    for n in np.arange(i34):
-                        f.write(f'{inodes[n]:9d}\t')
-                    f.write('\n')
+            buf.write(_hgrid_format_elements(self['elemtype'], self['elems']))
+
+        with open(fname, 'w') as f:
+            f.write(buf.getvalue())
 
     def to_xarray(self, varname: str = 'depth') -> xr.Dataset:
         """Returns a xarray dataset of gr3/hgrid
@@ -262,6 +475,8 @@ class Gr3(dict):
 
 
 class OpenBoundary(dict):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """
         A Open boundary object extended from dictonaries
@@ -309,6 +524,8 @@ class OpenBoundary(dict):
 
 
 class LandBoundary(dict):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """
         A Land boundary object extended from dictonaries
@@ -341,6 +558,8 @@ class LandBoundary(dict):
 
 
 class Hgrid(Gr3):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """
         A Hgrid object extended from Gr3 object, with an overrided write functionality.
@@ -360,55 +579,45 @@ class Hgrid(Gr3):
 
         if os.path.exists(fname) & ~overwrite:
             raise Exception('File exists! Set overwrite=True to overwrite.')
-        else:
-            with open(fname, 'w') as f:
-                f.write(f"{self['header']}\n")
-                f.write(f"{self['nelem']}\t{self['nnode']} ")
-                f.write("! # of elements and nodes in the horizontal grid\n")
-                np.savetxt(fname=f, X=self.nodes, fmt=nodefmt)
+
+        # the whole file is formatted in memory and written at once
+        buf = StringIO()
+        buf.write(f"{self['header']}\n")
+        buf.write(f"{self['nelem']}\t{self['nnode']} ")
+        buf.write("! # of elements and nodes in the horizontal grid\n")
+        np.savetxt(fname=buf, X=self.nodes, fmt=nodefmt)
 
         # write element table if exist
         if 'elems' in self:
-            with open(fname, 'a') as f:
-                for i in np.arange(self['nelem']):
-                    inodes = self['elems'][i]
-                    f.write(f'{i + 1:10d}\t')
-                    i34 = self['elemtype'][i]  # 3 or 4 node elements
-                    f.write(f'{i34:2d}\t')
-                    for n in np.arange(i34):
-                        f.write(f'{inodes[n]:9d}\t')
-                    f.write('\n')
+            buf.write(_hgrid_format_elements(self['elemtype'], self['elems']))
 
         # open boundaries
         nbnds = len(self['open_bnds'])
         nbndnodes = np.sum([len(self['open_bnds'][bnd]['nodes']) for bnd in self['open_bnds']]).astype(int)
-        with open(fname, 'a') as f:
-            f.write(f'{nbnds:d} = Number of open boundaries\n')
-            f.write(f'{nbndnodes:d} = Total number of open boundary nodes\n')
+        buf.write(f'{nbnds:d} = Number of open boundaries\n')
+        buf.write(f'{nbndnodes:d} = Total number of open boundary nodes\n')
 
         for bnd in self['open_bnds']:
             bndname = self['open_bnds'][bnd]['name']
             bndnodes = self['open_bnds'][bnd]['nodes']
-
-            with open(fname, 'a') as f:
-                f.write(f'{len(bndnodes):d} = Number of nodes for open boundary {bnd:d} - {bndname}\n')
-                np.savetxt(fname=f, X=bndnodes, fmt='%i')
+            buf.write(f'{len(bndnodes):d} = Number of nodes for open boundary {bnd:d} - {bndname}\n')
+            np.savetxt(fname=buf, X=bndnodes, fmt='%i')
 
         # land boundaries
         nbnds = len(self['land_bnds'])
         nbndnodes = np.sum([len(self['land_bnds'][bnd]['nodes']) for bnd in self['land_bnds']]).astype(int)
-
-        with open(fname, 'a') as f:
-            f.write(f'{nbnds:d} = Number of land boundaries\n')
-            f.write(f'{nbndnodes:d} = Total number of land boundary nodes\n')
+        buf.write(f'{nbnds:d} = Number of land boundaries\n')
+        buf.write(f'{nbndnodes:d} = Total number of land boundary nodes\n')
 
         for bnd in self['land_bnds']:
             bndname = self['land_bnds'][bnd]['name']
             bndnodes = self['land_bnds'][bnd]['nodes']
             bndtype = self['land_bnds'][bnd]['bndtype']
-            with open(fname, 'a') as f:
-                f.write(f'{len(bndnodes):d}\t{bndtype:d} = Number of nodes for land boundary {bnd:d} - {bndname}\n')
-                np.savetxt(fname=f, X=bndnodes, fmt='%i')
+            buf.write(f'{len(bndnodes):d}\t{bndtype:d} = Number of nodes for land boundary {bnd:d} - {bndname}\n')
+            np.savetxt(fname=buf, X=bndnodes, fmt='%i')
+
+        with open(fname, 'w') as f:
+            f.write(buf.getvalue())
 
     @property
     def gr3(self):
@@ -467,96 +676,179 @@ class Hgrid(Gr3):
         print(f'{header}\n{nnode} nodes\n{nelem} elements of {elemtype} type\n{nopen} open, {nland} land boundaries')
 
 
+# Formatting related functions
+def _hgrid_format_elements(elemtype: np.ndarray, elems: np.ndarray) -> str:
+    """
+    Format the element table as text, with a fixed format for each of the 3 and 4 node elements.
+
+    The table is converted to python integers at once, and each line is formatted with a single
+    string formatting operation.
+    """
+    _fmt = {
+        3: '%10d\t%2d\t%9d\t%9d\t%9d\t\n',
+        4: '%10d\t%2d\t%9d\t%9d\t%9d\t%9d\t\n'
+    }
+    _table = np.column_stack([np.arange(1, len(elemtype) + 1), elemtype, elems]).tolist()
+    return ''.join([_fmt[_row[1]] % tuple(_row[:_row[1] + 2]) for _row in _table])
+
+
 # Parsing related functions
 def _hgrid_find_chunks(fname: str):
     """
     Find different chunk of the Gr3/Hgrid file
-    
+
+    The file is memory-mapped and the line boundaries are located in a single vectorized pass over
+    the buffer. The nodes and elements chunks are returned as zero-copy memoryviews of the map to be
+    streamed to the C tokenizer, while the (small) boundary chunk is returned as a list of lines.
+
     returns: dict(header, elem, nodes, [elems, [boundaries]])
 
     """
-    with open(fname) as f:
-        _ds = f.readlines()
-        _length = len(_ds)
-
+    with open(fname, 'rb') as f:
         # first check if there is minimum 2 lines to give us basic information
-        try:
-            assert (_length > 2)
-        except AssertionError:
+        if os.fstat(f.fileno()).st_size == 0:
             raise Exception('Invalid length of file!')
 
-        # Get the grid name at the first line, could be empty
-        _name = ' '.join(_ds[0].split())
+        # the map is not closed here, it is released with the last view of the returned chunks
+        _mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # Get the element and node counts from the second line
-        _nelem, _nnode = _ds[1].split()
-        _nelem = int(_nelem)
-        _nnode = int(_nnode)
+    _view = memoryview(_mm)
+    _bounds = np.concatenate([[0], np.flatnonzero(np.frombuffer(_view, dtype=np.uint8) == ord('\n')) + 1])
+    if _bounds[-1] != len(_mm):
+        _bounds = np.append(_bounds, len(_mm))
+    _length = len(_bounds) - 1
 
-        _return_chunks = {
-            'header': _name,
-            'nelem': _nelem,
-            'nnode': _nnode
-        }
+    def _lines(start, end):
+        return _view[_bounds[start]:_bounds[min(end, _length)]]
 
-        # Try reading the nodes sagment
-        try:
-            _nodes = _ds[2:_nnode + 2]
-        except IndexError:
-            raise IndexError(f'Could not read {_nnode} nodes.')
-        else:
-            _return_chunks['nodes'] = _nodes
+    try:
+        assert (_length > 2)
+    except AssertionError:
+        raise Exception('Invalid length of file!')
 
-        # If we do not hit empty line just after nodes, then try reading the element sagment
-        if _ds[_nnode + 2].strip():
-            try:
-                _elems = _ds[_nnode + 2:_nnode + _nelem + 2]
-            except IndexError:
-                raise IndexError(f'Could not read {_nelem} elements.')
-            else:
-                _return_chunks['elems'] = _elems
+    # Get the grid name at the first line, could be empty
+    _name = ' '.join(bytes(_lines(0, 1)).decode().split())
+
+    # Get the element and node counts from the second line, ignoring any trailing comment
+    _nelem, _nnode = bytes(_lines(1, 2)).split()[:2]
+    _nelem = int(_nelem)
+    _nnode = int(_nnode)
+
+    _return_chunks = {
+        'header': _name,
+        'nelem': _nelem,
+        'nnode': _nnode
+    }
+
+    # Try reading the nodes sagment
+    if _length < _nnode + 2:
+        raise IndexError(f'Could not read {_nnode} nodes.')
+    else:
+        _return_chunks['nodes'] = _lines(2, _nnode + 2)
+
+    # If we do not hit empty line just after nodes, then try reading the element sagment
+    if _length > _nnode + 2 and bytes(_lines(_nnode + 2, _nnode + 3)).strip():
+        if _length < _nnode + _nelem + 2:
+            raise IndexError(f'Could not read {_nelem} elements.')
+        else:
+            _return_chunks['elems'] = _lines(_nnode + 2, _nnode + _nelem + 2)
 
         # If we do not hit empty line just after elements, then try reading the boundary sagment
-        if _ds[_nnode + _nelem + 2].strip():
-            _boundaries = _ds[_nnode + _nelem + 2:_length]
-            _readflag = (True, True, True)
+        if _length > _nnode + _nelem + 2 and bytes(_lines(_nnode + _nelem + 2, _nnode + _nelem + 3)).strip():
+            _boundaries = bytes(_lines(_nnode + _nelem + 2, _length)).decode().splitlines(keepends=True)
             _return_chunks['boundaries'] = _boundaries
 
     return _return_chunks
 
 
-def _hgrid_parse_nodes(chunk: list) -> dict:
+class _HgridBlock(RawIOBase):
+    """
+    Read-only stream over a block of the memory-mapped file, so that the C tokenizer reads the
+    block in its own buffer size directly from the map, without a copy of the whole block.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        _n = min(len(b), len(self._view) - self._pos)
+        b[:_n] = self._view[self._pos:self._pos + _n]
+        self._pos += _n
+        return _n
+
+
+def _hgrid_block_reader(chunk) -> BufferedReader:
+    """
+    Buffered stream of a nodes or elements chunk found from _find_hgrid_chunks()
+    """
+    return BufferedReader(_HgridBlock(memoryview(chunk)))
+
+
+def _hgrid_parse_nodes(chunk: memoryview) -> dict:
     """
     Parse nodes from the chunk found from _find_hgrid_chunks()
 
+    The whole node block is parsed in a single call to the C tokenizer of pandas.read_csv(). The node
+    table is kept in column-major order, so that each column (x, y, data) is a contiguous array.
+
     returns: dict(nodes, data)
     """
     try:
-        _nodes = np.genfromtxt(chunk)
-    except:
+        _nodes = pd.read_csv(
+            _hgrid_block_reader(chunk),
+            sep=r'\s+',
+            header=None,
+            dtype=float,
+            engine='c'
+        ).to_numpy(dtype=float)
+    except ValueError:
         raise Exception('Problem with parsing nodes. Check the output of _find_hgrid_chunks().')
     else:
         return {
-            'nodes': _nodes
+            'nodes': np.asfortranarray(_nodes)
         }
 
 
-def _hgrid_parse_elements(chunk: list) -> dict:
+def _hgrid_parse_elements(chunk: memoryview) -> dict:
     """
     Parse elements from the chunk found from _find_hgrid_chunks()
 
+    The element table can be of 3 or 4 nodes. Most grids are fully triangular, so the block is first
+    tokenized as a fixed 5 column int32 table, which the C tokenizer rejects at the first quad. For
+    hybrid grids (or if the first element is a quad), the variable width table is parsed instead, and
+    the missing 4th node of triangles is set to the fill value.
+
     return: dict(elemtype, data)
     """
-    # Element table can be of 3 or 4 nodes, needs parsing line by line
-    _nelem = len(chunk)
-    _elemtype = np.zeros(_nelem, dtype=int)
     _elem_FillValue = -99999
-    _elems = np.ones((_nelem, 4), dtype=int) * _elem_FillValue
 
-    for i, _line in enumerate(chunk):
-        _columns = [int(i) for i in _line.split()]
-        _elemtype[i] = _columns[1]  # i3 or 4 indicator
-        _elems[i, :_columns[1]] = _columns[2:]
+    _first_elemtype = int(_hgrid_block_reader(chunk).readline().split()[1])
+    if _first_elemtype == 3:
+        try:
+            _elems = _hgrid_parse_triangles(chunk)
+        except pd.errors.ParserError:
+            pass
+        else:
+            return {
+                'elemtype': np.full(len(_elems), 3),
+                'elems': np.column_stack([_elems, np.full(len(_elems), _elem_FillValue, dtype=np.int32)]),
+                'elem_FillValue': _elem_FillValue
+            }
+
+    _table = pd.read_csv(
+        _hgrid_block_reader(chunk),
+        sep=r'\s+',
+        header=None,
+        names=range(6),
+        usecols=range(1, 6),
+        engine='c'
+    )
+    _elemtype = _table[1].to_numpy(dtype=int)
+    _elems = np.ascontiguousarray(_table.loc[:, 2:5].fillna(_elem_FillValue).to_numpy(dtype=np.int32))
 
     return {
         'elemtype': _elemtype,
@@ -565,6 +857,30 @@ def _hgrid_parse_elements(chunk: list) -> dict:
     }
 
 
+def _hgrid_parse_triangles(chunk: memoryview) -> np.ndarray:
+    """
+    Parse a fully triangular element block as a fixed 5 column table directly into int32.
+
+    Raises pandas.errors.ParserError at the first line which is not of 5 columns (i.e. a quad).
+
+    return: (nelem, 3) node table
+    """
+    _table = pd.read_csv(
+        _hgrid_block_reader(chunk),
+        sep=r'\s+',
+        header=None,
+        names=range(5),
+        usecols=range(1, 5),
+        index_col=False,
+        dtype=np.int32,
+        engine='c'
+    )
+    if np.any(_table[1].to_numpy() != 3):
+        raise pd.errors.ParserError('Element block is not fully triangular')
+
+    return _table.loc[:, 2:4].to_numpy(dtype=np.int32)
+
+
 def _hgrid_parse_boundaries(chunk: list) -> dict:
     """
     Parse boundaries from the chunk found from _find_hgrid_chunks()
@@ -579,7 +895,7 @@ def _hgrid_parse_boundaries(chunk: list) -> dict:
     for _n in np.arange(_nopen):
         _nnodes = int(chunk[_lnum].split('=')[0])
         _lnum = _lnum + 1
-        _nodes = np.genfromtxt(chunk[_lnum:_lnum + _nnodes], dtype=int)
+        _nodes = np.loadtxt(chunk[_lnum:_lnum + _nnodes], dtype=int, ndmin=1)
         _open.update({_n + 1: OpenBoundary(name=_n + 1, nodes=_nodes)})
         _lnum = _lnum + _nnodes  # move cursor to next sagment
 
@@ -592,7 +908,7 @@ def _hgrid_parse_boundaries(chunk: list) -> dict:
     for _n in np.arange(_nland):
         _nnodes, _bndtype = [int(i) for i in chunk[_lnum].split('=')[0].split()]
         _lnum = _lnum + 1
-        _nodes = np.genfromtxt(chunk[_lnum:_lnum + _nnodes], dtype=int)
+        _nodes = np.loadtxt(chunk[_lnum:_lnum + _nnodes], dtype=int, ndmin=1)
         _land.update({_n + 1: LandBoundary(name=_n + 1, bndtype=_bndtype, nodes=_nodes)})
         _lnum = _lnum + _nnodes  # move cursor to next sagment
 
@@ -604,29 +920,11 @@ def _hgrid_parse_boundaries(chunk: list) -> dict:
     }
 
 
-# Main exposed functions
-def read_gr3(fname: str) -> Gr3:
+def _hgrid_parse_ascii(fname: str):
     """
-    Reads a gr3 file and return a Gr3 dict object.
-
-    Does not through error if elems are missing.
-    """
-    chunks = _hgrid_find_chunks(fname)
-
-    # Name, elem/node count, and nodes are by design available
-    gr3 = Gr3(header=chunks['header'], nelem=chunks['nelem'], nnode=chunks['nnode'])
-    gr3.update(_hgrid_parse_nodes(chunks['nodes']))
-
-    # Add the element table only if element is available
-    if 'elems' in chunks:
-        gr3.update(_hgrid_parse_elements(chunks['elems']))
+    Parse the ascii hgrid file
 
-    return gr3
-
-
-def read_hgrid(fname: str) -> Hgrid:
-    """
-    Reads a hgrid file
+    returns: Hgrid, dict(open_bnds, land_bnds)
     """
     chunks = _hgrid_find_chunks(fname)
 
@@ -652,6 +950,173 @@ def read_hgrid(fname: str) -> Hgrid:
     else:
         boundaries = _hgrid_parse_boundaries(chunks['boundaries'])
 
+    return hgrid, boundaries
+
+
+# Sidecar related functions
+def _hgrid_sidecar_path(fname: str) -> str:
+    """
+    Path of the binary (netcdf) sidecar of a Gr3/Hgrid file, sitting next to the ascii file.
+    """
+    return f'{fname}.nc'
+
+
+def _hgrid_source_stamp(fname: str) -> tuple:
+    """
+    Modification time (ns) and size of the ascii file, stored in the sidecar to detect a stale sidecar.
+    """
+    _stat = os.stat(fname)
+    return (_stat.st_mtime_ns, _stat.st_size)
+
+
+def _hgrid_sidecar_is_valid(fname: str) -> bool:
+    """
+    Check if the sidecar exists and was written from the current version of the ascii file.
+    """
+    _sidecar_path = _hgrid_sidecar_path(fname)
+    if not os.path.exists(_sidecar_path):
+        return False
+
+    with xr.open_dataset(_sidecar_path) as ds:
+        _stamp = (ds.attrs.get('source_mtime_ns'), ds.attrs.get('source_size'))
+
+    return _stamp == _hgrid_source_stamp(fname)
+
+
+def _hgrid_write_sidecar(gr3: Gr3, fname: str) -> None:
+    """
+    Write the parsed content of a Gr3/Hgrid to a netcdf sidecar.
+
+    All arrays are stored as flat contiguous variables (no groups), and the boundaries
+    are stored as concatenated node lists along with the node count of each boundary.
+    """
+    _mtime_ns, _size = _hgrid_source_stamp(fname)
+
+    _bnd_vars = {}
+    for _bnds, _prefix in [('open_bnds', 'open'), ('land_bnds', 'land')]:
+        if _bnds in gr3:
+            _bnd = gr3[_bnds]
+            _bnd_vars.update({
+                f'{_prefix}_bnd_count': ([f'n{_prefix}_bnd'], np.array([len(_bnd[i]['nodes']) for i in _bnd], dtype='int32')),
+                f'{_prefix}_bnd_nodes': ([f'n{_prefix}_bnd_node'], np.concatenate(
+                    [np.empty(0, dtype='int32')] + [_bnd[i]['nodes'] for i in _bnd]).astype('int32'))
+            })
+    if 'land_bnds' in gr3:
+        _bnd_vars['land_bnd_type'] = (
+            ['nland_bnd'], np.array([gr3['land_bnds'][i]['bndtype'] for i in gr3['land_bnds']], dtype='int32'))
+
+    _elem_vars = {}
+    if 'elems' in gr3:
+        _elem_vars = {
+            'elemtype': (['nSCHISM_hgrid_face'], np.asarray(gr3['elemtype'], dtype='int32')),
+            'elems': (['nSCHISM_hgrid_face', 'nMaxSCHISM_hgrid_face_nodes'], np.asarray(gr3['elems'], dtype='int32'))
+        }
+
+    ds = xr.Dataset(
+        data_vars={
+            'nodes': (['nSCHISM_hgrid_node', 'nNodeColumn'], np.asarray(gr3['nodes'], dtype=float)),
+            **_elem_vars,
+            **_bnd_vars
+        },
+        attrs={
+            'header': gr3['header'],
+            'nelem': gr3['nelem'],
+            'nnode': gr3['nnode'],
+            'elem_FillValue': gr3.get('elem_FillValue', -99999),
+            'source_mtime_ns': _mtime_ns,
+            'source_size': _size
+        }
+    )
+    ds.to_netcdf(_hgrid_sidecar_path(fname))
+
+
+def _hgrid_read_sidecar(fname: str) -> dict:
+    """
+    Read the netcdf sidecar written by _hgrid_write_sidecar()
+
+    return: dict(header, nelem, nnode, nodes, [elemtype, elems, elem_FillValue], [open_bnds, land_bnds])
+    """
+    with xr.open_dataset(_hgrid_sidecar_path(fname)) as ds:
+        _sidecar = {
+            'header': str(ds.attrs['header']),
+            'nelem': int(ds.attrs['nelem']),
+            'nnode': int(ds.attrs['nnode']),
+            'nodes': np.asfortranarray(ds['nodes'].values)
+        }
+
+        if 'elems' in ds:
+            _sidecar.update(
+                elemtype=ds['elemtype'].values.astype(int),
+                elems=ds['elems'].values,
+                elem_FillValue=int(ds.attrs['elem_FillValue'])
+            )
+
+        if 'open_bnd_count' in ds:
+            _nodes = np.split(ds['open_bnd_nodes'].values.astype(int), np.cumsum(ds['open_bnd_count'].values)[:-1])
+            _sidecar['open_bnds'] = {
+                _n + 1: OpenBoundary(name=_n + 1, nodes=_nodes[_n]) for _n in range(ds.sizes['nopen_bnd'])
+            }
+
+        if 'land_bnd_count' in ds:
+            _nodes = np.split(ds['land_bnd_nodes'].values.astype(int), np.cumsum(ds['land_bnd_count'].values)[:-1])
+            _sidecar['land_bnds'] = {
+                _n + 1: LandBoundary(name=_n + 1, bndtype=int(ds['land_bnd_type'].values[_n]), nodes=_nodes[_n])
+                for _n in range(ds.sizes['nland_bnd'])
+            }
+
+    return _sidecar
+
+
+# Main exposed functions
+def read_gr3(fname: str, sidecar: bool = False) -> Gr3:
+    """
+    Reads a gr3 file and return a Gr3 dict object.
+
+    Does not through error if elems are missing.
+
+    If sidecar is True, the parsed grid is read from a netcdf sidecar (fname.nc) when it exists and
+    matches the modification time and size of the ascii file, otherwise the ascii file is parsed and
+    the sidecar is (re)written for the next read.
+    """
+    if sidecar and _hgrid_sidecar_is_valid(fname):
+        return Gr3(**_hgrid_read_sidecar(fname))
+
+    chunks = _hgrid_find_chunks(fname)
+
+    # Name, elem/node count, and nodes are by design available
+    gr3 = Gr3(header=chunks['header'], nelem=chunks['nelem'], nnode=chunks['nnode'])
+    gr3.update(_hgrid_parse_nodes(chunks['nodes']))
+
+    # Add the element table only if element is available
+    if 'elems' in chunks:
+        gr3.update(_hgrid_parse_elements(chunks['elems']))
+
+    if sidecar:
+        _hgrid_write_sidecar(gr3, fname)
+
+    return gr3
+
+
+def read_hgrid(fname: str, sidecar: bool = False) -> Hgrid:
+    """
+    Reads a hgrid file
+
+    If sidecar is True, the parsed grid is read from a netcdf sidecar (fname.nc) when it exists and
+    matches the modification time and size of the ascii file, otherwise the ascii file is parsed and
+    the sidecar is (re)written for the next read.
+    """
+    if sidecar and _hgrid_sidecar_is_valid(fname):
+        _sidecar = _hgrid_read_sidecar(fname)
+        boundaries = {
+            'open_bnds': _sidecar.pop('open_bnds', {}),
+            'land_bnds': _sidecar.pop('land_bnds', {})
+        }
+        hgrid = Hgrid(**_sidecar)
+    else:
+        hgrid, boundaries = _hgrid_parse_ascii(fname)
+        if sidecar:
+            _hgrid_write_sidecar(Hgrid(**hgrid, **boundaries), fname)
+
     # Add nodes x,y location in the boundaries
     for open_bnd in boundaries['open_bnds']:
         boundaries['open_bnds'][open_bnd]['xy'] = hgrid.subset_nodes(boundaries['open_bnds'][open_bnd]['nodes'])
@@ -663,3 +1128,4 @@ def read_hgrid(fname: str) -> Hgrid:
     hgrid.update(boundaries)
 
     return (hgrid)
+
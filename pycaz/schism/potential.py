@@ -5,6 +5,10 @@
 Implements a static list of tidal potential that can be applied to a schism model.
 """
 
+import logging
+
+logger = logging.getLogger(__name__)
+
 
 class TidalPotential:
     """
@@ -41,5 +45,5 @@ class TidalPotential:
                 if wave in self.waves.keys():
                     __values[wave] = self.waves[wave]
                 else:
-                    print('Wave {:s} - Not found!'.format(wave))
+                    logger.warning('Wave %s - Not found!', wave)
             return (__values)
@@ -6,9 +6,34 @@ SCHISM outputs handling related functionalities
 """
 
 import glob
+import io
+import tarfile
+from fnmatch import fnmatch
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from netCDF4 import Dataset
 import numpy as np
 import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_table(lines: list, dtype) -> np.ndarray:
+    '''
+    Parse a block of lines with the same number of values per line in a single C-level tokenizer pass
+
+    lines: list, lines of the block as read by readlines()
+    dtype: data type of the returned table
+    '''
+    ncol = len(lines[0].split()) if lines else 0
+    if np.dtype(dtype).kind == 'f' and ncol:
+        # floats are parsed faster by the structured dtype path of np.loadtxt, with one field per column, the
+        # records being then viewed as rows of the table
+        fields = np.dtype([(f'c{i}', dtype) for i in range(ncol)])
+        return (np.loadtxt(lines, dtype=fields, ndmin=1).view(dtype).reshape(len(lines), ncol))
+
+    return (np.fromstring(''.join(lines), dtype=dtype, sep=' ').reshape(len(lines), ncol))
 
 
 class Global2Local:
@@ -18,26 +43,53 @@ class Global2Local:
         '''
         self.path = os.path.join(path, 'global_to_local.prop')
 
-    def load_global2local(self):
+    def load_global2local(self, cache: bool = False):
         '''
         loads global to local file
+
+        cache: bool, if True, the mapping is kept in a npy file next to the file, which is loaded instead of
+                parsing as long as it is newer than the global to local file
         '''
+        npyfile = self.path + '.npy'
+        if cache and os.path.exists(npyfile) and os.path.getmtime(npyfile) >= os.path.getmtime(self.path):
+            logger.debug('Loading %s from cache %s', self.path, npyfile)
+            self.mapping = np.load(npyfile)
+            return (self.mapping)
+
         self.mapping = np.loadtxt(fname=self.path, dtype='int32')
+
+        if cache:
+            np.save(npyfile, self.mapping)
+
         return (self.mapping)
 
 
+# Tables and header values of a Local2Global, as stored in the packed npz file
+_L2G_TABLES = ('elems', 'nodes', 'sides', 'elemtable', 'nodetable')
+_L2G_VALUES = (
+    'globalside', 'globalelem', 'globalnode', 'nvrt', 'nproc', 'elemcount', 'nodecount', 'sidecount',
+    'year', 'month', 'day', 'hour_model', 'hour', 'minute', 'second', 'utc',
+    'nrec', 'dtout', 'nspool', 'kz', 'h0', 'h_s', 'h_c', 'theta_b', 'theta_f', 'ics')
+
+
 class Local2Global:
-    def __init__(self, path: str, compiler: str = 'intel'):
+    def __init__(self, path: str, compiler: str = 'intel', fileobj=None):
         '''
         path: str, path to a local_to_global file
         compiler: str, flag to identify output from which compiler gnu or intel
+        fileobj: file-like, if given, the file is read from it instead of path (kept as the name of the file),
+                e.g., a member of a tar archive from tarfile.TarFile.extractfile()
         '''
         self.path = path
+        self.fileobj = fileobj
 
-    def read_local2global(self):
+    def read_local2global(self, cache: bool = False):
         '''
         reading the local to global file
 
+        cache: bool, if True, the parsed file is kept in a npz file next to it (see save_npz()), which is loaded
+                instead of parsing as long as it is newer than the local to global file
+
         There is a difference between gcc-fortran and intel fortran. In intel 
         fortran the value is saved till 72 character and in gcc-fortran version 
         the value is saved as requested. As the critical part of the variables 
@@ -47,63 +99,199 @@ class Local2Global:
 
         Currently a compiler flag is used to circumvent this issue.
         '''
-        with open(self.path) as f:
-            ds = f.readlines()
-            init = ds[0].split()
+        npzfile = self.path + '.npz'
+        cache = cache and self.fileobj is None
+        if cache and os.path.exists(npzfile) and os.path.getmtime(npzfile) >= os.path.getmtime(self.path):
+            logger.debug('Loading %s from cache %s', self.path, npzfile)
+            self.read_npz(npzfile)
+            return
+
+        # The file is read sequentially, each block of the header part being taken from the file iterator with
+        # its count, so that only the block being parsed is held as lines
+        with self._open() as f:
+            init = f.readline().split()
             self.globalside = int(init[0])
             self.globalelem = int(init[1])
             self.globalnode = int(init[2])
             self.nvrt = int(init[3])
             self.nproc = int(init[4])
-            self.elemcount = int(ds[2].split()[0])
-            self.elems = np.loadtxt(fname=ds[3:self.elemcount + 3],
-                                    dtype='int32')
-            self.nodecount = int(ds[self.elemcount + 3].split()[0])
-            self.nodes = np.loadtxt(fname=ds[self.elemcount + 4:self.elemcount + self.nodecount + 4], dtype='int32')
-            self.sidecount = int(ds[self.elemcount + self.nodecount + 4])
-            self.sides = np.loadtxt(
-                fname=ds[self.elemcount + self.nodecount + 5:self.elemcount + self.nodecount + self.sidecount + 5],
-                dtype='int32')
-            timestring = ds[self.elemcount + self.nodecount + self.sidecount + 6].split()
+            f.readline()
+            self.elemcount = int(f.readline().split()[0])
+            self.elems = _parse_table(list(islice(f, self.elemcount)), dtype='int32')
+            self.nodecount = int(f.readline().split()[0])
+            self.nodes = _parse_table(list(islice(f, self.nodecount)), dtype='int32')
+            self.sidecount = int(f.readline())
+            self.sides = _parse_table(list(islice(f, self.sidecount)), dtype='int32')
+            f.readline()
+            timestring = f.readline().split()
             self.year = int(timestring[0])
             self.month = int(timestring[1])
             self.day = int(timestring[2])
             self.hour_model = float(timestring[3])
-            self.minute = divmod(self.hour_model * 60, 60)[1]
-            self.hour = int(divmod(self.hour_model * 60, 60)[0])
-            self.second = int(divmod(self.minute * 60, 60)[1])
-            self.minute = int(divmod(self.minute * 60, 60)[0])
-            self.utc = float(ds[self.elemcount + self.nodecount + self.sidecount + 7].split()[0])
-            modelstring = ds[self.elemcount + self.nodecount + self.sidecount + 8].split()
+            hour, minute = divmod(self.hour_model * 60, 60)
+            minute, second = divmod(minute * 60, 60)
+            self.hour = int(hour)
+            self.minute = int(minute)
+            self.second = int(second)
+            self.utc = float(f.readline().split()[0])
+            modelstring = f.readline().split()
             self.nrec = int(modelstring[0])
             self.dtout = float(modelstring[1])
             self.nspool = int(modelstring[2])
             self.nvrt = int(modelstring[3])
             self.kz = int(modelstring[4])
             self.h0 = float(modelstring[5])
-            vrt_s = ds[self.elemcount + self.nodecount + self.sidecount + 8].split()
+            vrt_s = modelstring
             self.h_s = float(vrt_s[0])
             self.h_c = float(vrt_s[1])
             self.theta_b = float(vrt_s[2])
             self.theta_f = float(vrt_s[3])
             self.ics = int(vrt_s[4])
-            # afterwards vertical level definition
-            self.elemtable = np.loadtxt(fname=ds[len(ds) - self.elemcount:len(ds)],
-                                        dtype='int16')
-            self.nodetable = np.loadtxt(fname=ds[len(ds) - self.elemcount - self.nodecount:len(ds) - self.elemcount],
-                                        dtype='float32')
+            # afterwards vertical level definition, then the node and element tables at the end of the file
+            ds = f.readlines()
+            elemstart = len(ds) - self.elemcount
+            nodestart = elemstart - self.nodecount
+            # the element table holds the local node numbers, int16 is enough as long as they fit in it
+            elemtable_dtype = 'int16' if self.nodecount <= np.iinfo(np.int16).max else 'int32'
+            self.elemtable = _parse_table(ds[elemstart:], dtype=elemtable_dtype)
+            self.nodetable = _parse_table(ds[nodestart:elemstart], dtype='float32')
+
+        if cache:
+            self.save_npz(npzfile)
+
+    def global_facenodes(self):
+        '''
+        global element index and global node numbers of the elements, remapped in a single gather
+
+        returns: 0-based global index of the elements, global node numbers of the element nodes as in elemtable,
+                and if the element is triangular
+        '''
+        # -1 is important, 0-based indexing
+        elemtable = self.elemtable[self.elems[:, 0] - 1]
+        facenodes = self.nodes[elemtable[:, 1:] - 1, 1]
+        return (self.elems[:, 1] - 1, facenodes, elemtable[:, 0] == 3)
+
+    def _open(self):
+        '''
+        text stream of the file, from fileobj if given, otherwise from path
+        '''
+        if self.fileobj is None:
+            return (open(self.path))
+        elif isinstance(self.fileobj, io.TextIOBase):
+            return (self.fileobj)
+        else:
+            return (io.StringIO(self.fileobj.read().decode()))
+
+    def save_npz(self, fname: str = None):
+        '''
+        save the parsed local to global file as a packed npz file, to be loaded with read_npz() without parsing
+
+        fname: str, path of the npz file, default path + '.npz'
+        '''
+        if fname is None:
+            fname = self.path + '.npz'
+
+        values = {value: np.asarray(getattr(self, value)) for value in _L2G_VALUES}
+        tables = {table: getattr(self, table) for table in _L2G_TABLES}
+        np.savez(fname, **values, **tables)
+        return (fname)
+
+    def read_npz(self, fname: str = None):
+        '''
+        loading the local to global file from a npz file written by save_npz()
+
+        fname: str, path of the npz file, default path + '.npz'
+        '''
+        if fname is None:
+            fname = self.path + '.npz'
+
+        with np.load(fname) as ds:
+            for value in _L2G_VALUES:
+                setattr(self, value, ds[value].item())
+            for table in _L2G_TABLES:
+                setattr(self, table, ds[table])
+
+
+def _local2global_files(path: str, prefix: str) -> list:
+    '''
+    sorted list of the local_to_global files in path, the packed npz files are excluded
+    '''
+    return (sorted(f for f in glob.glob(os.path.join(path, prefix)) if not f.endswith('.npz')))
+
+
+def _load_local2global(path: str, compiler: str = 'intel', cache: bool = False) -> Local2Global:
+    '''
+    read a local_to_global file, at module level to be run in a process pool
+    '''
+    local2global = Local2Global(path=path, compiler=compiler)
+    local2global.read_local2global(cache=cache)
+    return (local2global)
+
+
+def _load_local2globals(filelist: list, compiler: str = 'intel', cache: bool = False, max_workers: int = 1) -> list:
+    '''
+    read the local_to_global files in filelist, serially or in a process pool of max_workers
+    '''
+    nfile = len(filelist)
+    compilers = [compiler] * nfile
+    caches = [cache] * nfile
+
+    if max_workers == 1:
+        return (list(map(_load_local2global, filelist, compilers, caches)))
+
+    # a few files per task to keep the inter-process overhead low, while sharing them over all the workers
+    chunksize = max(1, nfile // (4 * (max_workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return (list(executor.map(_load_local2global, filelist, compilers, caches, chunksize=chunksize)))
+
+
+def _load_local2global_tar(archive: str, prefix: str = 'local_to_global*', compiler: str = 'intel') -> list:
+    '''
+    read the local_to_global files directly from a (compressed) tar archive, without extracting them to disk
+
+    The archive is streamed once, and the files are sorted by name as done by _local2global_files().
+    '''
+    files = []
+    with tarfile.open(archive, mode='r|*') as tar:
+        for member in tar:
+            if member.isfile() and fnmatch(os.path.basename(member.name), prefix) and not member.name.endswith('.npz'):
+                local2global = Local2Global(path=member.name, compiler=compiler, fileobj=tar.extractfile(member))
+                local2global.read_local2global()
+                local2global.fileobj = None
+                files.append(local2global)
+
+    return (sorted(files, key=lambda local2global: local2global.path))
+
+
+def local2global_to_npz(path: str, prefix: str = 'local_to_global*') -> list:
+    '''
+    one-shot conversion of the local_to_global files in path to packed npz files, written next to each file
+
+    path: str, path to a bunch of local_to_global files
+    prefix: str, file perfix to list and process, default local_to_global*
+    '''
+    fnames = []
+    for f in _local2global_files(path, prefix):
+        local2global = Local2Global(path=f)
+        local2global.read_local2global()
+        fnames.append(local2global.save_npz())
+
+    return (fnames)
 
 
 class Local2Globals:
-    def __init__(self, path: str, prefix: str = 'local_to_global*', compiler: str = 'intel'):
+    def __init__(self, path: str, prefix: str = 'local_to_global*', compiler: str = 'intel', cache: bool = False,
+                 max_workers: int = 1):
         '''
-        path: str, path to a bunch of local_to_global files
+        path: str, path to a bunch of local_to_global files, or to a tar archive containing them
         compiler: str, type of compiler used in model, gnu or intel
                     this is to solve the issue to 72 char line and contineous
                     line in reading local_to_global files
+        cache: bool, keep the parsed files as npz next to them for the next loads, see Local2Global.read_local2global()
+        max_workers: int, number of processes to read the files, see load_files()
         '''
         self.path = path
-        self.load_files(prefix=prefix, compiler=compiler)
+        self.load_files(prefix=prefix, compiler=compiler, cache=cache, max_workers=max_workers)
         self.merge_nodes()
         self.merge_elements()
         self.merge_edges()
@@ -196,37 +384,37 @@ class Local2Globals:
     def kz(self):
         return (self.files[0].kz)
 
-    def load_files(self, prefix: str = 'local_to_global*', compiler: str = 'intel'):
+    def load_files(self, prefix: str = 'local_to_global*', compiler: str = 'intel', cache: bool = False,
+                   max_workers: int = 1):
         '''
         prefix: str, file perfix to list and process, default local_to_global*
         compiler: str, output from gnu or intel compilers
-        '''
-        self.filelist = glob.glob(os.path.join(self.path, prefix))
-        self.filelist = sorted(self.filelist)
-
-        self.files = []
-
-        for f in self.filelist:
-            local2global = Local2Global(path=f, compiler=compiler)
-            local2global.read_local2global()
-            self.files.append(local2global)
+        cache: bool, load from and keep the npz cache of each file
+        max_workers: int, number of processes to read the files, which are independent, default 1 (serial)
+                    None uses the default of ProcessPoolExecutor, i.e., the number of processors
+        '''
+        if os.path.isfile(self.path) and tarfile.is_tarfile(self.path):
+            # outputs kept as a tar archive, the files are read from it without extraction
+            self.files = _load_local2global_tar(self.path, prefix=prefix, compiler=compiler)
+            self.filelist = [local2global.path for local2global in self.files]
+        else:
+            self.filelist = _local2global_files(self.path, prefix)
+            self.files = _load_local2globals(self.filelist, compiler=compiler, cache=cache, max_workers=max_workers)
 
         if (len(self.files)) != self.files[0].nproc:
-            print('Mismatch! expected != obtained local_to_global files!')
-            raise (Exception)
+            raise Exception('Mismatch! expected != obtained local_to_global files!')
 
     def merge_nodes(self):
         '''
         method - merge the nodes in all local to global files to global nodes
         '''
-        self.globalnodex = np.empty(shape=(self.nglobalnode))
-        self.globalnodey = np.empty(shape=(self.nglobalnode))
-        self.globaldepth = np.empty(shape=(self.nglobalnode))
+        # x, y and depth are scattered together, one indexed assignment per file, as rows of a single array
+        globalnodes = np.empty(shape=(3, self.nglobalnode))
 
         for f in self.files:
-            self.globalnodex[f.nodes[:, 1] - 1] = f.nodetable[:, 0]
-            self.globalnodey[f.nodes[:, 1] - 1] = f.nodetable[:, 1]
-            self.globaldepth[f.nodes[:, 1] - 1] = f.nodetable[:, 2]
+            globalnodes[:, f.nodes[:, 1] - 1] = f.nodetable[:, 0:3].T
+
+        self.globalnodex, self.globalnodey, self.globaldepth = globalnodes
 
     def merge_elements(self):
         '''
@@ -237,14 +425,12 @@ class Local2Globals:
         self.globalfacenodey = np.empty(shape=(self.nglobalelem))
 
         for f in self.files:
-            for ilocal, iglobal in zip(f.elems[:, 0] - 1, f.elems[:, 1] - 1):
-                # -1 is important, 0-based indexing
-                if f.elemtable[ilocal, 0] == 3:
-                    # triangular element
-                    self.globalfacenodes[iglobal, 0:3] = f.nodes[f.elemtable[ilocal, 1:] - 1, 1]
-                else:
-                    # rectangular element
-                    self.globalfacenodes[iglobal, 0:4] = f.nodes[f.elemtable[ilocal, 1:] - 1, 1]
+            iglobal, facenodes, istri = f.global_facenodes()
+            # triangular elements
+            self.globalfacenodes[iglobal[istri], 0:3] = facenodes[istri, 0:3]
+            # rectangular elements
+            if not np.all(istri):
+                self.globalfacenodes[iglobal[~istri], 0:4] = facenodes[~istri, 0:4]
 
     def merge_edges(self):
         '''
@@ -253,6 +439,38 @@ class Local2Globals:
         pass
 
 
+def _read_variable(fname: str, varname: str):
+    '''
+    values of varname in the netcdf file fname, at module level to be run in a process pool
+    '''
+    with Dataset(fname) as nc:
+        return (nc.variables[varname][:])
+
+
+def _read_variables(fnames: list, varname: str, prefetch: bool = False):
+    '''
+    values of varname in each of fnames, yielded in order
+
+    prefetch: bool, if True, the next file is read in a separate process while the values of the current one are
+                used, only one file being read ahead
+    '''
+    if not prefetch:
+        for fname in fnames:
+            yield (_read_variable(fname, varname))
+        return
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        current = None
+        for fname in fnames:
+            following = executor.submit(_read_variable, fname, varname)
+            if current is not None:
+                yield (current.result())
+            current = following
+
+        if current is not None:
+            yield (current.result())
+
+
 class Schout:
     def __init__(
             self,
@@ -523,13 +741,15 @@ class Schout:
         self.nc.sync()
 
     def combine(self, varname: str, rename: str = None, datatype=np.float32, long_name: str = None, units: str = None,
-                chunksizes=None, **kwargs):
+                chunksizes=None, prefetch: bool = False, **kwargs):
         '''
         varname: str, name of the variable to be merged
         rename: str, renamed variable
         long_name: str, long_name of the variable
         units: str, custom units, if None then will try to get original units
         chunksizes: dict, dimname:size, if None then no chunking, size='full'
+        prefetch: bool, if True, the next segmented file is read in a separate process while the current one is
+                written, overlapping the reading (and decompression) with the writing
         '''
         # determine variable name
         in_varname = varname
@@ -547,7 +767,7 @@ class Schout:
         # check if variable exists and get its attributes
         tempfile = Dataset(self.filelist[0])
         if in_varname in tempfile.variables.keys():
-            print(f"{in_varname} : processing as - {out_varname}")
+            logger.info('%s : processing as - %s', in_varname, out_varname)
 
             dims = {}
             for v in tempfile.variables[in_varname].get_dims():
@@ -563,7 +783,7 @@ class Schout:
                         else:
                             dims[dim] = chunksizes[dim]
                     else:
-                        print(f"{dim} not in chunksizes, defaulting to 1")
+                        logger.info('%s not in chunksizes, defaulting to 1', dim)
 
             attrs = {}
             for attr in tempfile.variables[in_varname].ncattrs():
@@ -591,10 +811,9 @@ class Schout:
                 self.nc.variables[out_varname].setncattr(kwarg, kwargs[kwarg])
 
             # Pulling and saving variables from sagmented netCDF files
-            for proc in self.procs:
-                infile = Dataset(self.filelist[proc])
-                invalue = infile.variables[in_varname][:]
-
+            fnames = [self.filelist[proc] for proc in self.procs]
+            invalues = _read_variables(fnames, in_varname, prefetch=prefetch)
+            for proc, invalue in zip(self.procs, invalues):
                 # TODO merge by functionality
                 if 'nSCHISM_hgrid_node' in out_dims:
                     outindex = self.info.files[proc].nodes - 1
@@ -606,11 +825,10 @@ class Schout:
                 else:
                     raise (NotImplementedError)
 
-                print(os.path.basename(self.filelist[proc]))
-                infile.close()
+                logger.info('%s', os.path.basename(self.filelist[proc]))
                 self.nc.sync()
         else:
-            print(f"variable {in_varname} does not exist!")
+            logger.warning('variable %s does not exist!', in_varname)
 
     def close_file(self):
         # Closing the output file
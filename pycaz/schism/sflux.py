@@ -6,6 +6,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from netCDF4 import Dataset
 import os
+from pathlib import Path
 
 
 def default_filename_formatter(sflux) -> str:
@@ -88,8 +89,7 @@ class Sflux:
             raise Exception(f"sflux_type {self.sflux_type} not correct, one of 'air', 'prc', and 'rad'")
 
         # Directory creation
-        if not os.path.exists(self.path):
-            os.mkdir(self.path)
+        Path(self.path).mkdir(parents=True, exist_ok=True)
 
     def create_netcdf_air(self):
         self.step = 0
@@ -2,10 +2,14 @@
 # -*- coding: utf-8 -*-
 
 
+from concurrent.futures import ThreadPoolExecutor
 from scipy.spatial import KDTree
 import xarray as xr
 import numpy as np
 
+from pycaz.schism.hgrid import read_hgrid, read_gr3
+from pycaz.schism.bctides import read_bctides
+
 
 def find_nearest_nodes(ds: xr.Dataset, xy: np.ndarray, deeper_than: float = None) -> np.ndarray:
     """
@@ -41,3 +45,30 @@ def find_nearest_nodes(ds: xr.Dataset, xy: np.ndarray, deeper_than: float = None
     bnd_idx = _idx[_nn_idx]
 
     return bnd_idx
+
+
+def read_inputs(hgrid: str = None, bctides: str = None, gr3: dict = None, max_workers: int = None) -> dict:
+    """
+    Read the input files of a SCHISM setup concurrently
+
+    The files are independent, and most of the parsing time is spent in the C tokenizer and file I/O,
+    which release the GIL. So they are read in a thread pool, and the total time is close to the
+    time of the largest file instead of the sum.
+
+    :param hgrid: Path to hgrid.gr3, read with read_hgrid()
+    :param bctides: Path to bctides.in, read with read_bctides()
+    :param gr3: Other gr3 files as {name: path}, e.g. {'rough': 'rough.gr3'}, read with read_gr3()
+    :param max_workers: Number of threads, default of ThreadPoolExecutor if None
+    :return: dict with the keys hgrid, bctides and the names in gr3, for the files that are given
+    """
+    _readers = {}
+    if hgrid is not None:
+        _readers['hgrid'] = (read_hgrid, hgrid)
+    if bctides is not None:
+        _readers['bctides'] = (read_bctides, bctides)
+    if gr3 is not None:
+        _readers.update({_name: (read_gr3, _fname) for _name, _fname in gr3.items()})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        _futures = {_name: executor.submit(_reader, _fname) for _name, (_reader, _fname) in _readers.items()}
+        return {_name: _future.result() for _name, _future in _futures.items()}
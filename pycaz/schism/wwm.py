@@ -6,6 +6,7 @@ from pathlib import Path
 import copy
 
 from pycaz.wave.spectra import compute_bulk_params, correct_shoaling
+from pycaz.schism.hgrid import Hgrid, Gr3
 
 
 def read_sp1d(fn: str | Path) -> dict:
@@ -140,3 +141,47 @@ def correct_shoaling_sp1d(sp1d: dict, target_depth: float) -> dict:
         sp1d_corrected['data'][timestamp]['v'] = np.nan
 
     return sp1d_corrected
+
+
+def _wwmbnd_nodes(bnds: list) -> np.ndarray:
+    """
+    0-based node indices of the given boundaries.
+    """
+    return np.concatenate([np.empty(0, dtype=int)] + [bnd['nodes'] for bnd in bnds]) - 1
+
+
+def create_wwmbnd(hgrid: Hgrid, dirichlet: list = None, neumann: list = None, land_flag: int = 0) -> Gr3:
+    """
+    Create the WWM boundary flag (wwmbnd.gr3) from the boundaries of a hgrid.
+
+    The flags are 0 for interior nodes, 2 for the open boundaries with wave forcing (Dirichlet), and 3 for the
+    open boundaries with zero-gradient (Neumann) condition. Land boundary nodes are set to land_flag. At the nodes
+    shared by several boundaries, Dirichlet takes precedence over Neumann, and both over land.
+
+    :param hgrid: Hgrid object read with pycaz.schism.hgrid.read_hgrid()
+    :param dirichlet: List of open boundary keys with Dirichlet condition, default all except the neumann ones.
+    :param neumann: List of open boundary keys with Neumann condition, default None.
+    :param land_flag: Flag to set at the land boundary nodes, default 0.
+    :return: Gr3 object with the flag as data, to be written with Gr3.write()
+    """
+    if neumann is None:
+        neumann = []
+
+    if dirichlet is None:
+        dirichlet = [bnd for bnd in hgrid.open_bnds if bnd not in neumann]
+
+    # The flags are scattered in increasing order of precedence, the last one written is kept at the shared nodes
+    flags = np.zeros(hgrid.nnode, dtype=np.int8)
+    flags[_wwmbnd_nodes([hgrid.land_bnds[bnd] for bnd in hgrid.land_bnds])] = land_flag
+    flags[_wwmbnd_nodes([hgrid.open_bnds[bnd] for bnd in neumann])] = 3
+    flags[_wwmbnd_nodes([hgrid.open_bnds[bnd] for bnd in dirichlet])] = 2
+
+    return Gr3(
+        header='wwmbnd',
+        nnode=hgrid.nnode,
+        nelem=hgrid.nelem,
+        nodes=np.column_stack([hgrid.nodes[:, :3], flags]),
+        elemtype=hgrid['elemtype'],
+        elems=hgrid.elems,
+        elem_FillValue=hgrid['elem_FillValue']
+    )
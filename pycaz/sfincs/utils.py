@@ -27,11 +27,14 @@ def get_bnd_points(model: SfincsModel, bnd_type: Literal['wl'] = 'wl', to_crs=No
 
     bnds = utils.get_bounds_vector(model.grid.msk)
 
-    xy = np.empty((0, 2))
+    # The points of each geometry are collected in a list and stacked once
+    xy = [np.empty((0, 2))]
 
     for geometry in bnds[bnds.value == 2].geometry:
         x, y = geometry.xy
-        xy = np.append(xy, np.vstack([x, y]).T, axis=0)
+        xy.append(np.column_stack([x, y]))
+
+    xy = np.concatenate(xy, axis=0)
 
     if to_crs is not None:
         transformer = Transformer.from_crs(crs_from=utm_code, crs_to=to_crs, always_xy=True)
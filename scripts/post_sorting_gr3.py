@@ -19,6 +19,8 @@ import glob
 import sys
 
 class Node(object):
+    __slots__ = ('id', 'x', 'y', 'z')
+
     def __init__(self, id, x, y, z):
         self.id = id
         self.x = x
@@ -32,6 +34,8 @@ class Node(object):
             return(self.z < other)
 
 class Element(object):
+    __slots__ = ('id', 'nnode', 'connectivity')
+
     def __init__(self, id, nnode, connectivity=[]):
         self.id = id
         self.nnode = nnode
@@ -93,20 +97,11 @@ class Gr3(object):
                 [f.write('\t{:d}'.format(i)) for i in __elem.connectivity]
                 f.write('\n')
 
-# Derived class made with Node and an Experiment name
-class Pixel(object):
-    def __init__(self, node, exp):
-        self.id = node.id
-        self.x = node.x
-        self.y = node.y
-        self.z = node.z
-        self.exp = exp
-
-    def __lt__(self, other):
-        if isinstance(other, Pixel):
-            return(self.z < other.z)
-        else:
-            return(self.z < other)
+# Sorting the stacked values of each node along the experiments in a single
+# argsort, the experiment number following the same permutation
+def stacksort(elev, exp):
+    __index = np.argsort(elev, axis=0, kind='stable')
+    return(np.take_along_axis(elev, __index, axis=0), np.take_along_axis(exp, __index, axis=0))
 
 # Functions to sort the fullset or a subset
 def gr3sort(fnames, consider='all'):
@@ -128,8 +123,8 @@ def gr3sort(fnames, consider='all'):
         exp = int(os.path.basename(fnames[0]).split('.gr3')[0].split('_')[1])
         gr3 = Gr3()
         gr3.read(fnames[0])
-        gr3stack = np.array([Pixel(i, exp) for i in gr3.nodes])
-        gr3stack = np.reshape(gr3stack, newshape=(1, len(gr3stack)))
+        elevstack = np.array([[node.z for node in gr3.nodes]])
+        expstack = np.full(elevstack.shape, exp)
     except:
         print('Problem with loading the first file! Exiting...')
         sys.exit(1)
@@ -141,12 +136,13 @@ def gr3sort(fnames, consider='all'):
                 exp = int(os.path.basename(fnames[i]).split('.gr3')[0].split('_')[1])
                 gr3 = Gr3()
                 gr3.read(fnames[i])
-                gr3nodes = np.array([Pixel(i, exp) for i in gr3.nodes])
-                gr3stack = np.append(gr3stack, [gr3nodes], axis=0)
+                gr3elev = np.array([node.z for node in gr3.nodes])
+                elevstack = np.append(elevstack, [gr3elev], axis=0)
+                expstack = np.append(expstack, [np.full(gr3elev.shape, exp)], axis=0)
 
             # Sorting
-            stackshape = gr3stack.shape
-            gr3stack = np.sort(gr3stack, axis=0)
+            stackshape = elevstack.shape
+            elevstack, expstack = stacksort(elevstack, expstack)
         elif consider > 1:
             # Loding upto first sagment of the files
             for i in np.arange(len(fnames))[1:consider]:
@@ -154,12 +150,13 @@ def gr3sort(fnames, consider='all'):
                 exp = int(os.path.basename(fnames[i]).split('.gr3')[0].split('_')[1])
                 gr3 = Gr3()
                 gr3.read(fnames[i])
-                gr3nodes = np.array([Pixel(i, exp) for i in gr3.nodes])
-                gr3stack = np.append(gr3stack, [gr3nodes], axis=0)
+                gr3elev = np.array([node.z for node in gr3.nodes])
+                elevstack = np.append(elevstack, [gr3elev], axis=0)
+                expstack = np.append(expstack, [np.full(gr3elev.shape, exp)], axis=0)
 
             # Initial sorting and setting the output shape of the stack
-            stackshape = gr3stack.shape
-            gr3stack = np.sort(gr3stack, axis=0)
+            stackshape = elevstack.shape
+            elevstack, expstack = stacksort(elevstack, expstack)
 
             # Continue sorting the rest of the files
             for i in np.arange(len(fnames))[consider:len(fnames)]:
@@ -167,16 +164,16 @@ def gr3sort(fnames, consider='all'):
                 exp = int(os.path.basename(fnames[i]).split('.gr3')[0].split('_')[1])
                 gr3 = Gr3()
                 gr3.read(fnames[i])
-                gr3nodes = np.array([Pixel(i, exp) for i in gr3.nodes])
-                gr3stack = np.append(gr3stack, [gr3nodes], axis=0)
-                gr3stack = np.sort(gr3stack, axis=0)
-                gr3stack = gr3stack[1:consider+1, :]
+                gr3elev = np.array([node.z for node in gr3.nodes])
+                elevstack = np.append(elevstack, [gr3elev], axis=0)
+                expstack = np.append(expstack, [np.full(gr3elev.shape, exp)], axis=0)
+                elevstack, expstack = stacksort(elevstack, expstack)
+                elevstack = elevstack[1:consider+1, :]
+                expstack = expstack[1:consider+1, :]
     finally:
         # Saving the results
-        sortelev = np.reshape([pixel.z for pixel in gr3stack.flatten()], stackshape)
-        sortelev = np.flipud(sortelev)
-        sortexp = np.reshape([pixel.exp for pixel in gr3stack.flatten()], stackshape)
-        sortexp = np.flipud(sortexp)
+        sortelev = np.flipud(np.reshape(elevstack, stackshape))
+        sortexp = np.flipud(np.reshape(expstack, stackshape))
 
         return(sortelev, sortexp)
 
@@ -74,6 +74,8 @@ class Gr3(object):
 
 # Class to hold pixel values and help sorting
 class Pixel(object):
+    __slots__ = ('id', 'x', 'y', 'z', 'exp')
+
     def __init__(self, id, x, y, z, exp):
         self.id = id
         self.x = x
@@ -47,38 +47,41 @@ import glob
 import sys
 import re
 
-class Node(object):
-    def __init__(self, id, x, y, z):
-        self.id = int(id)
-        self.x = x
-        self.y = y
-        self.z = z
+class NodeArray(np.recarray):
+    """ Nodes of a mesh as a single structured array.
 
-    def __lt__(self, other):
-        if isinstance(other, Node):
-            return(self.id < other.id)
-        else:
-            return(self.id < other)
+    The fields are accessed as attributes of the array, e.g., nodes.x, or of each
+    node, e.g., nodes[0].x. Sorting by id is done with nodes[nodes.sorted_indices()].
+    """
+    DTYPE = np.dtype((np.record, [('id', 'i4'), ('x', 'f8'), ('y', 'f8'), ('z', 'f8')]))
 
-class Element(object):
-    def __init__(self, id, nnode, connectivity=[]):
-        self.id = id
-        self.nnode = nnode
-        self.connectivity = connectivity
+    def __new__(cls, nnode=0):
+        return(np.zeros(nnode, dtype=cls.DTYPE).view(cls))
 
-    def __lt__(self, other):
-        if isinstance(other, Element):
-            return(self.id < other.id)
-        else:
-            return(self.id < other)
+    def sorted_indices(self):
+        return(np.argsort(self.id, kind='stable'))
+
+class ElementArray(np.recarray):
+    """ Elements of a mesh as a single structured array.
+
+    The connectivity of triangles is stored in the first 3 columns of conn, the
+    4th one being set to 0. Sorting by id is done with elems[elems.sorted_indices()].
+    """
+    DTYPE = np.dtype((np.record, [('id', 'i4'), ('nnode', 'i1'), ('conn', '4i4')]))
+
+    def __new__(cls, nelem=0):
+        return(np.zeros(nelem, dtype=cls.DTYPE).view(cls))
+
+    def sorted_indices(self):
+        return(np.argsort(self.id, kind='stable'))
 
 class Mesh(object):
-    def __init__(self, grname=None, nelem=0, nnode=0, nodes=[], elems=[]):
+    def __init__(self, grname=None, nelem=0, nnode=0, nodes=None, elems=None):
         self.grname = grname
         self.nelem = nelem
         self.nnode = nnode
-        self.nodes = nodes
-        self.elems = elems
+        self.nodes = NodeArray() if nodes is None else nodes
+        self.elems = ElementArray() if elems is None else elems
 
     def read(self, fname, path='./', readnodes=True, readelements=True):
         __file = os.path.join(path, fname)
@@ -98,31 +101,38 @@ class Mesh(object):
 
             if readnodes:
                 # Reading the nodes
-                __nodes = np.genfromtxt(fname=ds[__line:__line+self.nnode])
+                __nodes = np.genfromtxt(fname=ds[__line:__line+self.nnode]).reshape(self.nnode, -1)
                 __line = __line + self.nnode
-                self.nodes = np.array([Node(i[0], i[1], i[2], i[3]) for i in __nodes])
+                self.nodes = NodeArray(self.nnode)
+                self.nodes.id = __nodes[:, 0]
+                self.nodes.x = __nodes[:, 1]
+                self.nodes.y = __nodes[:, 2]
+                self.nodes.z = __nodes[:, 3]
 
             if readelements:
                 # Reading the elements
-                __elems = np.genfromtxt(fname=ds[__line:__line+self.nelem], dtype=int)
+                __elems = np.genfromtxt(fname=ds[__line:__line+self.nelem], dtype=int).reshape(self.nelem, -1)
                 __line = __line + self.nelem
-                self.elems = np.array([Element(i[0], i[1], i[2:len(i)]) for i in __elems])
+                self.elems = ElementArray(self.nelem)
+                self.elems.id = __elems[:, 0]
+                self.elems.nnode = __elems[:, 1]
+                self.elems.conn[:, 0:__elems.shape[1]-2] = __elems[:, 2:]
 
     def write(self, fname, path='./'):
         with open(os.path.join(path, fname), 'w') as f:
             f.write('{:s}\n'.format(self.grname))
             f.write('{:d}\t{:d}\n'.format(self.nelem, self.nnode))
             
-            for __node in self.nodes:
-                f.write('{:d}\t{:.10f}\t{:.10f}\t{:.10f}\n'\
-                        .format(int(__node.id), __node.x, __node.y, __node.z))
+            __nodes = zip(self.nodes.id.tolist(), self.nodes.x.tolist(), self.nodes.y.tolist(), self.nodes.z.tolist())
+            f.write(''.join(['{:d}\t{:.10f}\t{:.10f}\t{:.10f}\n'.format(*__node) for __node in __nodes]))
 
-            for __elem in self.elems:
-                f.write('{:d}\t{:d}'.format(__elem.id, __elem.nnode))
-                [f.write('\t{:d}'.format(i)) for i in __elem.connectivity]
-                f.write('\n')
+            __elems = zip(self.elems.id.tolist(), self.elems.nnode.tolist(), self.elems.conn.tolist())
+            f.write(''.join(['{:d}\t{:d}\t'.format(__id, __nnode) + '\t'.join(map(str, __conn[0:__nnode])) + '\n'
+                             for __id, __nnode, __conn in __elems]))
 
 class Boundary(object):
+    __slots__ = ('number', 'nodes', 'landflag', 'name')
+
     def __init__(self, nnodes, nodes, landflag=None, bndname='', condition=None):
         """ SCHISM complient bounary
         
@@ -147,6 +157,8 @@ class Boundary(object):
         return(len(self.nodes))
 
 class Boundaries(object):
+    __slots__ = ('open', 'nopen', 'land', 'nland', 'nopennodes', 'nlandnodes')
+
     def __init__(self, openbnd=[], landbnd=[]):
         self.open = openbnd
         self.nopen = len(self.open)
@@ -227,10 +239,10 @@ class Hgrid(object):
     def coverage(self, padding=1):
         __padding = padding
         if self.mesh is not None:
-            __xmin = int(np.floor(np.min(np.array([node.x for node in self.mesh.nodes]))) - __padding)
-            __xmax = int(np.ceil(np.max(np.array([node.x for node in self.mesh.nodes]))) + __padding)
-            __ymin = int(np.floor(np.min(np.array([node.y for node in self.mesh.nodes]))) - __padding)
-            __ymax = int(np.ceil(np.max(np.array([node.y for node in self.mesh.nodes]))) + __padding)
+            __xmin = int(np.floor(np.min(self.mesh.nodes.x)) - __padding)
+            __xmax = int(np.ceil(np.max(self.mesh.nodes.x)) + __padding)
+            __ymin = int(np.floor(np.min(self.mesh.nodes.y)) - __padding)
+            __ymax = int(np.ceil(np.max(self.mesh.nodes.y)) + __padding)
 
         return(__xmin, __xmax, __ymin, __ymax)
 
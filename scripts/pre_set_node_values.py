@@ -14,6 +14,8 @@ import os
 
 
 class Node(object):
+    __slots__ = ('id', 'x', 'y', 'z')
+
     def __init__(self, id, x, y, z):
         self.id = id
         self.x = x
@@ -27,6 +29,8 @@ class Node(object):
             return(self.id < other)
 
 class Element(object):
+    __slots__ = ('id', 'nnode', 'connectivity')
+
     def __init__(self, id, nnode, connectivity=[]):
         self.id = id
         self.nnode = nnode
@@ -21,6 +21,7 @@ class Boundary(object):
                         For open boundary, no information needed.
         bndname(str) :  Name of the boundary
     """
+    __slots__ = ('number', 'nodes', 'landflag', 'name')
 
     def __init__(self, bndno, bndnodes, landflag=None, bndname=''):
         """ SCHISM complient bounary
@@ -43,7 +44,7 @@ class Boundary(object):
         Returns:
             int : Number of nodes of the boundary
         """
-        return(len(self.nodes))
+        return(np.size(self.nodes))
 
 class Boundaries(object):
     """Collection of Boundary Objects 
@@ -56,17 +57,36 @@ class Boundaries(object):
         Instance of an empty Boundaries object.
     
     Methods:
+        reserve(int n) : preallocate the storage for n boundaries
         addboundary(Boundary boundary) : add a Boundary object to the touple
         nopen() : returns the number of open boundary added to the object
         
     TODO:
         * Add checktotalnodes method
     """
+    __slots__ = ('bndtype', 'totalnodes', '_boundaries', '_count', '_offsets', '_flat')
 
     def __init__(self, bndtype="open", totalnodes=None):
         self.bndtype = bndtype
         self.totalnodes = totalnodes
-        self.boundaries = []
+        self._boundaries = []
+        self._count = 0
+        self._offsets = None
+        self._flat = None
+
+    def reserve(self, n):
+        """Preallocate the storage for n boundaries
+        
+        The nodes of the added boundaries are also copied in order in a flat
+        buffer of totalnodes, returned by flat_nodes() without concatenation.
+        
+        Args:
+            n(int) : number of boundaries to be added
+        """
+        self._boundaries = [None] * n
+        self._count = 0
+        self._offsets = np.zeros(n + 1, dtype=np.int64)
+        self._flat = np.empty(self.totalnodes if self.totalnodes is not None else 0, dtype=np.int32)
 
     def addboundary(self, boundary):
         """Add a new Boundary object
@@ -74,15 +94,66 @@ class Boundaries(object):
         Args:
             boundary(Boundary) : object of Boundary class to be added
         """
-        self.boundaries.append(boundary)
+        if self._count < len(self._boundaries):
+            self._boundaries[self._count] = boundary
+        else:
+            self._boundaries.append(boundary)
+            self._offsets = None
+
+        if self._offsets is not None:
+            __start = self._offsets[self._count]
+            __end = __start + boundary.countnodes()
+            if __end <= len(self._flat):
+                np.copyto(self._flat[__start:__end], np.ravel(boundary.nodes), casting='unsafe')
+                self._offsets[self._count + 1] = __end
+            else:
+                # more nodes than totalnodes, falling back to concatenation
+                self._offsets = None
+
+        self._count = self._count + 1
         
+    @property
+    def boundaries(self):
+        """List of the added Boundary objects, without the reserved slots not filled yet
+        
+        Returns:
+            Boundary [] : the boundaries in the order they were added
+        """
+        return(self._boundaries[0:self._count])
+
     def count(self):
         """Number of boundary
         
         Returns:
             int : number of Boundary
         """
-        return(len(self.boundaries))
+        return(self._count)
+
+    def flat_nodes(self):
+        """Nodes of all the boundaries, concatenated in order
+        
+        Returns:
+            int [] : contiguous int32 array of the nodes of all the boundaries,
+                read-only as it can be a view of the internal buffer
+        """
+        if self._offsets is not None:
+            __nodes = self._flat[0:self._offsets[self._count]]
+            __nodes.flags.writeable = False
+            return(__nodes)
+
+        __nodes = [np.ravel(boundary.nodes) for boundary in self._boundaries[0:self._count]]
+        return(np.concatenate([np.empty(0, dtype=np.int32)] + __nodes).astype(np.int32, copy=False))
+
+    def offsets(self):
+        """Position of each boundary in flat_nodes()
+        
+        Returns:
+            int [] : the nodes of boundary i are flat_nodes()[offsets[i]:offsets[i+1]]
+        """
+        if self._offsets is not None:
+            return(self._offsets[0:self._count + 1])
+
+        return(np.cumsum([0] + [boundary.countnodes() for boundary in self._boundaries[0:self._count]]))
 
 
 class Gr3(object):
@@ -260,6 +331,7 @@ class Gr3(object):
         # Open boundary
         ds = self.openboundds
         self.openbnd = Boundaries(bndtype='open', totalnodes=self.nopennodes)
+        self.openbnd.reserve(self.nopen)
         
         for i in range(self.nopen):
             bndno = i + 1
@@ -272,6 +344,7 @@ class Gr3(object):
         # Land boundary
         ds = self.landboundds
         self.landbnd = Boundaries(bndtype='land', totalnodes=self.nlandnodes)
+        self.landbnd.reserve(self.nland)
         
         for i in range(self.nland):
             bndno = i + 1
@@ -368,11 +441,8 @@ if __name__=='__main__':
     grid.dnodes[:, 3] = 0
 
     # All boundaries are exterior boundary (1)
-    for boundary in grid.openbnd.boundaries:
-        grid.dnodes[[i - 1 for i in boundary.nodes], 3] = 1
-    
-    for boundary in grid.landbnd.boundaries:
-        grid.dnodes[[i - 1 for i in boundary.nodes], 3] = 1
+    grid.dnodes[grid.openbnd.flat_nodes() - 1, 3] = 1
+    grid.dnodes[grid.landbnd.flat_nodes() - 1, 3] = 1
 
     # Writing the grid file
     grid.writetofile(path='wwmbnd.gr3', overwrite=True, nodevalfmt='%4i')
\ No newline at end of file
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.cyclone.jtwc import read_jtwc
+from pycaz.convert import knot2mps, hpa2pa, ntm2m
+import numpy as np
+import pandas as pd
+import warnings
+import os
+import pytest
+
+RESOURCES = os.path.join(os.path.dirname(__file__), '..', 'notebooks', 'resources')
+
+# Full width b-deck lines (38 fields), with zero radii, a repeated AAA line and a western longitude
+BDECK = """\
+SH, 01, 2019091106,   , BEST,   0, 140S,  910E,  30, 1002, TD,   0,    ,    0,    0,    0,    0, 1006,  120,  30,  40,   0,   L,   0,    ,   0,   0,     ONE, S,  0,    ,    0,    0,    0,    0,           genesis-num, 006,
+SH, 01, 2019091112,   , BEST,   0, 145S,  905E,  35, 1000, TS,  34, NEQ,   60,   50,   40,   50, 1004,  150,  25,  45,   0,   L,   0,    ,   0,   0,     ONE, S, 12, NEQ,   60,   45,   30,   45,           genesis-num, 006,
+SH, 01, 2019091112,   , BEST,   0, 145S,  905E,  35, 1000, TS,  50, NEQ,   20,    0,    0,   15, 1004,  150,  25,  45,   0,   L,   0,    ,   0,   0,     ONE, S, 12, NEQ,   60,   45,   30,   45,           genesis-num, 006,
+SH, 01, 2019091118,   , BEST,   0, 151S,  898E,  45,  994, TS,  34, AAA,   70,    0,    0,    0, 1004,  160,  20,  55,   0,   L,   0,    ,   0,   0,     ONE, S, 12, AAA,   80,    0,    0,    0,           genesis-num, 006,
+SH, 01, 2019091118,   , BEST,   0, 151S,  898E,  45,  994, TS,  34, AAA,   70,    0,    0,    0, 1004,  160,  20,  55,   0,   L,   0,    ,   0,   0,     ONE, S, 12, AAA,   80,    0,    0,    0,           genesis-num, 006,
+SH, 01, 2019091200,   , BEST,   0, 158S,  889W,  55,  987, TS,  34, NEQ,   80,   70,   60,   75, 1002,  170,  20,  70,   0,   L,   0,    ,   0,   0,     ONE, S, 12, NEQ,   90,   80,   60,   70,           genesis-num, 006,
+SH, 01, 2019091200,   , BEST,   0, 158S,  889W,  55,  987, TS,  50, NEQ,   30,   25,    0,   20, 1002,  170,  20,  70,   0,   L,   0,    ,   0,   0,     ONE, S, 12, NEQ,   90,   80,   60,   70,           genesis-num, 006,
+"""
+
+# Short a-deck lines, stopping at RAD4 or before RAD
+ADECK = """\
+SH, 01, 2019091112, 03, AVNO,   0, 145S,  905E,  35, 1000, XX,  34, NEQ,   60,   50,   40,   50,
+SH, 01, 2019091118, 03, AVNO,   6, 151S,  898E,  40,  996, XX,  34, NEQ,   70,   55,    0,   50,
+SH, 01, 2019091200, 03, AVNO,  12, 158S,  889E,  50,  990, XX,  34, AAA,    0,    0,    0,    0,
+SH, 01, 2019091206, 03, AVNO,  18, 163S,  880E,  55
+"""
+
+
+def _field(fields, i, default=np.nan):
+    try:
+        return float(fields[i])
+    except (IndexError, ValueError):
+        return default
+
+
+def reference_jtwc(fname, replace_zero_radial=True):
+    """
+    Line by line parse of the fields building the track, as done by read_jtwc before the single pass read_csv
+
+    :return: list of (timestamp, lon, lat, vmax, mslp, rmax, vinfo, radinfo) in SI units, one per timestamp
+    """
+    track = {}
+    with open(fname) as f:
+        for line in f:
+            fields = [field.strip() for field in line.split(',')]
+            lat = float(fields[6][:-1]) / 10 * (-1 if fields[6][-1] == 'S' else 1)
+            lon = float(fields[7][:-1]) / 10 * (-1 if fields[7][-1] == 'W' else 1)
+            radv = _field(fields, 11)
+            radv = knot2mps(np.nan if radv == 0 else radv)
+            windcode = fields[12] if len(fields) > 12 else 'AAA'
+            radinfo = np.array([_field(fields, i) for i in range(13, 17)])
+            radinfo[radinfo == 0] = np.nan
+            radinfo = ntm2m(radinfo)
+            if windcode == 'AAA':
+                radinfo[1:] = radinfo[0]
+            if replace_zero_radial:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    radinfo[np.isnan(radinfo)] = np.nanmax(radinfo)
+
+            if fields[2] not in track:
+                track[fields[2]] = [
+                    pd.Timestamp(pd.to_datetime(fields[2], format='%Y%m%d%H')), lon, lat,
+                    knot2mps(_field(fields, 8)), hpa2pa(_field(fields, 9)), ntm2m(_field(fields, 19)),
+                    [radv], [radinfo]]
+            elif radv not in track[fields[2]][6]:
+                track[fields[2]][6].append(radv)
+                track[fields[2]][7].append(radinfo)
+
+    return [values[:6] + [np.array(values[6]), values[7][0] if len(values[7]) == 1 else np.array(values[7])]
+            for values in track.values()]
+
+
+def read_deck(tmp_path, deck):
+    fname = tmp_path / 'deck.dat'
+    fname.write_text(deck)
+    return read_jtwc(fname)
+
+
+def assert_records(track, expected):
+    """
+    Compare the records of the track with the expected values, given in the units of the deck
+
+    :return:
+    """
+    assert len(track.records) == len(expected)
+    for record, (timestamp, lon, lat, vmax, mslp, rmax, vinfo, radinfo) in zip(track.records, expected):
+        assert record['timestamp'] == pd.Timestamp(timestamp)
+        np.testing.assert_allclose([record['lon'], record['lat']], [lon, lat])
+        np.testing.assert_allclose(record['vmax'], knot2mps(vmax))
+        np.testing.assert_allclose(record['mslp'], hpa2pa(mslp))
+        np.testing.assert_allclose(record['rmax'], ntm2m(rmax))
+        np.testing.assert_allclose(record['vinfo'], knot2mps(np.array(vinfo)))
+        np.testing.assert_allclose(record['radinfo'], ntm2m(np.array(radinfo)))
+
+
+def test_read_jtwc_bdeck(tmp_path):
+    """
+    Full width b-deck lines are read, one record per timestamp, with the zero radii replaced by the maximum of
+    the line, the full circle radii copied and the repeated wind intensities skipped
+
+    :return:
+    """
+    track = read_deck(tmp_path, BDECK)
+
+    assert_records(track, [
+        ('2019-09-11 06:00', 91.0, -14.0, 30, 1002, 30, [np.nan], [np.nan] * 4),
+        ('2019-09-11 12:00', 90.5, -14.5, 35, 1000, 25, [34, 50], [[60, 50, 40, 50], [20, 20, 20, 15]]),
+        ('2019-09-11 18:00', 89.8, -15.1, 45, 994, 20, [34], [70, 70, 70, 70]),
+        ('2019-09-12 00:00', -88.9, -15.8, 55, 987, 20, [34, 50], [[80, 70, 60, 75], [30, 25, 30, 20]]),
+    ])
+
+
+def test_read_jtwc_adeck(tmp_path):
+    """
+    Short a-deck lines are read, the missing trailing fields being nan
+
+    :return:
+    """
+    track = read_deck(tmp_path, ADECK)
+
+    assert_records(track, [
+        ('2019-09-11 12:00', 90.5, -14.5, 35, 1000, np.nan, [34], [60, 50, 40, 50]),
+        ('2019-09-11 18:00', 89.8, -15.1, 40, 996, np.nan, [34], [70, 55, 70, 50]),
+        ('2019-09-12 00:00', 88.9, -15.8, 50, 990, np.nan, [34], [np.nan] * 4),
+        ('2019-09-12 06:00', 88.0, -16.3, 55, np.nan, np.nan, [np.nan], [np.nan] * 4),
+    ])
+
+
+@pytest.mark.parametrize('deck', ['bio062007.txt', BDECK, ADECK])
+@pytest.mark.parametrize('replace_zero_radial', [True, False])
+def test_read_jtwc_reference(tmp_path, deck, replace_zero_radial):
+    """
+    The tracks are the same as the line by line parse, for the checked-in deck and the full width and short decks
+
+    :return:
+    """
+    if deck.endswith('.txt'):
+        fname = os.path.join(RESOURCES, deck)
+    else:
+        fname = tmp_path / 'deck.dat'
+        fname.write_text(deck)
+
+    track = read_jtwc(fname, replace_zero_radial=replace_zero_radial)
+    expected = reference_jtwc(fname, replace_zero_radial=replace_zero_radial)
+
+    assert len(track.records) == len(expected)
+    for record, (timestamp, lon, lat, vmax, mslp, rmax, vinfo, radinfo) in zip(track.records, expected):
+        assert record['timestamp'] == timestamp
+        np.testing.assert_allclose([record['lon'], record['lat']], [lon, lat])
+        np.testing.assert_allclose([record['vmax'], record['mslp'], record['rmax']], [vmax, mslp, rmax])
+        np.testing.assert_allclose(record['vinfo'], vinfo)
+        np.testing.assert_allclose(record['radinfo'], radinfo)
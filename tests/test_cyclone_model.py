@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.cyclone.model import calc_rmax_e11, calc_rmax_h80, calc_vcirc_w06, coriolis
+import numpy as np
+
+F = coriolis(-14.5)
+
+
+def test_calc_rmax_e11_newton():
+    """
+    Newton gives the fsolve root when it exists, and nan for v above vmax where it diverges
+
+    :return:
+    """
+    rmax_fsolve = calc_rmax_e11(v=22.0, r=150000.0, vmax=22.5, f=F, solver='fsolve')
+    rmax = calc_rmax_e11(v=np.array([22.0, 31.0]), r=np.array([150000.0, 40000.0]), vmax=22.5, f=F, solver='newton')
+
+    np.testing.assert_allclose(rmax[0], rmax_fsolve, rtol=1e-6)
+    assert np.isnan(rmax[1])
+    assert np.isnan(calc_rmax_e11(v=31.0, r=40000.0, vmax=22.5, f=F, solver='newton'))
+
+
+def test_calc_rmax_h80_newton():
+    """
+    Newton gives the fsolve root when it exists, and nan when there is no root
+
+    :return:
+    """
+    kwargs = {'r': 60000.0, 'pc': 100000.0, 'B': 1.2, 'f': F, 'pn': 101325, 'rhoair': 1.15, 'limit': [5000, 500000]}
+    rmax_fsolve = calc_rmax_h80(v=18.0, solver='fsolve', **kwargs)
+    rmax = calc_rmax_h80(v=np.array([18.0, 40.0]), solver='newton', **kwargs)
+
+    np.testing.assert_allclose(rmax[0], rmax_fsolve, rtol=1e-6)
+    assert np.isnan(rmax[1])
+
+
+def test_calc_vcirc_w06_scalar():
+    """
+    A scalar radius gives a scalar wind, inside and outside of rmax, and an array gives an array
+
+    :return:
+    """
+    for r in [1000.0, 60000.0]:
+        vcirc = calc_vcirc_w06(r, 30000.0, 40.0)
+        assert isinstance(vcirc, float)
+
+    vcirc = calc_vcirc_w06(np.array([1000.0, 60000.0]), 30000.0, 40.0)
+    np.testing.assert_allclose(vcirc, [40.0 * (1 / 30) ** 0.79, 40.0 * np.exp(-30000.0 / 243000)])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.cyclone.track import Record, Track
+from pycaz.convert import knot2mps, ntm2m
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def sh01_record():
+    """
+    SH01 2019091112, with a 34 kt ring below vmax and a 50 kt ring above the 35 kt vmax
+
+    :return:
+    """
+    record = Record(
+        timestamp='2019-09-11 12:00',
+        lon=90.5,
+        lat=-14.5,
+        mslp=100000.0,
+        vmax=knot2mps(35),
+        vinfo=knot2mps(np.array([34, 50])),
+        radinfo=ntm2m(np.array([[60, 50, 40, 50], [20, 20, 20, 15]]))
+    )
+    return record.gen_radial_fields()
+
+
+@pytest.mark.filterwarnings('ignore:The iteration is not making good progress')
+def test_calc_rmax_newton_above_vmax():
+    """
+    The thetas of the v > vmax ring, where the batched newton diverges, are left unsolved, and the other ring has
+    the fsolve rmax. fsolve does not converge on the v > vmax ring of the reference
+
+    :return:
+    """
+    kw_e11 = {'solver': 'newton', 'limit': [5000, 500000], 'step': 100}
+    kw_h80 = {'bmax': 2.5, 'bmin': 0.5, **kw_e11}
+    record = sh01_record().calc_rmax(kw_e11=kw_e11, kw_h80=kw_h80)
+    reference = sh01_record().calc_rmax()
+
+    rmax = np.array([frmax.values for frmax in record['frmax']])
+    rmax_reference = np.array([frmax.values for frmax in reference['frmax']])
+
+    np.testing.assert_allclose(rmax[0], rmax_reference[0], rtol=1e-6)
+    np.testing.assert_array_equal(record['rmax_method'][0], reference['rmax_method'][0])
+    assert np.all(record['rmax_method'][1] == None)
+    assert np.all((rmax > 0) & (rmax <= kw_e11['limit'][1]))
+
+
+def test_track_columns_follow_records():
+    """
+    The scalar fields of the track follow the changes of the record fields and of the records
+
+    :return:
+    """
+    records = np.array([
+        Record(timestamp='2019-09-11 12:00', lon=90.5, lat=-14.5, mslp=100000.0, vmax=18.0, rmax=30e3),
+        Record(timestamp='2019-09-11 18:00', lon=89.8, lat=-15.1, mslp=99400.0, vmax=23.1, rmax=30e3),
+    ])
+    track = Track(records)
+    np.testing.assert_allclose(track.rmax, [30e3, 30e3])
+
+    track.records[0]['rmax'] = 50e3
+    np.testing.assert_allclose(track.rmax, [50e3, 30e3])
+
+    track.rmax[1] = 0
+    np.testing.assert_allclose(track.rmax, [50e3, 30e3])
+
+    track.records[1] = Record(timestamp='2019-09-11 18:00', lon=89.8, lat=-15.1, mslp=99400.0, vmax=23.1, rmax=40e3)
+    np.testing.assert_allclose(track.rmax, [50e3, 40e3])
+    np.testing.assert_allclose(track.interpolate('2019-09-11 15:00')['rmax'], 45e3)
+
+    track.records[0].update(rmax=20e3)
+    np.testing.assert_allclose(track.rmax, [20e3, 40e3])
+
+    track.records[0].pop('rmax')
+    track.records[0].setdefault('rmax', 10e3)
+    np.testing.assert_allclose(track.rmax, [10e3, 40e3])
+
+
+def test_track_interpolate_columns_reused(monkeypatch):
+    """
+    The interpolated records, and the records of other tracks, do not make the columns of the track stale
+
+    :return:
+    """
+    timestamps = pd.date_range('2019-09-11', periods=50, freq='6h')
+    records = np.array([
+        Record(timestamp=str(timestamp), lon=90.5 - i * 0.1, lat=-14.5 - i * 0.1, mslp=100000.0, vmax=18.0,
+               rmax=30e3, vinfo=np.array([17.5]), radinfo=np.array([100e3, 90e3, 80e3, 90e3]))
+        for i, timestamp in enumerate(timestamps)
+    ])
+    track = Track(records)
+    other = Track(sh01_record())
+
+    builds = []
+    build_columns = Track._build_columns
+    monkeypatch.setattr(Track, '_build_columns', lambda self: builds.append(self) or build_columns(self))
+
+    for at in pd.date_range(timestamps[0], timestamps[-1], freq='1h')[:20]:
+        track.interpolate(at)
+        other.records[0]['rmax'] = 30e3
+
+    assert builds == []
+
+
+def test_record_timestamp_datetimeindex():
+    """
+    A single timestamp pd.DatetimeIndex is taken as the timestamp, a longer one is rejected
+
+    :return:
+    """
+    record = Record(timestamp=pd.DatetimeIndex(['2019-09-11 12:00']), lon=90.5, lat=-14.5, mslp=100000.0, vmax=18.0)
+    assert record['timestamp'] == pd.Timestamp('2019-09-11 12:00')
+    assert Track(record).timeindex[0] == pd.Timestamp('2019-09-11 12:00')
+
+    record['timestamp'] = pd.DatetimeIndex(['2019-09-11 18:00'])
+    assert record['timestamp'] == pd.Timestamp('2019-09-11 18:00')
+
+    with pytest.raises(Exception, match='timestamp must be parsable'):
+        Record(timestamp=pd.DatetimeIndex(['2019-09-11 12:00', '2019-09-11 18:00']), lon=90.5, lat=-14.5,
+               mslp=100000.0, vmax=18.0)
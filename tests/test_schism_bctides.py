@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.schism.bctides import read_bctides, write_bctides
+import numpy as np
+import pytest
+
+# One boundary per kind of input: tidal elevation and velocity (3, 5), constant values (2), relaxation (-4),
+# flather (-1), and every temperature and salinity type
+BCTIDES = """test bctides
+2 50.0 !ntip, tip_dp
+M2
+2 0.242334 0.000140518902509 1.0 10.5
+K1
+1 0.141565 0.000072921158358 1.0 20.25
+2 !nbfr
+M2
+0.000140518902509 1.0 10.5
+S2
+0.000145444104333 1.0 0.0
+5 !Number of Open Boundaries
+2 3 3 2 1 !Boundary 1 elevation and velocity tides, constant temperature
+M2
+0.5 10.0
+0.6 11.0
+S2
+0.2 20.0
+0.3 21.0
+M2
+0.1 30.0 0.2 31.0
+0.15 32.0 0.25 33.0
+S2
+0.01 40.0 0.02 41.0
+0.015 42.0 0.025 43.0
+15.0
+0.5
+0.8
+2 5 5 4 4 !Boundary 2 tides with 3D inputs
+M2
+0.7 12.0
+0.8 13.0
+S2
+0.4 22.0
+0.45 23.0
+M2
+0.3 34.0 0.4 35.0
+0.35 36.0 0.45 37.0
+S2
+0.03 44.0 0.04 45.0
+0.035 46.0 0.045 47.0
+0.9
+0.7
+2 2 2 0 2 !Boundary 3 constant elevation, discharge and salinity
+0.25
+-100.0
+35.0
+0.6
+2 4 -4 3 0 !Boundary 4 relaxed 3D velocity
+0.9 0.1
+0.4
+2 0 -1 1 3 !Boundary 5 flather
+eta_mean !mean elevation below
+0.15
+0.2
+vn_mean !mean normal velocity
+0.125 0.25
+0.375 0.5
+1.0
+0.3
+"""
+
+
+def _tokens(text):
+    """
+    Numeric values of each line of a bctides text, the comments and the spacing being ignored
+
+    :return:
+    """
+    tokens = []
+    for line in text.splitlines():
+        for token in line.split('!', 1)[0].split():
+            try:
+                tokens.append(float(token))
+            except ValueError:
+                tokens.append(token)
+    return tokens
+
+
+def read_text(tmp_path, text=BCTIDES):
+    fname = tmp_path / 'bctides.in'
+    fname.write_text(text)
+    return read_bctides(fname)
+
+
+def test_read_bctides(tmp_path):
+    """
+    The constituents and the inputs of each boundary should be read in the fields of their type code
+
+    :return:
+    """
+    bctides = read_text(tmp_path)
+
+    assert bctides.potential_consts == ['M2', 'K1']
+    assert bctides.tidefr_consts == ['M2', 'S2']
+
+    bnd = bctides.open_bnds[1]
+    assert (bnd['iettype'], bnd['ifltype'], bnd['itetype'], bnd['isatype']) == (3, 3, 2, 1)
+    np.testing.assert_array_equal(bnd['et'][3]['S2'], [[0.2, 20.0], [0.3, 21.0]])
+    np.testing.assert_array_equal(bnd['fl'][3]['M2'], [[0.1, 30.0, 0.2, 31.0], [0.15, 32.0, 0.25, 33.0]])
+    assert bnd['te'] == {2: {'tthconst': 15.0, 'tobc': 0.5}}
+    assert bnd['sa'] == {1: 0.8}
+
+    bnd = bctides.open_bnds[2]
+    assert bnd['te'] == {4: 0.9}
+    assert bnd['sa'] == {4: 0.7}
+
+    bnd = bctides.open_bnds[3]
+    assert bnd['et'] == {2: 0.25}
+    assert bnd['fl'] == {2: -100.0}
+    assert bnd['te'] == {}
+    assert bnd['sa'] == {2: {'tthconst': 35.0, 'tobc': 0.6}}
+
+    bnd = bctides.open_bnds[4]
+    assert bnd['fl'] == {-4: {'rel1': 0.9, 'rel2': 0.1}}
+    assert bnd['te'] == {3: 0.4}
+
+    bnd = bctides.open_bnds[5]
+    np.testing.assert_array_equal(bnd['fl'][-1]['eta_mean'], [0.15, 0.2])
+    np.testing.assert_array_equal(bnd['fl'][-1]['vn_mean'], [[0.125, 0.25], [0.375, 0.5]])
+    assert bnd['te'] == {1: 1.0}
+    assert bnd['sa'] == {3: 0.3}
+
+
+def test_write_bctides(tmp_path):
+    """
+    The written file should have the same values as the file read, including the 4 columns velocity tides, the
+    temperature type and the nudging factor of itetype 4, and the salinity written from isatype
+
+    :return:
+    """
+    bctides = read_text(tmp_path)
+    fname = tmp_path / 'bctides_written.in'
+    write_bctides(bctides, fname)
+
+    tokens = _tokens(fname.read_text())
+    expected = _tokens(BCTIDES)
+    assert len(tokens) == len(expected)
+    for token, expected_token in zip(tokens, expected):
+        if isinstance(expected_token, float):
+            assert token == pytest.approx(expected_token)
+        else:
+            assert token == expected_token
+
+
+def test_bctides_roundtrip(tmp_path):
+    """
+    Read, write and read again should give the same bctides
+
+    :return:
+    """
+    bctides = read_text(tmp_path)
+    fname = tmp_path / 'bctides_written.in'
+    bctides.write(fname)
+    bctides_new = read_bctides(fname)
+
+    assert bctides_new.potential == bctides.potential
+    assert bctides_new.tidefr == bctides.tidefr
+    assert list(bctides_new.open_bnds) == list(bctides.open_bnds)
+    for bnd in bctides.open_bnds:
+        for key in ['neta', 'iettype', 'ifltype', 'itetype', 'isatype', 'te', 'sa']:
+            assert bctides_new.open_bnds[bnd][key] == bctides.open_bnds[bnd][key]
+
+        for key, typekey in [('et', 'iettype'), ('fl', 'ifltype')]:
+            value = bctides.open_bnds[bnd][key].get(bctides.open_bnds[bnd][typekey])
+            value_new = bctides_new.open_bnds[bnd][key].get(bctides.open_bnds[bnd][typekey])
+            if isinstance(value, dict):
+                assert list(value_new) == list(value)
+                for name in value:
+                    np.testing.assert_allclose(value_new[name], value[name])
+            else:
+                assert value_new == value
+
+
+def test_read_bctides_unknown_type(tmp_path):
+    """
+    An unknown type code should raise instead of misreading the rest of the file
+
+    :return:
+    """
+    with pytest.raises(Exception, match='itetype 7 is not implemented'):
+        read_text(tmp_path, BCTIDES.replace('2 2 2 0 2 !Boundary 3', '2 2 2 7 2 !Boundary 3'))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.schism.hgrid import read_hgrid, read_gr3
+import numpy as np
+
+HGRID = """test grid
+3 5 ! # of elements and nodes in the horizontal grid
+1 0.0 0.0 10.0
+2 1.0 0.0 11.0
+3 1.0 1.0 12.0
+4 0.0 1.0 13.0
+5 2.0 0.5 14.0
+1 4 1 2 3 4
+2 3 2 5 3
+3 3 1 3 4
+1 = Number of open boundaries
+2 = Total number of open boundary nodes
+2 = Number of nodes for open boundary 1
+1
+4
+1 = Number of land boundaries
+3 = Total number of land boundary nodes
+3 0 = Number of nodes for land boundary 1
+2
+5
+3
+"""
+
+
+def write_hgrid(tmp_path):
+    fname = tmp_path / 'hgrid.gr3'
+    fname.write_text(HGRID)
+    return fname
+
+
+def test_read_hgrid(tmp_path):
+    """
+    Nodes, hybrid element table and boundaries should be parsed from a hgrid file
+
+    :return:
+    """
+    hgrid = read_hgrid(write_hgrid(tmp_path))
+
+    assert hgrid['nnode'] == 5
+    assert hgrid['nelem'] == 3
+    np.testing.assert_array_equal(hgrid['elemtype'], [4, 3, 3])
+    np.testing.assert_array_equal(hgrid['elems'][0], [1, 2, 3, 4])
+    np.testing.assert_array_equal(hgrid['elems'][1], [2, 5, 3, hgrid['elem_FillValue']])
+    np.testing.assert_array_equal(hgrid.data.flatten(), [10, 11, 12, 13, 14])
+    np.testing.assert_array_equal(hgrid['open_bnds'][1]['nodes'], [1, 4])
+    np.testing.assert_array_equal(hgrid['land_bnds'][1]['nodes'], [2, 5, 3])
+
+
+def test_read_gr3(tmp_path):
+    """
+    A gr3 can be read without the boundary section
+
+    :return:
+    """
+    gr3 = read_gr3(write_hgrid(tmp_path))
+
+    assert gr3.nodes.shape == (5, 4)
+    assert gr3['elems'].shape == (3, 4)
+
+
+def test_read_hgrid_sidecar(tmp_path):
+    """
+    The sidecar is reused for the same ascii file, and rewritten once the ascii file changes
+
+    :return:
+    """
+    fname = write_hgrid(tmp_path)
+    hgrid = read_hgrid(fname, sidecar=True)
+    assert (tmp_path / 'hgrid.gr3.nc').exists()
+
+    cached = read_hgrid(fname, sidecar=True)
+    np.testing.assert_array_equal(cached['elems'], hgrid['elems'])
+    np.testing.assert_array_equal(cached['land_bnds'][1]['nodes'], [2, 5, 3])
+
+    fname.write_text(HGRID.replace('test grid', 'modified grid'))
+    assert read_hgrid(fname, sidecar=True)['header'] == 'modified grid'
+    assert read_hgrid(fname, sidecar=True)['header'] == 'modified grid'
+
+
+def test_locate(tmp_path):
+    """
+    Points are located in triangles and in both halves of the quads, and -1 is returned outside the grid
+
+    :return:
+    """
+    hgrid = read_hgrid(write_hgrid(tmp_path))
+    points = [[0.8, 0.2], [0.2, 0.8], [1.5, 0.5], [5.0, 5.0]]
+
+    np.testing.assert_array_equal(hgrid.locate(points), [0, 0, 1, -1])
+
+
+def test_node_accessors_copy(tmp_path):
+    """
+    x, y, xy, data and to_xarray() should return copies, modifying them does not change the nodes
+
+    :return:
+    """
+    hgrid = read_hgrid(write_hgrid(tmp_path))
+    nodes = hgrid.nodes.copy()
+
+    hgrid.x[:] = -1
+    hgrid.y[:] = -1
+    hgrid.xy[:] = -1
+    hgrid.data[:] = -1
+    ds = hgrid.to_xarray()
+    ds['SCHISM_hgrid_node_x'].values[:] = -1
+    ds['SCHISM_hgrid_node_y'].values[:] = -1
+
+    np.testing.assert_array_equal(hgrid.nodes, nodes)
+
+
+def test_meshtype(tmp_path):
+    """
+    The hybrid and the fully triangular grids are both 'i34'
+
+    :return:
+    """
+    hgrid = read_hgrid(write_hgrid(tmp_path))
+    assert hgrid.meshtype == 'i34'
+
+    hgrid['elemtype'] = np.array([3, 3, 3])
+    assert hgrid.meshtype == 'i34'
+
+    hgrid['elemtype'] = np.array([4, 3, 5])
+    assert hgrid.meshtype == 'i3'
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from pycaz.schism.hgrid import read_hgrid
+from pycaz.schism.wwm import create_wwmbnd
+import numpy as np
+
+# Two open boundaries sharing node 4, the second one sharing node 3 with the land boundary
+HGRID = """test grid
+3 5 ! # of elements and nodes in the horizontal grid
+1 0.0 0.0 10.0
+2 1.0 0.0 11.0
+3 1.0 1.0 12.0
+4 0.0 1.0 13.0
+5 2.0 0.5 14.0
+1 4 1 2 3 4
+2 3 2 5 3
+3 3 1 3 4
+2 = Number of open boundaries
+4 = Total number of open boundary nodes
+2 = Number of nodes for open boundary 1
+1
+4
+2 = Number of nodes for open boundary 2
+4
+3
+1 = Number of land boundaries
+3 = Total number of land boundary nodes
+3 0 = Number of nodes for land boundary 1
+2
+5
+3
+"""
+
+
+def read_text(tmp_path):
+    fname = tmp_path / 'hgrid.gr3'
+    fname.write_text(HGRID)
+    return read_hgrid(fname)
+
+
+def test_create_wwmbnd(tmp_path):
+    """
+    Dirichlet takes precedence over Neumann at the nodes shared by two open boundaries, and both over land
+
+    :return:
+    """
+    hgrid = read_text(tmp_path)
+
+    wwmbnd = create_wwmbnd(hgrid)
+    np.testing.assert_array_equal(wwmbnd.data.flatten(), [2, 0, 2, 2, 0])
+
+    wwmbnd = create_wwmbnd(hgrid, neumann=[2])
+    np.testing.assert_array_equal(wwmbnd.data.flatten(), [2, 0, 3, 2, 0])
+
+    wwmbnd = create_wwmbnd(hgrid, neumann=[1], land_flag=1)
+    np.testing.assert_array_equal(wwmbnd.data.flatten(), [3, 1, 2, 2, 1])
+
+    wwmbnd = create_wwmbnd(hgrid, dirichlet=[], neumann=[1, 2], land_flag=1)
+    np.testing.assert_array_equal(wwmbnd.data.flatten(), [3, 1, 3, 3, 1])